@@ -15,9 +15,11 @@ Guard rails & reset logic
 version = "0.1.0"
 
 from .agent import ECKAgent
+from .async_agent import AsyncECKAgent
 from .config import ECKConfig
 
 __all__ = [
     "ECKAgent",
+    "AsyncECKAgent",
     "ECKConfig",
 ]
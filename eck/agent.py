@@ -1,15 +1,21 @@
 import logging
-from typing import Callable
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import replace
 
-from .queue import TaskQueue
-from .memory import WorldModel
+from .queue import DurableTaskQueue, PriorityTaskQueue, TaskQueue
+from .prioritization import make_scorer
+from .dedup import TaskDeduplicator
+from .backpressure import SubtaskBackpressure
+from .memory import make_world_model
+from .sqlite_memory import SQLiteWorldModel
+from .models import Task, TaskId, TaskIdAllocator
+from .retrieval import EmbedFn
 from .drift import DriftMonitor
 from .utils import (
-    generate_id,
     is_numeric_feasible,
     get_recommended_breadth,
     should_execute,
+    call_batch,
 )
 from .config import ECKConfig, PolicyMode
 from .prompts import (
@@ -17,11 +23,16 @@ from .prompts import (
     INITIAL_TASK_PROMPT_TEMPLATE,
     GOAL_ACHIEVED_PROMPT,
 )
-from .critic import critic_evaluate
-from .prediction import generate_prediction
-from .task_generation import generate_subtasks
-from .execution import execute_task
+from .critic import critic_evaluate, critic_evaluate_batch, ConsensusStrategy
+from .prediction import generate_prediction, generate_predictions_batch
+from .task_generation import generate_subtasks, generate_subtasks_batch
+from .execution import execute_task, execute_tasks_batch
+from .evaluation import FusedEvaluation, fused_evaluate
 from .task import TaskState
+from .phase import Phase
+from .llm_cache import LLMCache
+from .checkpoint import Checkpointer, load_checkpoint
+from .runner import ThreadedRunner
 
 logger = logging.getLogger("eck-core")
 
@@ -48,23 +59,81 @@ class ECKAgent:
         objective: str,
         llm_call: Callable[[str], str],  # Single LLM function for all prompts
         config: ECKConfig = None,
+        llm_cache: Optional[LLMCache] = None,
+        llm_batch_call: Optional[Callable[[List[str]], List[str]]] = None,
+        embed_fn: Optional[EmbedFn] = None,
+        cold_storage: Optional[Callable[[TaskId, Dict[str, Any]], None]] = None,
     ):
         self.objective = objective
         self.llm = llm_call
         self.config = config or ECKConfig()
 
+        # Optional batched seam (used by step_batch(); falls back to llm_call per prompt)
+        self.llm_batch_call = llm_batch_call
+
+        # Optional response cache (explicit instance wins; else built from config)
+        if llm_cache is None and self.config.enable_llm_cache:
+            llm_cache = LLMCache.from_config(self.config)
+        self.llm_cache: Optional[LLMCache] = llm_cache
+
         # Current active policy mode (derived from config)
         self.current_policy_mode: PolicyMode = self.config.policy_mode
 
         # Current confidence (placeholder — future: rolling signal)
         self.current_confidence: float = 0.5
 
-        self.queue = TaskQueue(max_size=self.config.max_queue_size)
-        self.memory = WorldModel()
+        self.task_ids = TaskIdAllocator(with_uuids=self.config.task_uuids)
+        self.memory = make_world_model(self.config, embed_fn=embed_fn, cold_storage=cold_storage)
+        # Persisted tasks (event log, SQLite) keep their ids; new ids must not collide with them
+        self.task_ids.advance_past(self.memory.max_int_id())
+        if isinstance(self.memory, SQLiteWorldModel):
+            # Other agents may write to the same database concurrently
+            self.task_ids.reserve = self.memory.reserve_task_ids
+
+        # Optional enqueue-time duplicate filter (queued + SUCCEEDED tasks)
+        self.dedup: Optional[TaskDeduplicator] = None
+        if self.config.enable_task_dedup:
+            self.dedup = TaskDeduplicator(self.config.task_similarity_threshold)
+            self.dedup.seed(self.memory)
+
+        self.queue = self._make_queue()
+
+        # Optional queue-occupancy throttle on subtask generation
+        self.backpressure: Optional[SubtaskBackpressure] = None
+        if self.config.enable_subtask_backpressure:
+            if isinstance(self.queue, DurableTaskQueue):
+                # max_size bounds only its in-memory head; the queue itself never fills
+                logger.warning("Subtask backpressure disabled: the durable queue is unbounded")
+            else:
+                self.backpressure = SubtaskBackpressure.from_config(self.config)
         self.drift = DriftMonitor(config=self.config)
 
         self.cycles: int = 0
 
+        # Writes checkpoint() files; created on first use (or by restore())
+        self.checkpointer: Optional[Checkpointer] = None
+
+        # Tasks popped by ThreadedRunner workers and not finished yet;
+        # checkpoints put them back at the front of the saved queue
+        self._in_flight: Dict[TaskId, Task] = {}
+
+    def _make_queue(self):
+        """FIFO TaskQueue, or a PriorityTaskQueue with the configured scorer."""
+        if self.config.queue_mode == "fifo":
+            return TaskQueue(max_size=self.config.max_queue_size, dedup=self.dedup)
+        if self.config.queue_mode == "priority":
+            llm = self._llm_for(Phase.PRIORITIZATION)
+            scorer = make_scorer(self.config, self.objective, memory=self.memory, llm_call=llm)
+            return PriorityTaskQueue(max_size=self.config.max_queue_size, scorer=scorer, dedup=self.dedup)
+        if self.config.queue_mode == "durable":
+            if self.config.queue_path is None:
+                raise ValueError('queue_mode="durable" requires config.queue_path')
+            queue = DurableTaskQueue(self.config.queue_path, max_size=self.config.max_queue_size, dedup=self.dedup)
+            # Resumed tasks keep their ids; new ids must not collide with them
+            self.task_ids.advance_past(queue.max_int_id())
+            return queue
+        raise ValueError(f"Unknown queue mode: {self.config.queue_mode}")
+
     def _record_task_created(self, task_id: str, task_text: str) -> None:
         """Record CREATED state when a task is enqueued."""
         self.memory.record(
@@ -77,25 +146,95 @@ class ECKAgent:
             state=TaskState.CREATED,
         )
 
+    def _record(
+        self,
+        task_id: str,
+        task_text: str,
+        prediction: str,
+        outcome: str,
+        success: bool,
+        feedback: str,
+        state: TaskState,
+    ) -> None:
+        """Record a lifecycle transition for a task."""
+        if state is TaskState.SUCCEEDED and self.dedup is not None:
+            self.dedup.add_succeeded(task_text)
+        self.memory.record(
+            task_id=task_id,
+            task_text=task_text,
+            prediction=prediction,
+            outcome=outcome,
+            success=success,
+            feedback=feedback,
+            state=state,
+        )
+
+    def _llm_for(self, phase: Phase) -> Callable[[str], str]:
+        """Return the llm_call for a phase (cache-wrapped when caching is enabled)."""
+        if self.llm_cache is None:
+            return self.llm
+        return self.llm_cache.wrap(self.llm, phase)
+
+    def _batch_for(self, phase: Phase) -> Callable[[List[str]], List[str]]:
+        """Return the batched llm call for a phase (cache-wrapped when enabled)."""
+        batch_call = self.llm_batch_call
+        if batch_call is None:
+            llm = self.llm
+            batch_call = lambda prompts: [llm(prompt) for prompt in prompts]
+        if self.llm_cache is None:
+            return batch_call
+        return self.llm_cache.wrap_batch(batch_call, phase)
+
+    def _enqueue_task(self, task_text: str) -> None:
+        """Push a new task onto the queue and record its CREATED state."""
+        self._enqueue_tasks([task_text])
+
+    def _enqueue_tasks(self, task_texts: List[str]) -> None:
+        """
+        Push new tasks in one batch (one scorer call) and record them CREATED.
+
+        With task dedup enabled, duplicates of queued or SUCCEEDED tasks are
+        dropped first (no id, record or scoring is spent on them).
+        """
+        if self.dedup is not None:
+            task_texts = self.dedup.filter(task_texts)
+        tasks = [Task(self.task_ids.next(), text) for text in task_texts]
+        self.queue.push_many(tasks)
+        with self.memory.batch():  # one index add_many for the new texts
+            for task in tasks:
+                self._record_task_created(task.id, task.text)
+
+    def _subtask_limit(self, tasks: int = 1, skippable: bool = True) -> int:
+        """
+        Subtasks to request per task: the policy's max_subtasks, lowered by
+        queue backpressure when enabled (0 means skip generation).
+        """
+        cap = self.config.effective_policy().get("max_subtasks", self.config.max_subtasks)
+        if self.backpressure is None:
+            return cap
+        return self.backpressure.limit(len(self.queue), self.queue.max_size, cap, tasks, skippable)
+
     def seed(self, initial_task: str = None) -> None:
         """Seed the agent with an initial task (or generate one)."""
         if initial_task is None:
-            prompt = format_prompt(
-                INITIAL_TASK_PROMPT_TEMPLATE,
-                objective=self.objective,
-            )
-            initial_task = self.llm(prompt).strip()
+            initial_task = self._llm_for(Phase.SEED)(self._initial_task_prompt()).strip()
 
-        task_id = generate_id()
-        self.queue.push({"id": task_id, "text": initial_task})
-        self._record_task_created(task_id, initial_task)
+        self._enqueue_task(initial_task)
 
         logger.info(f"Agent seeded with initial task: {initial_task}")
 
-    def step(self) -> bool:
-        """Execute one full control cycle."""
-        # Irreversible policy upgrades only
-        recommended_mode = self.drift.get_policy_mode()
+    def _initial_task_prompt(self) -> str:
+        return format_prompt(
+            INITIAL_TASK_PROMPT_TEMPLATE,
+            objective=self.objective,
+        )
+
+    def _apply_policy_upgrade(self) -> None:
+        """Apply the drift-recommended policy mode (irreversible upgrades only)."""
+        self._upgrade_policy(self.drift.get_policy_mode())
+
+    def _upgrade_policy(self, recommended_mode: PolicyMode) -> None:
+        """Switch to recommended_mode if it is stricter than the current mode."""
         if _POLICY_ORDER[recommended_mode] > _POLICY_ORDER[self.current_policy_mode]:
             self.current_policy_mode = recommended_mode
             self.config = replace(self.config, policy_mode=recommended_mode)
@@ -105,76 +244,70 @@ class ECKAgent:
 
             logger.info(f"Policy upgrade: {self.current_policy_mode.name}")
 
+    def _policy_allows_cycle(self) -> bool:
+        """Apply policy upgrades; return False if HALT forbids running a cycle."""
+        self._apply_policy_upgrade()
+
         if self.current_policy_mode == PolicyMode.HALT:
             logger.critical("Policy mode HALT — stopping agent")
             return False
 
+        return True
+
+    def _begin_cycle(self) -> Optional[Dict]:
+        """
+        Start a control cycle: policy upgrade, HALT check, pop, PREDICTED record.
+
+        Returns the popped task, or None if the cycle must not run.
+        """
+        if not self._policy_allows_cycle():
+            return None
+
         task = self.queue.pop()
         if not task:
             logger.info("Task queue empty — nothing to do")
-            return False
+            return None
 
-        task_id = task["id"]
-        task_text = task["text"]
-
-        self.memory.record(
-            task_id=task_id,
-            task_text=task_text,
-            prediction="",
-            outcome="",
-            success=False,
-            feedback="",
-            state=TaskState.PREDICTED,
-        )
-
-        # 1. Prediction
-        prediction = generate_prediction(
-            task_text=task_text,
-            objective=self.objective,
-            llm_call=self.llm,
-            memory=self.memory,
-            config=self.config,
-        )
+        self._record(task["id"], task["text"], "", "", False, "", TaskState.PREDICTED)
+        return task
 
-        # 2. Execution (policy-gated)
-        recommended_breadth = get_recommended_breadth(
+    def _recommended_breadth(self) -> str:
+        return get_recommended_breadth(
             confidence=self.current_confidence,
             policy_mode=self.current_policy_mode,
         )
 
-        if should_execute(self.current_policy_mode, recommended_breadth):
-            outcome = execute_task(task_text, self.llm)
-        else:
-            logger.info(
-                "Execution skipped",
-                extra={
-                    "policy_mode": self.current_policy_mode.name,
-                    "recommendation": recommended_breadth,
-                    "confidence": self.current_confidence,
-                },
-            )
-            outcome = ""
-
-        self.memory.record(
-            task_id=task_id,
-            task_text=task_text,
-            prediction=prediction,
-            outcome=outcome,
-            success=False,
-            feedback="",
-            state=TaskState.EXECUTED,
-        )
-
-        # 3. Critic
-        success, feedback, error = critic_evaluate(
-            task_text=task_text,
-            prediction=prediction,
-            result=outcome,
-            objective=self.objective,
-            llm_call=self.llm,
+    def _log_execution_skipped(self, recommended_breadth: str) -> None:
+        logger.info(
+            "Execution skipped",
+            extra={
+                "policy_mode": self.current_policy_mode.name,
+                "recommendation": recommended_breadth,
+                "confidence": self.current_confidence,
+            },
         )
 
-        final_state = (
+    @staticmethod
+    def _local_verdict(
+        executed: bool,
+        outcome: str,
+    ) -> Optional[Tuple[bool, str, float, TaskState]]:
+        """
+        Deterministic evaluation when an LLM critic cannot add information.
+
+        Returns (success, feedback, error, final_state), or None if the outcome
+        needs the critic. Policy-deferred tasks end DEFERRED; an executed task
+        with an empty outcome fails pessimistically. Neither costs an LLM call.
+        """
+        if not executed:
+            return False, "Execution deferred by policy", 0.0, TaskState.DEFERRED
+        if not outcome:
+            return False, "Empty outcome - treated as non-success", 1.0, TaskState.FAILED
+        return None
+
+    @staticmethod
+    def _final_state(success: bool, feedback: str) -> TaskState:
+        return (
             TaskState.SUCCEEDED
             if success
             else TaskState.REJECTED_BY_CRITIC
@@ -182,17 +315,21 @@ class ECKAgent:
             else TaskState.FAILED
         )
 
-        self.memory.record(
-            task_id=task_id,
-            task_text=task_text,
-            prediction=prediction,
-            outcome=outcome,
-            success=success,
-            feedback=feedback,
-            state=final_state,
-        )
-
-        # 4. Drift tracking
+    def _track_drift(
+        self,
+        error: float,
+        prediction: str,
+        outcome: str,
+        success: bool,
+    ) -> bool:
+        """
+        Feed drift and feasibility signals for one evaluated task.
+
+        Callers skip DEFERRED tasks: nothing was executed, so there is no
+        prediction error or feasibility evidence to record.
+
+        Returns False if repeated drift requires halting the agent.
+        """
         perceptual_drift = self.drift.record_error(error)
         feasible = is_numeric_feasible(prediction, outcome)
         self.drift.record_feasibility(feasible, success)
@@ -206,38 +343,396 @@ class ECKAgent:
             logger.critical("Repeated drift detected — halting agent")
             return False
 
-        # 5. Goal check
-        goal_prompt = format_prompt(
+        return True
+
+    def _goal_prompt(self, outcome: str) -> str:
+        return format_prompt(
             GOAL_ACHIEVED_PROMPT,
             objective=self.objective,
             result=outcome,
         )
-        if "YES" in self.llm(goal_prompt).upper():
-            logger.info("Goal achieved — stopping early")
-            return False
-
-        # 6. Subtask generation (policy-gated)
-        if should_execute(self.current_policy_mode, recommended_breadth):
-            subtasks = generate_subtasks(
-                current_task=task_text,
-                objective=self.objective,
-                llm_call=self.llm,
-                max_subtasks=5,
-            )
 
-            for sub in subtasks:
-                sub_id = generate_id()
-                self.queue.push({"id": sub_id, "text": sub})
-                self._record_task_created(sub_id, sub)
+    @staticmethod
+    def _goal_achieved(response: str) -> bool:
+        return "YES" in response.upper()
 
+    def _end_cycle(self) -> None:
+        """Count the cycle and run the periodic guard."""
         self.cycles += 1
 
-        # 7. Periodic guard
         if self.cycles % self.config.guard_interval == 0:
             if self.drift.severe():
                 logger.error("Severe instability detected — resetting drift monitor")
                 self.drift = DriftMonitor(config=self.config)
 
+        interval = self.config.checkpoint_interval
+        if interval and self.config.checkpoint_path and self.cycles % interval == 0:
+            self._auto_checkpoint()
+
+    def _auto_checkpoint(self) -> None:
+        """Periodic checkpoint: deltas, with a full one every checkpoint_full_interval."""
+        checkpointer = self.checkpointer
+        delta = (
+            checkpointer is not None
+            and checkpointer.path == self.config.checkpoint_path
+            and checkpointer.sequence + 1 < self.config.checkpoint_full_interval
+        )
+        self.checkpoint(self.config.checkpoint_path, delta=delta)
+
+    def checkpoint(self, path: Optional[str] = None, delta: bool = False) -> str:
+        """
+        Save the agent state for a warm restart; returns the file written.
+
+        Saves the queue, WorldModel records, drift histories, policy mode,
+        cycle count, confidence and task id counter in a compact binary file
+        at path (default config.checkpoint_path). With delta=True only what
+        changed since the previous checkpoint to the same path is written,
+        to a numbered side file (a full checkpoint is written if none exists).
+        """
+        path = path or self.config.checkpoint_path
+        if path is None:
+            raise ValueError("checkpoint() requires a path (or config.checkpoint_path)")
+        if self.checkpointer is None or self.checkpointer.path != path:
+            self.checkpointer = Checkpointer(path)
+        return self.checkpointer.write(self, delta=delta)
+
+    def restore(self, path: Optional[str] = None) -> None:
+        """
+        Load state saved by checkpoint() (the full checkpoint and its deltas).
+
+        Call on a freshly constructed agent (its memory must be empty).
+        Policy upgrades stay irreversible: the restored mode is the stricter
+        of the checkpointed mode and this agent's current mode.
+        """
+        path = path or self.config.checkpoint_path
+        if path is None:
+            raise ValueError("restore() requires a path (or config.checkpoint_path)")
+        policy_mode, self.checkpointer = load_checkpoint(self, path)
+        self._upgrade_policy(policy_mode)
+        if self.dedup is not None:
+            self.dedup.seed(self.memory)
+        logger.info(f"Restored checkpoint {path} at cycle {self.cycles}")
+
+    def step(self) -> bool:
+        """Execute one full control cycle (memory writes batched per step)."""
+        with self.memory.batch():
+            return self._step()
+
+    def _step(self) -> bool:
+        task = self._begin_cycle()
+        if task is None:
+            return False
+
+        task_id = task["id"]
+        task_text = task["text"]
+
+        # 1. Prediction
+        prediction = self._predict(task_text)
+
+        # 2. Execution (policy-gated)
+        executed, recommended_breadth = self._execution_decision()
+        outcome = self._execute(task_text, executed)
+
+        self._record(task_id, task_text, prediction, outcome, False, "", TaskState.EXECUTED)
+
+        # 3. Critic (fused mode also returns the goal verdict and subtasks;
+        #    deferred or empty outcomes are judged locally without LLM calls)
+        local = self._local_verdict(executed, outcome)
+        success, feedback, error, final_state, fused = self._evaluate(
+            task_text, prediction, outcome, local, self._fused_subtask_limit(local),
+        )
+
+        self._record(task_id, task_text, prediction, outcome, success, feedback, final_state)
+
+        # 4. Drift tracking (deferred tasks carry no evidence)
+        if final_state != TaskState.DEFERRED:
+            if not self._track_drift(error, prediction, outcome, success):
+                return False
+
+        # 5. Goal check (an absent outcome cannot achieve the objective)
+        if self._check_goal(outcome, local, fused):
+            return False
+
+        # 6. Subtask generation (policy-gated, throttled by queue backpressure)
+        max_subtasks = self._subtask_request(recommended_breadth, fused)
+        if max_subtasks is not None:
+            self._enqueue_tasks(self._subtasks_for(task_text, fused, max_subtasks))
+
+        # 7. Cycle count + periodic guard
+        self._end_cycle()
+
+        return True
+
+    # -- phases of one task's cycle (shared with ThreadedRunner and
+    #    AsyncECKAgent) ---------------------------------------------------
+    #
+    # Helpers that make LLM calls (_predict, _execute, _evaluate,
+    # _check_goal, _subtasks_for) read agent state but change none; the
+    # others read and update it and must be serialized by a threaded caller.
+    # The *_request helpers build an LLM phase's arguments and the *_verdict
+    # helpers interpret its result, so AsyncECKAgent only swaps the call.
+
+    def _prediction_request(self, task_text: str, memory_context: Optional[str] = None) -> Dict[str, Any]:
+        return dict(
+            task_text=task_text,
+            objective=self.objective,
+            llm_call=self._llm_for(Phase.PREDICTION),
+            memory=self.memory,
+            config=self.config,
+            memory_context=memory_context,
+        )
+
+    def _predict(self, task_text: str, memory_context: Optional[str] = None) -> str:
+        return generate_prediction(**self._prediction_request(task_text, memory_context))
+
+    def _execution_decision(self) -> Tuple[bool, str]:
+        """(executed, recommended_breadth) under the current policy."""
+        recommended_breadth = self._recommended_breadth()
+        executed = should_execute(self.current_policy_mode, recommended_breadth)
+        if not executed:
+            self._log_execution_skipped(recommended_breadth)
+        return executed, recommended_breadth
+
+    def _execute(self, task_text: str, executed: bool) -> str:
+        return execute_task(task_text, self._llm_for(Phase.EXECUTION)) if executed else ""
+
+    def _fused_subtask_limit(self, local) -> Optional[int]:
+        """Subtask cap for the fused prompt (None unless fused evaluation runs)."""
+        if local is None and self.config.enable_fused_evaluation:
+            return self._subtask_limit(skippable=False)
+        return None
+
+    def _evaluate(
+        self,
+        task_text: str,
+        prediction: str,
+        outcome: str,
+        local: Optional[Tuple[bool, str, float, TaskState]],
+        fused_subtasks: Optional[int],
+    ) -> Tuple[bool, str, float, TaskState, Optional[FusedEvaluation]]:
+        """
+        (success, feedback, error, final_state, fused): the local verdict, else
+        fused evaluation when fused_subtasks is set, else the critic.
+        """
+        if local is not None:
+            return local + (None,)
+        if fused_subtasks is not None:
+            request = self._fused_request(task_text, prediction, outcome, fused_subtasks)
+            return self._fused_verdict(fused_evaluate(**request))
+        request = self._critic_request(task_text, prediction, outcome)
+        return self._critic_verdict(*critic_evaluate(**request))
+
+    def _fused_request(self, task_text: str, prediction: str, outcome: str, max_subtasks: int) -> Dict[str, Any]:
+        return dict(
+            task_text=task_text,
+            prediction=prediction,
+            result=outcome,
+            objective=self.objective,
+            llm_call=self._llm_for(Phase.FUSED_EVALUATION),
+            critic_llm_call=self._llm_for(Phase.CRITIC),
+            max_subtasks=max_subtasks,
+            consensus=ConsensusStrategy.from_config(self.config),
+        )
+
+    def _fused_verdict(self, fused: FusedEvaluation) -> Tuple[bool, str, float, TaskState, FusedEvaluation]:
+        final_state = self._final_state(fused.success, fused.feedback)
+        return fused.success, fused.feedback, fused.error, final_state, fused
+
+    def _critic_request(self, task_text: str, prediction: str, outcome: str) -> Dict[str, Any]:
+        return dict(
+            task_text=task_text,
+            prediction=prediction,
+            result=outcome,
+            objective=self.objective,
+            llm_call=self._llm_for(Phase.CRITIC),
+            consensus=ConsensusStrategy.from_config(self.config),
+        )
+
+    def _critic_verdict(self, success: bool, feedback: str, error: float) -> Tuple[bool, str, float, TaskState, None]:
+        return success, feedback, error, self._final_state(success, feedback), None
+
+    def _check_goal(self, outcome: str, local, fused: Optional[FusedEvaluation]) -> bool:
+        """True (and logged) if the outcome achieved the objective."""
+        achieved = self._known_goal_verdict(local, fused)
+        if achieved is None:
+            achieved = self._goal_achieved(self._llm_for(Phase.GOAL_CHECK)(self._goal_prompt(outcome)))
+        return self._goal_verdict(achieved)
+
+    @staticmethod
+    def _known_goal_verdict(local, fused: Optional[FusedEvaluation]) -> Optional[bool]:
+        """The goal verdict if no goal-check call is needed, else None."""
+        if local is not None:
+            return False  # an absent outcome cannot achieve the objective
+        if fused is not None:
+            return fused.goal_achieved
+        return None
+
+    @staticmethod
+    def _goal_verdict(achieved: bool) -> bool:
+        if achieved:
+            logger.info("Goal achieved — stopping early")
+        return achieved
+
+    def _subtask_request(self, recommended_breadth: str, fused: Optional[FusedEvaluation]) -> Optional[int]:
+        """
+        Subtasks to generate: None if policy forbids enqueueing; else the
+        backpressure-adjusted cap (fused subtasks were capped already).
+        """
+        if not should_execute(self.current_policy_mode, recommended_breadth):
+            return None
+        return len(fused.subtasks) if fused is not None else self._subtask_limit()
+
+    def _subtasks_for(self, task_text: str, fused: Optional[FusedEvaluation], max_subtasks: int) -> List[str]:
+        subtasks = self._known_subtasks(fused, max_subtasks)
+        if subtasks is None:
+            subtasks = generate_subtasks(**self._subtasks_request(task_text, max_subtasks))
+        return subtasks
+
+    @staticmethod
+    def _known_subtasks(fused: Optional[FusedEvaluation], max_subtasks: int) -> Optional[List[str]]:
+        """The subtasks if no generation call is needed, else None."""
+        if fused is not None:
+            return list(fused.subtasks)
+        if not max_subtasks:
+            return []
+        return None
+
+    def _subtasks_request(self, task_text: str, max_subtasks: int) -> Dict[str, Any]:
+        return dict(
+            current_task=task_text,
+            objective=self.objective,
+            llm_call=self._llm_for(Phase.SUBTASKS),
+            max_subtasks=max_subtasks,
+        )
+
+    def step_batch(self, max_tasks: Optional[int] = None) -> bool:
+        """
+        Execute one control cycle for up to max_tasks queued tasks using batched LLM calls.
+
+        Each phase (prediction, execution, critic, goal check, subtasks) is one
+        provider call across the batch (critic: one call per voting round;
+        concurrent consensus sends each task's wave of votes in that call).
+        With enable_fused_evaluation, each judged task is evaluated by its own
+        fused call instead (there is no batched fused prompt), which also
+        supplies its goal verdict and subtasks, as in step().
+        Per-task WorldModel states are still recorded in lifecycle order, and
+        drift is tracked task by task in pop order. Policy is resolved once at
+        the start of the batch, so every task in it sees the same mode.
+        """
+        with self.memory.batch():
+            return self._step_batch(max_tasks)
+
+    def _step_batch(self, max_tasks: Optional[int]) -> bool:
+        if not self._policy_allows_cycle():
+            return False
+
+        limit = max_tasks if max_tasks is not None else self.config.batch_size
+        tasks = []
+        while len(tasks) < limit:
+            task = self.queue.pop()
+            if not task:
+                break
+            tasks.append(task)
+
+        if not tasks:
+            logger.info("Task queue empty — nothing to do")
+            return False
+
+        texts = [task["text"] for task in tasks]
+        for task in tasks:
+            self._record(task["id"], task["text"], "", "", False, "", TaskState.PREDICTED)
+
+        # 1. Prediction
+        predictions = generate_predictions_batch(
+            task_texts=texts,
+            objective=self.objective,
+            llm_batch_call=self._batch_for(Phase.PREDICTION),
+            memory=self.memory,
+            config=self.config,
+        )
+
+        # 2. Execution (policy-gated)
+        recommended_breadth = self._recommended_breadth()
+
+        executed = should_execute(self.current_policy_mode, recommended_breadth)
+        if executed:
+            outcomes = execute_tasks_batch(texts, self._batch_for(Phase.EXECUTION))
+        else:
+            self._log_execution_skipped(recommended_breadth)
+            outcomes = [""] * len(tasks)
+
+        for task, prediction, outcome in zip(tasks, predictions, outcomes):
+            self._record(task["id"], task["text"], prediction, outcome, False, "", TaskState.EXECUTED)
+
+        # 3. Critic (deferred or empty outcomes are judged locally;
+        #    fused mode evaluates each judged task with one fused call)
+        verdicts = [self._local_verdict(executed, outcome) for outcome in outcomes]
+        judged = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        fused: Dict[int, FusedEvaluation] = {}
+        if judged and self.config.enable_fused_evaluation:
+            fused_subtasks = self._subtask_limit(tasks=len(judged), skippable=False)
+            for i in judged:
+                *verdict, fused[i] = self._evaluate(texts[i], predictions[i], outcomes[i], None, fused_subtasks)
+                verdicts[i] = tuple(verdict)
+        else:
+            critic_results = critic_evaluate_batch(
+                items=[(texts[i], predictions[i], outcomes[i]) for i in judged],
+                objective=self.objective,
+                llm_batch_call=self._batch_for(Phase.CRITIC),
+                consensus=ConsensusStrategy.from_config(self.config),
+            )
+            for i, (success, feedback, error) in zip(judged, critic_results):
+                verdicts[i] = (success, feedback, error, self._final_state(success, feedback))
+
+        for task, prediction, outcome, (success, feedback, _, final_state) in zip(
+            tasks, predictions, outcomes, verdicts
+        ):
+            self._record(
+                task["id"], task["text"], prediction, outcome, success, feedback, final_state,
+            )
+
+        # 4. Drift tracking (pop order; deferred tasks carry no evidence)
+        for prediction, outcome, (success, _, error, final_state) in zip(
+            predictions, outcomes, verdicts
+        ):
+            if final_state == TaskState.DEFERRED:
+                continue
+            if not self._track_drift(error, prediction, outcome, success):
+                return False
+
+        # 5. Goal check (only outcomes the critic judged; fused verdicts are in)
+        if fused:
+            achieved = any(evaluation.goal_achieved for evaluation in fused.values())
+        else:
+            goal_responses = call_batch(
+                self._batch_for(Phase.GOAL_CHECK),
+                [self._goal_prompt(outcomes[i]) for i in judged],
+            )
+            achieved = any(self._goal_achieved(response) for response in goal_responses)
+        if self._goal_verdict(achieved):
+            return False
+
+        # 6. Subtask generation (policy-gated, throttled by queue backpressure;
+        #    fused tasks bring their own)
+        if should_execute(self.current_policy_mode, recommended_breadth):
+            subtasks = {i: list(evaluation.subtasks) for i, evaluation in fused.items()}
+            pending = [i for i in range(len(tasks)) if i not in fused]
+            max_subtasks = self._subtask_limit(tasks=len(pending)) if pending else 0
+            if max_subtasks:
+                subtask_lists = generate_subtasks_batch(
+                    current_tasks=[texts[i] for i in pending],
+                    objective=self.objective,
+                    llm_batch_call=self._batch_for(Phase.SUBTASKS),
+                    max_subtasks=max_subtasks,
+                )
+                subtasks.update(zip(pending, subtask_lists))
+
+            self._enqueue_tasks([sub for i in sorted(subtasks) for sub in subtasks[i]])
+
+        # 7. Cycle count + periodic guard (one cycle per task)
+        for _ in tasks:
+            self._end_cycle()
+
         return True
 
     def run(self) -> None:
@@ -247,3 +742,23 @@ class ECKAgent:
             if not self.step():
                 break
         logger.info(f"ECK run completed after {self.cycles} cycles")
+
+    def run_threaded(self, workers: Optional[int] = None) -> None:
+        """
+        Run the agent with tasks processed concurrently on a thread pool.
+
+        Up to workers (default config.worker_threads) tasks are in flight;
+        their LLM calls overlap while memory, drift and queue updates are
+        serialized (see ThreadedRunner). llm_call must be thread-safe.
+        """
+        ThreadedRunner(self, workers=workers).run()
+
+    def run_batch(self, max_tasks: Optional[int] = None) -> None:
+        """Run the agent with step_batch() until halt or max iterations."""
+        logger.info(f"Starting batched ECK run with objective: {self.objective}")
+        while self.cycles < self.config.max_iterations:
+            remaining = self.config.max_iterations - self.cycles
+            limit = max_tasks if max_tasks is not None else self.config.batch_size
+            if not self.step_batch(max_tasks=min(limit, remaining)):
+                break
+        logger.info(f"ECK run completed after {self.cycles} cycles")
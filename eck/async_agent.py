@@ -0,0 +1,288 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .agent import ECKAgent
+from .config import ECKConfig, PolicyMode
+from .task import TaskState
+from .phase import Phase
+from .llm_cache import LLMCache
+from .retrieval import EmbedFn
+from .models import TaskId
+from .critic import critic_evaluate_async
+from .prediction import build_prediction_context, generate_prediction_async
+from .task_generation import generate_subtasks_async
+from .execution import execute_task_async
+from .evaluation import FusedEvaluation, fused_evaluate_async
+
+logger = logging.getLogger("eck-core")
+
+
+@dataclass
+class _Prefetch:
+    """A speculative prediction and the inputs it was computed from."""
+    memory_context: str
+    policy_mode: PolicyMode
+    future: "asyncio.Future[str]"
+
+
+class AsyncECKAgent(ECKAgent):
+    """
+    Asyncio-native variant of ECKAgent.
+
+    Accepts an awaitable LLM callable so many agents can share one event loop.
+    Phase ordering (prediction → execution → evaluation), policy gating and
+    irreversible policy upgrades are identical to ECKAgent.step().
+
+    The synchronous entry points (seed/step/run) are disabled; use
+    seed_async/step_async/run_async instead.
+    """
+
+    def __init__(
+        self,
+        objective: str,
+        llm_call: Callable[[str], Awaitable[str]],  # Single async LLM function for all prompts
+        config: ECKConfig = None,
+        llm_cache: Optional[LLMCache] = None,
+        embed_fn: Optional[EmbedFn] = None,
+        cold_storage: Optional[Callable[[TaskId, Dict[str, Any]], None]] = None,
+    ):
+        if config is not None and config.queue_mode == "priority" and config.queue_scorer == "llm":
+            raise ValueError('queue_scorer="llm" needs a synchronous llm_call; use ECKAgent')
+
+        super().__init__(
+            objective=objective,
+            llm_call=llm_call,
+            config=config,
+            llm_cache=llm_cache,
+            embed_fn=embed_fn,
+            cold_storage=cold_storage,
+        )
+
+        # Speculative predictions for upcoming queue entries (task_id → _Prefetch)
+        self._prefetched: Dict[TaskId, _Prefetch] = {}
+        self.prefetch_started: int = 0
+        self.prefetch_hits: int = 0
+        self.prefetch_discarded: int = 0
+
+    def _llm_for(self, phase: Phase) -> Callable[[str], Awaitable[str]]:
+        """Return the awaitable llm_call for a phase (cache-wrapped when enabled)."""
+        if self.llm_cache is None:
+            return self.llm
+        return self.llm_cache.wrap_async(self.llm, phase)
+
+    def seed(self, initial_task: str = None) -> None:
+        raise TypeError("AsyncECKAgent requires seed_async()")
+
+    def step(self) -> bool:
+        raise TypeError("AsyncECKAgent requires step_async()")
+
+    def run(self) -> None:
+        raise TypeError("AsyncECKAgent requires run_async()")
+
+    def _start_prefetch(self) -> None:
+        """
+        Start background predictions for the next queued tasks.
+
+        Runs while the current task is being evaluated. Speculation never
+        touches memory or the queue, and its context lookup reports no
+        retrieval hits (the context is built again, for real, when the task
+        is popped); results are only used if still valid then (see
+        _take_prefetched).
+        """
+        depth = self.config.prediction_prefetch_depth
+        if depth <= 0:
+            return
+
+        upcoming = self.queue.peek(depth)
+        upcoming_ids = {task["id"] for task in upcoming}
+
+        # Tasks dropped from the queue will never be popped
+        for task_id in list(self._prefetched):
+            if task_id not in upcoming_ids:
+                self._discard_prefetch(task_id)
+
+        for task in upcoming:
+            if task["id"] in self._prefetched:
+                continue
+            memory_context = build_prediction_context(
+                task["text"], self.objective, self.memory, self.config, peek=True
+            )
+            future = asyncio.ensure_future(
+                generate_prediction_async(
+                    task_text=task["text"],
+                    objective=self.objective,
+                    llm_call=self._llm_for(Phase.PREDICTION),
+                    memory=self.memory,
+                    config=self.config,
+                    memory_context=memory_context,
+                )
+            )
+            self._prefetched[task["id"]] = _Prefetch(
+                memory_context=memory_context,
+                policy_mode=self.current_policy_mode,
+                future=future,
+            )
+            self.prefetch_started += 1
+
+    def _discard_prefetch(self, task_id: TaskId) -> None:
+        prefetch = self._prefetched.pop(task_id)
+        prefetch.future.cancel()
+        self.prefetch_discarded += 1
+
+    def cancel_prefetch(self) -> None:
+        """Cancel all outstanding speculative predictions."""
+        for task_id in list(self._prefetched):
+            self._discard_prefetch(task_id)
+
+    async def _take_prefetched(self, task_id: TaskId, task_text: str) -> Optional[str]:
+        """
+        Return a speculative prediction if it is still valid, else None.
+
+        Valid means the policy mode has not changed since it was started and
+        the memory context it was built from is identical to the current one.
+        """
+        prefetch = self._prefetched.get(task_id)
+        if prefetch is None:
+            return None
+
+        current_context = build_prediction_context(
+            task_text, self.objective, self.memory, self.config
+        )
+        if (
+            prefetch.policy_mode != self.current_policy_mode
+            or prefetch.memory_context != current_context
+        ):
+            self._discard_prefetch(task_id)
+            return None
+
+        del self._prefetched[task_id]
+        try:
+            prediction = await prefetch.future
+        except Exception as e:
+            logger.warning(f"Speculative prediction failed, recomputing: {e}")
+            self.prefetch_discarded += 1
+            return None
+
+        self.prefetch_hits += 1
+        return prediction
+
+    async def seed_async(self, initial_task: str = None) -> None:
+        """Seed the agent with an initial task (or generate one)."""
+        if initial_task is None:
+            initial_task = (await self._llm_for(Phase.SEED)(self._initial_task_prompt())).strip()
+
+        self._enqueue_task(initial_task)
+
+        logger.info(f"Agent seeded with initial task: {initial_task}")
+
+    async def step_async(self) -> bool:
+        """
+        Execute one full control cycle (awaitable counterpart of step()).
+
+        When the cycle ends the run (returns False or raises), outstanding
+        speculative predictions are cancelled, so callers driving
+        step_async() directly leak no background LLM calls.
+        """
+        progressed = False
+        try:
+            with self.memory.batch():
+                progressed = await self._step_async()
+        finally:
+            if not progressed:
+                self.cancel_prefetch()
+        return progressed
+
+    async def _step_async(self) -> bool:
+        task = self._begin_cycle()
+        if task is None:
+            return False
+
+        task_id = task["id"]
+        task_text = task["text"]
+
+        # 1. Prediction (speculative result reused only if still valid)
+        prediction = await self._take_prefetched(task_id, task_text)
+        if prediction is None:
+            prediction = await generate_prediction_async(**self._prediction_request(task_text))
+
+        # 2. Execution (policy-gated)
+        executed, recommended_breadth = self._execution_decision()
+        outcome = ""
+        if executed:
+            outcome = await execute_task_async(task_text, self._llm_for(Phase.EXECUTION))
+
+        self._record(task_id, task_text, prediction, outcome, False, "", TaskState.EXECUTED)
+
+        # 3. Critic (fused mode also returns the goal verdict and subtasks;
+        #    deferred or empty outcomes are judged locally without LLM calls)
+        self._start_prefetch()
+        local = self._local_verdict(executed, outcome)
+        success, feedback, error, final_state, fused = await self._evaluate_async(
+            task_text, prediction, outcome, local, self._fused_subtask_limit(local),
+        )
+
+        self._record(task_id, task_text, prediction, outcome, success, feedback, final_state)
+
+        # 4. Drift tracking (deferred tasks carry no evidence)
+        if final_state != TaskState.DEFERRED:
+            if not self._track_drift(error, prediction, outcome, success):
+                return False
+
+        # 5. Goal check (an absent outcome cannot achieve the objective)
+        if await self._check_goal_async(outcome, local, fused):
+            return False
+
+        # 6. Subtask generation (policy-gated, throttled by queue backpressure)
+        max_subtasks = self._subtask_request(recommended_breadth, fused)
+        if max_subtasks is not None:
+            self._enqueue_tasks(await self._subtasks_for_async(task_text, fused, max_subtasks))
+
+        # 7. Cycle count + periodic guard
+        self._end_cycle()
+
+        return True
+
+    # Awaitable counterparts of ECKAgent's LLM phases (same requests and verdicts)
+
+    async def _evaluate_async(
+        self,
+        task_text: str,
+        prediction: str,
+        outcome: str,
+        local: Optional[Tuple[bool, str, float, TaskState]],
+        fused_subtasks: Optional[int],
+    ) -> Tuple[bool, str, float, TaskState, Optional[FusedEvaluation]]:
+        if local is not None:
+            return local + (None,)
+        if fused_subtasks is not None:
+            request = self._fused_request(task_text, prediction, outcome, fused_subtasks)
+            return self._fused_verdict(await fused_evaluate_async(**request))
+        request = self._critic_request(task_text, prediction, outcome)
+        return self._critic_verdict(*await critic_evaluate_async(**request))
+
+    async def _check_goal_async(self, outcome: str, local, fused: Optional[FusedEvaluation]) -> bool:
+        achieved = self._known_goal_verdict(local, fused)
+        if achieved is None:
+            achieved = self._goal_achieved(await self._llm_for(Phase.GOAL_CHECK)(self._goal_prompt(outcome)))
+        return self._goal_verdict(achieved)
+
+    async def _subtasks_for_async(
+        self, task_text: str, fused: Optional[FusedEvaluation], max_subtasks: int,
+    ) -> List[str]:
+        subtasks = self._known_subtasks(fused, max_subtasks)
+        if subtasks is None:
+            subtasks = await generate_subtasks_async(**self._subtasks_request(task_text, max_subtasks))
+        return subtasks
+
+    async def run_async(self) -> None:
+        """Run the agent until halt or max iterations."""
+        logger.info(f"Starting ECK run with objective: {self.objective}")
+        try:
+            while self.cycles < self.config.max_iterations:
+                if not await self.step_async():
+                    break
+        finally:
+            self.cancel_prefetch()
+        logger.info(f"ECK run completed after {self.cycles} cycles")
@@ -0,0 +1,100 @@
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger("eck-core")
+
+
+class SubtaskBackpressure:
+    """
+    Throttles subtask generation by task-queue occupancy.
+
+    Watermarks are fractions of the queue's capacity (max_size). Below the
+    low watermark, with a queue that is not growing, the policy cap applies.
+    At or above the high watermark generation is skipped. In between, each
+    generating task may add at most its share of the headroom left under
+    the high watermark after the expected growth (a moving average of the
+    queue-length change between decisions). The cap never exceeds a task's
+    share of the free capacity, so requested subtasks are not dropped by a
+    full queue as soon as they arrive. A cap of 0 skips the LLM call.
+
+    Counters: calls_saved (subtask prompts not sent), subtasks_saved
+    (subtask slots requested below the policy cap), throttled (decisions
+    below the cap).
+    """
+
+    def __init__(
+        self,
+        low_watermark: float = 0.5,
+        high_watermark: float = 0.9,
+        smoothing: float = 0.5,
+    ):
+        if not 0.0 <= low_watermark <= high_watermark <= 1.0:
+            raise ValueError("watermarks must satisfy 0 <= low <= high <= 1")
+        if not 0.0 < smoothing <= 1.0:
+            raise ValueError("smoothing must be in (0, 1]")
+
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.smoothing = smoothing
+
+        self.growth = 0.0  # smoothed queue-length change per decision
+        self._last_size: Optional[int] = None
+
+        self.decisions = 0
+        self.throttled = 0
+        self.calls_saved = 0
+        self.subtasks_saved = 0
+
+    @classmethod
+    def from_config(cls, config) -> "SubtaskBackpressure":
+        return cls(config.queue_low_watermark, config.queue_high_watermark)
+
+    def limit(self, size: int, capacity: int, cap: int, tasks: int = 1, skippable: bool = True) -> int:
+        """
+        Subtasks each of `tasks` generating tasks may request now.
+
+        Args:
+            size: Current queue length.
+            capacity: Queue capacity (max_size).
+            cap: Policy maximum per task.
+            tasks: Tasks generating subtasks in this decision (batch size).
+            skippable: False if the prompt is sent anyway (fused evaluation),
+                so a cap of 0 saves subtasks but no call.
+        """
+        if self._last_size is not None:
+            self.growth += self.smoothing * ((size - self._last_size) - self.growth)
+        self._last_size = size
+        self.decisions += 1
+
+        if size >= self.high_watermark * capacity:
+            limit = 0
+        elif size <= self.low_watermark * capacity and self.growth <= 0:
+            limit = cap
+        else:
+            headroom = self.high_watermark * capacity - size - max(self.growth, 0.0)
+            limit = int(headroom // tasks)
+        limit = max(0, min(cap, limit, max(capacity - size, 0) // tasks))
+
+        if limit < cap:
+            self.throttled += 1
+            self.subtasks_saved += (cap - limit) * tasks
+            if limit == 0 and skippable:
+                self.calls_saved += tasks
+                logger.debug(f"Backpressure: subtask generation skipped (queue {size}/{capacity})")
+        return limit
+
+    def stats(self) -> Dict[str, float]:
+        """Savings counters and the current growth estimate (observability only)."""
+        return {
+            "decisions": self.decisions,
+            "throttled": self.throttled,
+            "calls_saved": self.calls_saved,
+            "subtasks_saved": self.subtasks_saved,
+            "growth": self.growth,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"SubtaskBackpressure(low={self.low_watermark}, high={self.high_watermark}, "
+            f"calls_saved={self.calls_saved}, subtasks_saved={self.subtasks_saved})"
+        )
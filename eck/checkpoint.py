@@ -0,0 +1,560 @@
+import os
+import math
+import mmap
+import zlib
+import struct
+import logging
+import secrets
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from .config import PolicyMode
+from .models import Task, TaskId
+from .memory import WorldModel
+from .queue import DurableTaskQueue, PriorityTaskQueue
+from .task import TaskState
+from .event_log import (
+    LifecycleEvent,
+    encode_event,
+    decode_event,
+    _FRAME,
+    _INT_ID,
+    _ID_INT,
+    _ID_STR,
+    _pack_str,
+    _unpack_str,
+)
+
+logger = logging.getLogger("eck-core")
+
+
+VERSION = 3  # 2: queue priorities, 3: shared-index owner
+_MAGIC = b"ECKC"
+
+# magic, version, kind, flags, base token, delta sequence, head length, head CRC-32, file length
+_HEADER = struct.Struct("<4sHBBQIIIQ")
+_FULL = 0
+_DELTA = 1
+_HAS_RECORDS = 0x01
+_DURABLE_QUEUE = 0x02  # queue not in the file: it lives in its own database
+
+# cycles, next task id, confidence, last_error_z, drift_streak, numeric_bias,
+# error history start, then counts: errors, drifts, feasibility, queue, uuid start, uuids, removed
+_STATE = struct.Struct("<qqddqdqIIIIqII")
+_ID_KIND = struct.Struct("<B")
+_COUNT = struct.Struct("<I")
+_SEQ = struct.Struct("<q")
+
+_DELTA_INFIX = ".delta-"
+
+_FINAL_STATES = frozenset({
+    TaskState.SUCCEEDED.value,
+    TaskState.FAILED.value,
+    TaskState.REJECTED_BY_CRITIC.value,
+    TaskState.DEFERRED.value,
+})
+
+
+def _pack_id(parts: List[bytes], task_id: TaskId) -> None:
+    if isinstance(task_id, int):
+        parts.append(_ID_KIND.pack(_ID_INT))
+        parts.append(_INT_ID.pack(task_id))
+    else:
+        parts.append(_ID_KIND.pack(_ID_STR))
+        _pack_str(parts, task_id)
+
+
+def _unpack_id(buf, offset: int) -> Tuple[TaskId, int]:
+    (kind,) = _ID_KIND.unpack_from(buf, offset)
+    offset += _ID_KIND.size
+    if kind == _ID_INT:
+        (task_id,) = _INT_ID.unpack_from(buf, offset)
+        return task_id, offset + _INT_ID.size
+    return _unpack_str(buf, offset)
+
+
+def _supports_records(memory) -> bool:
+    """Only a plain in-memory WorldModel needs its records in the checkpoint."""
+    return isinstance(memory, WorldModel) and memory.event_log is None
+
+
+def _finished(memory, task_id: TaskId) -> bool:
+    """True if memory holds a final state for task_id (nothing left to run)."""
+    entry = memory.get(task_id)
+    return entry is not None and entry["state"] in _FINAL_STATES
+
+
+def _base_queue(agent):
+    """The agent's queue, unwrapped from a ConcurrentTaskQueue."""
+    return getattr(agent.queue, "inner", agent.queue)
+
+
+def delta_path(path: str, sequence: int) -> str:
+    return f"{path}{_DELTA_INFIX}{sequence:06d}"
+
+
+def delta_paths(path: str) -> List[str]:
+    """Existing delta files of a checkpoint path, in sequence order."""
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + _DELTA_INFIX
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(prefix) and name[len(prefix):].isdigit()
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+@dataclass
+class CheckpointState:
+    """Agent state decoded from the head of one checkpoint or delta file."""
+    kind: int
+    token: int
+    sequence: int
+    has_records: bool
+    durable_queue: bool
+    objective: str
+    policy_mode: PolicyMode
+    cycles: int
+    next_task_id: int
+    confidence: float
+    last_error_z: float
+    drift_streak: int
+    numeric_bias: float
+    error_start: int
+    errors: List[float]
+    recent_drifts: List[bool]
+    feasibility: List[Tuple[bool, bool]]
+    queue: List[Task]
+    queue_scores: List[float]  # NaN: not scored (FIFO queue)
+    uuid_start: int
+    uuids: List[Tuple[int, str]]
+    removed: List[TaskId] = field(default_factory=list)
+    index_owner: Optional[str] = None  # WorldModel.index_owner of the saved records
+
+    @property
+    def is_delta(self) -> bool:
+        return self.kind == _DELTA
+
+
+class CheckpointReader:
+    """
+    Memory-mapped reader for one checkpoint or delta file.
+
+    Opening the file validates the header and decodes only the small head
+    (agent state, drift histories, queue); memory records are decoded one
+    at a time by records(), straight from the mapping, each frame checked
+    by its own CRC-32, so no copy of the file is buffered. Restore still
+    decodes every record into the WorldModel (the similarity index needs
+    every task text); nothing is loaded on demand later.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"Not a checkpoint (too short): {path}")
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        try:
+            self.state = self._read_head(size)
+        except Exception:
+            self.close()
+            raise
+
+    def _read_head(self, size: int) -> CheckpointState:
+        magic, version, kind, flags, token, sequence, head_length, head_crc, length = (
+            _HEADER.unpack_from(self._buf, 0)
+        )
+        if magic != _MAGIC:
+            raise ValueError(f"Not a checkpoint (bad magic): {self.path}")
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version}: {self.path}")
+        start = _HEADER.size
+        if length != size or start + head_length > size:
+            raise ValueError(f"Truncated checkpoint: {self.path}")
+        with memoryview(self._buf) as view, view[start:start + head_length] as head:
+            if zlib.crc32(head) != head_crc:
+                raise ValueError(f"Corrupt checkpoint: {self.path}")
+
+        buf = self._buf
+        (
+            cycles, next_task_id, confidence, last_error_z, drift_streak, numeric_bias,
+            error_start, n_errors, n_drifts, n_feasibility, n_queue,
+            uuid_start, n_uuids, n_removed,
+        ) = _STATE.unpack_from(buf, start)
+        offset = start + _STATE.size
+
+        objective, offset = _unpack_str(buf, offset)
+        policy, offset = _unpack_str(buf, offset)
+
+        errors = array("d")
+        errors.frombytes(buf[offset:offset + 8 * n_errors])
+        offset += 8 * n_errors
+        recent_drifts = [bool(b) for b in buf[offset:offset + n_drifts]]
+        offset += n_drifts
+        feasibility = [(bool(b & 2), bool(b & 1)) for b in buf[offset:offset + n_feasibility]]
+        offset += n_feasibility
+
+        queue = []
+        for _ in range(n_queue):
+            task_id, offset = _unpack_id(buf, offset)
+            text, offset = _unpack_str(buf, offset)
+            queue.append(Task(task_id, text))
+        queue_scores = array("d")
+        if version >= 2:
+            queue_scores.frombytes(buf[offset:offset + 8 * n_queue])
+            offset += 8 * n_queue
+        else:
+            queue_scores.extend([math.nan] * n_queue)
+
+        uuids = []
+        for _ in range(n_uuids):
+            (task_id,) = _INT_ID.unpack_from(buf, offset)
+            uid, offset = _unpack_str(buf, offset + _INT_ID.size)
+            uuids.append((task_id, uid))
+
+        removed = []
+        for _ in range(n_removed):
+            task_id, offset = _unpack_id(buf, offset)
+            removed.append(task_id)
+        index_owner = None
+        if version >= 3:
+            index_owner, offset = _unpack_str(buf, offset)
+
+        self._records_offset = start + head_length
+        return CheckpointState(
+            kind=kind,
+            token=token,
+            sequence=sequence,
+            has_records=bool(flags & _HAS_RECORDS),
+            durable_queue=bool(flags & _DURABLE_QUEUE),
+            objective=objective,
+            policy_mode=PolicyMode(policy),
+            cycles=cycles,
+            next_task_id=next_task_id,
+            confidence=confidence,
+            last_error_z=last_error_z,
+            drift_streak=drift_streak,
+            numeric_bias=numeric_bias,
+            error_start=error_start,
+            errors=errors.tolist(),
+            recent_drifts=recent_drifts,
+            feasibility=feasibility,
+            queue=queue,
+            queue_scores=queue_scores.tolist(),
+            uuid_start=uuid_start,
+            uuids=uuids,
+            removed=removed,
+            index_owner=index_owner,
+        )
+
+    def records(self) -> Iterator[Tuple[int, LifecycleEvent]]:
+        """Yield (seq, record) pairs in last-recorded order, decoded lazily."""
+        if not self.state.has_records:
+            return
+        buf = self._buf
+        (count,) = _COUNT.unpack_from(buf, self._records_offset)
+        offset = self._records_offset + _COUNT.size
+        for _ in range(count):
+            (seq,) = _SEQ.unpack_from(buf, offset)
+            length, crc = _FRAME.unpack_from(buf, offset + _SEQ.size)
+            start = offset + _SEQ.size + _FRAME.size
+            with memoryview(buf) as view, view[start:start + length] as payload:
+                if len(payload) != length or zlib.crc32(payload) != crc:
+                    raise ValueError(f"Corrupt record in checkpoint: {self.path}")
+            yield seq, decode_event(buf, start)
+            offset = start + length
+
+    def close(self) -> None:
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+        self._file.close()
+
+    def __enter__(self) -> "CheckpointReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _write_atomic(path: str, chunks: List[bytes]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Checkpointer:
+    """
+    Writes full and delta checkpoints of one agent to one path.
+
+    A full checkpoint (written to `path`) holds the whole agent state: the
+    queue, drift histories, policy mode, counters and every WorldModel record.
+    A delta (`path.delta-<n>`) holds the same small state plus only the
+    records changed or removed since the previous checkpoint, and the tail
+    of the append-only histories. Restore loads the base and then every
+    delta of the same base in order. Writing a full checkpoint starts a new
+    base and removes the old deltas.
+
+    Records are written only for an in-memory WorldModel without an event
+    log; the SQLite backend and the event log are durable on their own.
+    Likewise a DurableTaskQueue is not copied: its database is authoritative.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.token: Optional[int] = None  # identifies the current base
+        self.sequence = 0  # deltas written on top of the base
+        self._drift = None
+        self._errors = 0
+        self._uuids = 0
+
+    def write(self, agent, delta: bool = False) -> str:
+        """Write a checkpoint of agent; returns the file written."""
+        if delta and self.token is None:
+            delta = False
+
+        memory = agent.memory
+        has_records = _supports_records(memory)
+        durable_queue = isinstance(_base_queue(agent), DurableTaskQueue)
+        removed: List[TaskId] = []
+
+        if delta:
+            drift_reset = agent.drift is not self._drift or len(agent.drift.error_history) < self._errors
+            error_start = 0 if drift_reset else self._errors
+            uuid_start = self._uuids
+            if has_records:
+                changed, removed = memory.take_changes()
+                records = ((task_id, memory.tasks[task_id]) for task_id in changed)
+            sequence = self.sequence + 1
+            path = delta_path(self.path, sequence)
+        else:
+            error_start = uuid_start = 0
+            if has_records:
+                memory.track_changes()
+                records = memory.tasks.items()
+            self.token = secrets.randbits(64)
+            sequence = 0
+            path = self.path
+
+        head = self._encode_head(agent, error_start, uuid_start, removed)
+        parts = [head]
+        if has_records:
+            frames = [
+                _SEQ.pack(record.seq) + encode_event(LifecycleEvent(
+                    task_id, record.task, record.state, record.prediction, record.outcome,
+                    record.success, record.feedback, record.timestamp_ns, record.metadata,
+                ))
+                for task_id, record in records
+            ]
+            parts.append(_COUNT.pack(len(frames)))
+            parts.extend(frames)
+
+        length = _HEADER.size + sum(len(part) for part in parts)
+        flags = (_HAS_RECORDS if has_records else 0) | (_DURABLE_QUEUE if durable_queue else 0)
+        header = _HEADER.pack(
+            _MAGIC, VERSION, _DELTA if delta else _FULL, flags,
+            self.token, sequence, len(head), zlib.crc32(head), length,
+        )
+        _write_atomic(path, [header] + parts)
+
+        if not delta:
+            # The new base supersedes every older delta
+            for stale in delta_paths(self.path):
+                os.remove(stale)
+
+        self.sequence = sequence
+        self.mark(agent)
+        logger.info(f"Checkpoint written: {path} ({length} bytes)")
+        return path
+
+    def mark(self, agent) -> None:
+        """Remember what the last checkpoint covered (the next delta starts here)."""
+        self._drift = agent.drift
+        self._errors = len(agent.drift.error_history)
+        self._uuids = agent.task_ids.uuid_count
+
+    def _encode_head(
+        self,
+        agent,
+        error_start: int,
+        uuid_start: int,
+        removed: List[TaskId],
+    ) -> bytes:
+        drift = agent.drift
+        errors = array("d", drift.error_history[error_start:])
+        uuids = agent.task_ids.uuid_items(uuid_start)
+        queue = _base_queue(agent)
+        if isinstance(queue, DurableTaskQueue):
+            scored = []
+        elif isinstance(queue, PriorityTaskQueue):
+            scored = queue.scored_tasks()
+        else:
+            scored = [(math.nan, task) for task in queue.as_list()]
+        # Tasks a threaded run has popped but not finished are queued again on restore
+        scored = [(math.nan, task) for task in agent._in_flight.values()] + scored
+
+        parts = [_STATE.pack(
+            agent.cycles, agent.task_ids.next_id, agent.current_confidence,
+            drift.last_error_z, drift.drift_streak, drift.numeric_bias,
+            error_start, len(errors), len(drift.recent_drifts), len(drift.feasibility_history),
+            len(scored), uuid_start, len(uuids), len(removed),
+        )]
+        _pack_str(parts, agent.objective)
+        _pack_str(parts, agent.current_policy_mode.value)
+        parts.append(errors.tobytes())
+        parts.append(bytes(int(bool(d)) for d in drift.recent_drifts))
+        parts.append(bytes(
+            (2 if was_numeric else 0) | (1 if success else 0)
+            for was_numeric, success in drift.feasibility_history
+        ))
+        for _, task in scored:
+            _pack_id(parts, task["id"])
+            _pack_str(parts, task["text"])
+        parts.append(array("d", (score for score, _ in scored)).tobytes())
+        for task_id, uid in uuids:
+            parts.append(_INT_ID.pack(task_id))
+            _pack_str(parts, uid)
+        for task_id in removed:
+            _pack_id(parts, task_id)
+        _pack_str(parts, getattr(agent.memory, "index_owner", None))
+        return b"".join(parts)
+
+
+def _open_chain(path: str) -> List[CheckpointReader]:
+    """Base reader plus the readers of its valid deltas, in order."""
+    base = CheckpointReader(path)
+    if base.state.is_delta:
+        base.close()
+        raise ValueError(f"Not a full checkpoint: {path}")
+
+    chain = [base]
+    for candidate in delta_paths(path):
+        try:
+            reader = CheckpointReader(candidate)
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable delta checkpoint: {e}")
+            break
+        state = reader.state
+        if not state.is_delta or state.token != base.state.token:
+            reader.close()
+            continue  # left over from an older base
+        if state.sequence != len(chain):
+            reader.close()
+            logger.warning(f"Delta checkpoint chain broken at {candidate}")
+            break
+        chain.append(reader)
+    return chain
+
+
+def load_checkpoint(agent, path: str) -> Tuple[PolicyMode, Checkpointer]:
+    """
+    Restore agent state from a checkpoint and its deltas.
+
+    Returns the checkpointed policy mode (the caller applies it without
+    downgrading) and a Checkpointer positioned to continue the delta chain.
+    A DurableTaskQueue is left as it is on disk (it is newer than any
+    checkpoint); tasks that were in flight go back to its head and tasks
+    saved from another queue are pushed onto it, skipping tasks already
+    queued or finished.
+    """
+    chain = _open_chain(path)
+    try:
+        memory = agent.memory
+        has_records = chain[0].state.has_records
+        if has_records:
+            if not _supports_records(memory):
+                raise ValueError("Checkpoint holds WorldModel records; restore into an in-memory WorldModel")
+            if len(memory):
+                raise ValueError("restore() requires an agent with empty memory")
+        elif _supports_records(memory):
+            logger.warning("Checkpoint has no memory records (it was taken with a durable memory backend)")
+
+        if has_records and memory.index_owner is not None and chain[0].state.index_owner:
+            # Same keys as before the restart, so records already in a shared
+            # vector file are resolved instead of appended again
+            memory.index_owner = chain[0].state.index_owner
+
+        errors: List[float] = []
+        uuids: List[Tuple[int, str]] = []
+        with memory.batch():  # texts are indexed together
+            for reader in chain:
+                state = reader.state
+                errors = errors[:state.error_start] + state.errors
+                uuids = uuids[:state.uuid_start] + state.uuids
+                if has_records:
+                    for task_id in state.removed:
+                        memory.discard(task_id)
+                    for seq, event in reader.records():
+                        memory.load(event, seq)
+
+        last = chain[-1].state
+        agent.objective = last.objective
+        agent.cycles = last.cycles
+        agent.current_confidence = last.confidence
+        agent.task_ids.load(last.next_task_id, uuids)
+        if not has_records:
+            # Durable memories may hold tasks recorded after this checkpoint
+            agent.task_ids.advance_past(memory.max_int_id())
+
+        drift = agent.drift
+        drift.error_history = errors
+        drift.last_error_z = last.last_error_z
+        drift.drift_streak = last.drift_streak
+        drift.numeric_bias = last.numeric_bias
+        drift.recent_drifts.clear()
+        drift.recent_drifts.extend(last.recent_drifts)
+        drift.feasibility_history.clear()
+        drift.feasibility_history.extend(last.feasibility)
+
+        queue = _base_queue(agent)
+        if last.durable_queue and not isinstance(queue, DurableTaskQueue):
+            logger.warning("Checkpoint has no queued tasks (it was taken with a durable queue)")
+        if isinstance(queue, DurableTaskQueue):
+            # Its own tasks are on disk already; the checkpoint adds tasks that
+            # were in flight (back at the head, unless already queued or
+            # finished since), or those saved from another queue type
+            pending = [
+                task for task in last.queue
+                if not queue.has_task(task["id"]) and not _finished(memory, task["id"])
+            ]
+            if last.durable_queue:
+                queue.push_front(pending)
+            else:
+                queue.push_many(pending)
+        elif isinstance(queue, PriorityTaskQueue):
+            queue.clear()
+            # Saved priorities are kept; tasks saved from a FIFO queue are scored now
+            unscored = []
+            for task, score in zip(last.queue, last.queue_scores):
+                if math.isnan(score):
+                    unscored.append(task)
+                else:
+                    queue.push(task, score=score)
+            queue.push_many(unscored)
+        else:
+            queue.clear()
+            queue.push_many(last.queue)
+
+        checkpointer = Checkpointer(path)
+        checkpointer.token = chain[0].state.token
+        checkpointer.sequence = len(chain) - 1
+        checkpointer.mark(agent)
+        if has_records:
+            memory.track_changes()
+        return last.policy_mode, checkpointer
+    finally:
+        for reader in chain:
+            reader.close()
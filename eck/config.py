@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Mapping
+from typing import Mapping, Optional
 from types import MappingProxyType
 
 
@@ -36,7 +36,33 @@ class ECKConfig:
     feas_conf_high: float = 0.8
     feas_conf_low: float = 0.5
     low_conf_threshold: float = 0.4
-    task_similarity_threshold: float = 0.75
+    task_similarity_threshold: float = 0.75  # near-duplicate cutoff for task dedup
+    batch_size: int = 8  # Max tasks per step_batch() cycle
+    prediction_prefetch_depth: int = 0  # Async only: queued tasks predicted ahead (0 = off)
+    worker_threads: int = 4  # Tasks in flight at once in run_threaded() / ThreadedRunner
+    max_subtasks: int = 5  # Subtasks requested per task in NORMAL mode (policies may lower it)
+
+    # Reject new tasks that duplicate (normalized text, or task_similarity_threshold
+    # word overlap) a queued or SUCCEEDED task
+    enable_task_dedup: bool = False
+
+    # Task queue: "fifo", "priority" (heap ordered by a scorer; when full the
+    # lowest-priority task is dropped) or "durable" (SQLite file at queue_path,
+    # nothing dropped: max_queue_size tasks stay in memory, the rest on disk).
+    # Scorers: "heuristic" (objective word overlap), "memory" (heuristic minus
+    # overlap with finished work), "llm" (batched PRIORITIZATION_PROMPT ranking;
+    # sync agents only)
+    queue_mode: str = "fifo"
+    queue_path: Optional[str] = None
+    queue_scorer: str = "heuristic"
+    queue_llm_anchors: int = 8  # queued tasks shown to the LLM as reference points
+
+    # Subtask backpressure: request fewer subtasks (or skip the call) as the queue
+    # fills or grows. Watermarks are fractions of max_queue_size; not applied to
+    # the unbounded "durable" queue. Savings are counted on agent.backpressure
+    enable_subtask_backpressure: bool = False
+    queue_low_watermark: float = 0.5
+    queue_high_watermark: float = 0.9
 
     # Policy mode
     policy_mode: PolicyMode = PolicyMode.NORMAL
@@ -52,6 +78,65 @@ class ECKConfig:
     memory_similarity_threshold: float = 0.6
     prefer_negative_memory: bool = True  # Bias toward failed outcomes
 
+    # Task ids are monotonic integers; also map each to a UUID4 string (e.g. for shared stores)
+    task_uuids: bool = False
+
+    # WorldModel storage: "memory" (in-process) or "sqlite" (persistent, shareable)
+    memory_backend: str = "memory"
+    memory_path: Optional[str] = None  # SQLite database file for "sqlite"
+
+    # Bounds for the in-memory WorldModel (None = unbounded); evicted records
+    # go to an optional cold_storage callback. Policies: "age", "lru"
+    # (by retrieval hit), "keep_failures" (FAILED and critic-rejected records are evicted last)
+    memory_max_entries: Optional[int] = None
+    memory_max_bytes: Optional[int] = None
+    memory_eviction_policy: str = "age"
+
+    # Append-only lifecycle event log (None = latest state in memory only)
+    event_log_dir: Optional[str] = None
+    event_log_segment_bytes: int = 64 * 1024 * 1024  # rotate segments at this size
+    event_log_fsync_batch: int = 64  # events per fsync
+
+    # Prediction-context cache on the WorldModel (keyed by query and memory version)
+    enable_context_cache: bool = False
+    context_cache_max_entries: int = 1024
+
+    # Checkpoints (ECKAgent.checkpoint()/restore()). With checkpoint_interval > 0 one
+    # is written to checkpoint_path every N cycles: a delta of what changed, and
+    # every checkpoint_full_interval-th checkpoint a full one
+    checkpoint_path: Optional[str] = None
+    checkpoint_interval: int = 0  # cycles between automatic checkpoints (0 = off)
+    checkpoint_full_interval: int = 10
+
+    # Similarity retrieval backend:
+    # "token" (exact, inverted index), "minhash" (LSH), "tfidf" (cosine, pure Python),
+    # "embedding" (NumPy + embed_fn), "ivf" (on-disk, memory-mapped; NumPy + embed_fn)
+    retrieval_backend: str = "token"
+    minhash_num_perm: int = 128
+    minhash_bands: int = 32  # more bands → higher recall, more candidates
+    embedding_initial_capacity: int = 1024  # preallocated rows (doubles when full)
+    tfidf_use_numpy: bool = False  # vectorised postings scoring (requires NumPy)
+    vector_index_path: Optional[str] = None  # append-only vector file for "ivf"
+    vector_index_read_only: bool = False  # workers sharing a file written elsewhere
+    ivf_partitions: int = 64
+    ivf_probe: int = 4  # partitions scored per query (more → higher recall)
+    retrieval_recall_sample_interval: int = 0  # measure recall every N queries (0 = off)
+
+    # Critic consensus (k-of-n voting; default 2-of-2 sequential)
+    critic_votes: int = 2
+    critic_votes_required: int = 2
+    critic_concurrent_votes: bool = False
+
+    # Fused evaluation: critic + goal check + subtasks in one call per task
+    # (step/step_async; step_batch() makes one fused call per judged task)
+    enable_fused_evaluation: bool = False
+
+    # LLM response cache (opt-in; critic and execution phases are never cached)
+    enable_llm_cache: bool = False
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl_seconds: Optional[float] = None
+    llm_cache_path: Optional[str] = None  # SQLite file for the persistent tier
+
     def effective_policy(self) -> Mapping[str, object]:
         """
         Resolve effective parameters based on current policy mode.
@@ -68,7 +153,8 @@ class ECKConfig:
         if self.policy_mode == PolicyMode.NORMAL:
             return MappingProxyType({})
 
-        if self.policy_mode == PolicyMode.GUIDED:
+        # ENFORCED is stricter than GUIDED and keeps its limits
+        if self.policy_mode in (PolicyMode.GUIDED, PolicyMode.ENFORCED):
             return MappingProxyType({
                 "max_subtasks": self._guided_max_subtasks,
                 "critic_strictness": self._guided_critic_strictness,
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+# (task_text, threshold, limit, prefer_failures)
+ContextKey = Tuple[str, float, int, bool]
+
+
+class ContextCache:
+    """
+    Cache of prediction-context strings for one WorldModel.
+
+    Each entry is keyed by (task_text, threshold, limit, prefer_failures) and
+    stamped with the memory version it was built at; a lookup at a newer
+    version is stale, so any memory change invalidates the entry.
+
+    With targeted=True (exact word-overlap retrieval in process) entries also
+    carry the query's token set and stay valid across memory versions: a
+    change to a task can only affect queries sharing a token with its old or
+    new text, so invalidate() drops exactly those entries. Queries with a
+    threshold <= 0 match every task and always use the version check.
+
+    Bounded LRU; hits, misses and invalidations are counted.
+    """
+
+    def __init__(self, max_entries: int = 1024, targeted: bool = False):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+        self.max_entries = max_entries
+        self.targeted = targeted
+        # key → (version, query tokens or None, context)
+        self._entries: "OrderedDict[ContextKey, Tuple[int, Optional[FrozenSet[str]], str]]" = OrderedDict()
+        self._by_token: Dict[str, Set[ContextKey]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key: ContextKey, version: int) -> Optional[str]:
+        """Cached context for key at this memory version, or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry_version, tokens, context = entry
+            if tokens is not None or entry_version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return context
+            self._discard(key)
+            self.stale += 1
+        self.misses += 1
+        return None
+
+    def put(self, key: ContextKey, version: int, context: str, tokens: FrozenSet[str]) -> None:
+        """Store a context built at version for a query with these tokens."""
+        self._discard(key)
+        if not (self.targeted and key[1] > 0):
+            tokens = None
+        self._entries[key] = (version, tokens, context)
+        if tokens is not None:
+            for token in tokens:
+                self._by_token.setdefault(token, set()).add(key)
+        if len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, tokens: Iterable[str]) -> None:
+        """Drop targeted entries whose query shares a token with a changed task."""
+        for token in tokens:
+            keys = self._by_token.get(token)
+            while keys:
+                self._discard(next(iter(keys)))
+                self.invalidations += 1
+
+    def _discard(self, key: ContextKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[1] is None:
+            return
+        for token in entry[1]:
+            keys = self._by_token[token]
+            keys.discard(key)
+            if not keys:
+                del self._by_token[token]
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+        self._by_token.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate (observability only)."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ContextCache({len(self)}/{self.max_entries} entries)"
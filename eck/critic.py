@@ -1,9 +1,136 @@
 import json
+import asyncio
 import logging
-from typing import Tuple, Callable, Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Awaitable, Dict, List, Sequence, Tuple, Callable, Optional
+
+from .prompts import format_prompt, CRITIC_EVALUATION_PROMPT
+from .config import ECKConfig
+from .utils import call_batch
 
 logger = logging.getLogger("eck-core")
 
+# Shared pool for concurrent votes (created on first use, reused across calls)
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _vote_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(thread_name_prefix="eck-critic")
+        return _pool
+
+
+@dataclass(frozen=True)
+class ConsensusStrategy:
+    """
+    k-of-n critic voting.
+
+    votes: maximum number of critic calls (n).
+    required: approvals needed for success (k); the default 2-of-2 is unanimity.
+    concurrent: issue votes in waves instead of one at a time.
+
+    Voting stops as soon as the outcome is decided: once k approvals are in,
+    or once more than n - k rejections make k approvals impossible.
+    A wave issues only as many votes as could still be needed for success
+    (the remaining quorum), so concurrent voting never costs more calls than
+    a fully successful tally; calls of a wave still running when rejections
+    decide the outcome are not interrupted (see critic_evaluate()).
+    """
+
+    votes: int = 2
+    required: int = 2
+    concurrent: bool = False
+
+    def __post_init__(self):
+        if not 1 <= self.required <= self.votes:
+            raise ValueError("ConsensusStrategy requires 1 <= required <= votes")
+
+    @classmethod
+    def from_config(cls, config: ECKConfig) -> "ConsensusStrategy":
+        """Build the strategy configured in ECKConfig."""
+        return cls(
+            votes=config.critic_votes,
+            required=config.critic_votes_required,
+            concurrent=config.critic_concurrent_votes,
+        )
+
+
+class _VoteTally:
+    """Mutable tally of critic votes and the optional verifier result."""
+
+    def __init__(self, strategy: ConsensusStrategy, has_verifier: bool):
+        self.strategy = strategy
+        self.votes: Dict[int, Tuple[bool, str]] = {}
+        self.issued = 0
+        self.verified: Optional[bool] = None
+        self.verifier_pending = has_verifier
+
+    @property
+    def approvals(self) -> int:
+        return sum(1 for success, _ in self.votes.values() if success)
+
+    @property
+    def rejections(self) -> int:
+        return len(self.votes) - self.approvals
+
+    def add_vote(self, index: int, response: str) -> None:
+        self.add_parsed_vote(index, *_parse_critic_response(response))
+
+    def add_parsed_vote(self, index: int, success: bool, feedback: str) -> None:
+        self.votes[index] = (success, feedback)
+
+    def add_verification(self, verified: bool) -> None:
+        self.verified = bool(verified)
+        self.verifier_pending = False
+
+    def decided(self) -> bool:
+        if self.verified is False:
+            return bool(self.votes)  # keep at least one critic's feedback
+        if self.rejections > self.strategy.votes - self.strategy.required:
+            return True
+        return self.approvals >= self.strategy.required and not self.verifier_pending
+
+    def wave(self) -> int:
+        """Number of additional votes to issue now."""
+        in_flight = self.issued - len(self.votes)
+        if not self.strategy.concurrent or self.verified is False:
+            return 0 if in_flight or self.issued >= self.strategy.votes else 1
+        needed = self.strategy.required - self.approvals - in_flight
+        return max(0, min(needed, self.strategy.votes - self.issued))
+
+    def result(self) -> Tuple[bool, str, float]:
+        final_success = (
+            self.approvals >= self.strategy.required and self.verified is not False
+        )
+
+        # Feedback of the first issued vote, then consensus flags of the rest
+        ordered = [self.votes[i] for i in sorted(self.votes)]
+        parts = [ordered[0][1]] if ordered else []
+        parts += [f"Consensus: {success}" for success, _ in ordered[1:]]
+
+        if len({success for success, _ in ordered}) > 1:
+            logger.warning("Critic disagreement detected - potential instability")
+
+        if self.verified is False:
+            parts.append("External verification failed")
+
+        error = 1.0 if not final_success else 0.0
+        return final_success, " | ".join(parts), error
+
+
+def _resolve_strategy(
+    consensus: Optional[ConsensusStrategy],
+    enable_cross_validation: bool,
+) -> ConsensusStrategy:
+    if consensus is not None:
+        return consensus
+    return ConsensusStrategy() if enable_cross_validation else ConsensusStrategy(1, 1)
+
 
 def critic_evaluate(
     task_text: str,
@@ -13,6 +140,7 @@ def critic_evaluate(
     llm_call: Callable[[str], str],
     enable_cross_validation: bool = True,
     verifier_callback: Optional[Callable[[str, str], bool]] = None,
+    consensus: Optional[ConsensusStrategy] = None,
 ) -> Tuple[bool, str, float]:
     """
     Evaluate task result using critic prompt with consensus and optional verification.
@@ -25,54 +153,187 @@ def critic_evaluate(
         llm_call: Callable that takes prompt and returns LLM response string.
         enable_cross_validation: If True, use dual critic calls for consensus (default True).
         verifier_callback: Optional callback for external verification (e.g. tool result check).
+        consensus: Optional k-of-n voting strategy; overrides enable_cross_validation.
+
+    Concurrent strategies run votes and the verifier on a shared thread pool.
+    Sequential strategies run the verifier first, then one vote at a time.
+    Either way no further calls are made once the outcome is decided; a
+    failed verification still waits for one vote, whose feedback is kept.
+    Concurrent calls not yet started are cancelled then, but calls already
+    running in the pool cannot be interrupted: they finish in the background
+    and their results are discarded.
 
     Returns:
         Tuple[bool, str, float]: (final_success, feedback, error_score)
         - error_score is float 0.0-1.0 (0.0 = perfect alignment, 1.0 = failure)
     """
-    prompt = f"""
-Evaluate the result against the task and objective.
-
-Task: {task_text}
-Prediction: {prediction}
-Result: {result}
-Objective: {objective}
+    strategy = _resolve_strategy(consensus, enable_cross_validation)
+    prompt = build_critic_prompt(task_text, prediction, result, objective)
+    tally = _VoteTally(strategy, verifier_callback is not None)
+    verify = None
+    if verifier_callback is not None:
+        verify = lambda: verifier_callback(task_text, result)
+    _collect_votes(tally, prompt, llm_call, verify)
+    return tally.result()
 
-Return ONLY valid JSON:
-{{
-  "success": true/false,
-  "feedback": "brief explanation"
-}}
 
-Respond with true if the result meaningfully advances the objective.
-"""
+def _collect_votes(
+    tally: _VoteTally,
+    prompt: str,
+    llm_call: Callable[[str], str],
+    verify: Optional[Callable[[], bool]] = None,
+) -> None:
+    """Issue votes (and run verify) until the tally is decided; votes already in the tally count."""
+    if not tally.strategy.concurrent:
+        if verify is not None:
+            tally.add_verification(verify())
+        while not tally.decided():
+            tally.issued += 1
+            tally.add_vote(tally.issued - 1, llm_call(prompt))
+        return
 
-    # First critic call
-    response1 = llm_call(prompt)
-    success1, feedback1 = _parse_critic_response(response1)
+    pool = _vote_pool()
+    pending = {}
+    try:
+        if verify is not None:
+            pending[pool.submit(verify)] = None
 
-    if not enable_cross_validation:
-        error = 1.0 if not success1 else 0.0
-        return success1, feedback1, error
+        while not tally.decided():
+            for _ in range(tally.wave()):
+                pending[pool.submit(llm_call, prompt)] = tally.issued
+                tally.issued += 1
 
-    # Second critic call for consensus
-    response2 = llm_call(prompt)
-    success2, feedback2 = _parse_critic_response(response2)
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if index is None:
+                    tally.add_verification(future.result())
+                else:
+                    tally.add_vote(index, future.result())
+    finally:
+        # Decided: drop calls not started yet; running ones finish unobserved
+        for future in pending:
+            future.cancel()
 
-    final_success = success1 and success2
-    final_feedback = f"{feedback1} | Consensus: {success2}"
 
-    if success1 != success2:
-        logger.warning("Critic disagreement detected - potential instability")
+async def critic_evaluate_async(
+    task_text: str,
+    prediction: str,
+    result: str,
+    objective: str,
+    llm_call: Callable[[str], Awaitable[str]],
+    enable_cross_validation: bool = True,
+    verifier_callback: Optional[Callable[[str, str], bool]] = None,
+    consensus: Optional[ConsensusStrategy] = None,
+) -> Tuple[bool, str, float]:
+    """
+    Async counterpart of critic_evaluate() for awaitable LLM callables.
 
-    # Optional external verification hook
+    Same prompt, same consensus rule, same pessimistic parsing.
+    Concurrent strategies run votes as tasks and the verifier in a worker
+    thread; undecided calls are cancelled once the outcome is decided.
+    """
+    strategy = _resolve_strategy(consensus, enable_cross_validation)
+    prompt = build_critic_prompt(task_text, prediction, result, objective)
+    tally = _VoteTally(strategy, verifier_callback is not None)
+    verify = None
     if verifier_callback is not None:
-        if not verifier_callback(task_text, result):
-            final_success = False
-            final_feedback += " | External verification failed"
+        verify = lambda: verifier_callback(task_text, result)
+    await _collect_votes_async(tally, prompt, llm_call, verify)
+    return tally.result()
+
+
+async def _collect_votes_async(
+    tally: _VoteTally,
+    prompt: str,
+    llm_call: Callable[[str], Awaitable[str]],
+    verify: Optional[Callable[[], bool]] = None,
+) -> None:
+    """Async counterpart of _collect_votes(); verify runs in a worker thread when concurrent."""
+    if not tally.strategy.concurrent:
+        if verify is not None:
+            tally.add_verification(verify())
+        while not tally.decided():
+            tally.issued += 1
+            tally.add_vote(tally.issued - 1, await llm_call(prompt))
+        return
+
+    pending = {}
+    try:
+        if verify is not None:
+            pending[asyncio.ensure_future(asyncio.to_thread(verify))] = None
+
+        while not tally.decided():
+            for _ in range(tally.wave()):
+                pending[asyncio.ensure_future(llm_call(prompt))] = tally.issued
+                tally.issued += 1
 
-    error = 1.0 if not final_success else 0.0
-    return final_success, final_feedback, error
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if index is None:
+                    tally.add_verification(future.result())
+                else:
+                    tally.add_vote(index, future.result())
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def critic_evaluate_batch(
+    items: Sequence[Tuple[str, str, str]],
+    objective: str,
+    llm_batch_call: Callable[[List[str]], List[str]],
+    enable_cross_validation: bool = True,
+    consensus: Optional[ConsensusStrategy] = None,
+) -> List[Tuple[bool, str, float]]:
+    """
+    Batched counterpart of critic_evaluate() for many (task_text, prediction, result) items.
+
+    Each round sends every vote still needed across all undecided items in
+    one provider call; decided items drop out, so short-circuiting still
+    saves calls. Returns one (final_success, feedback, error_score) per item.
+    """
+    strategy = _resolve_strategy(consensus, enable_cross_validation)
+    prompts = [
+        build_critic_prompt(task_text, prediction, result, objective)
+        for task_text, prediction, result in items
+    ]
+    tallies = [_VoteTally(strategy, has_verifier=False) for _ in items]
+
+    while True:
+        requests = []
+        for item, tally in enumerate(tallies):
+            if tally.decided():
+                continue
+            for _ in range(tally.wave()):
+                requests.append((item, tally.issued))
+                tally.issued += 1
+
+        if not requests:
+            break
+
+        responses = call_batch(llm_batch_call, [prompts[item] for item, _ in requests])
+        for (item, vote), response in zip(requests, responses):
+            tallies[item].add_vote(vote, response)
+
+    return [tally.result() for tally in tallies]
+
+
+def build_critic_prompt(
+    task_text: str,
+    prediction: str,
+    result: str,
+    objective: str,
+) -> str:
+    """Format the critic evaluation prompt."""
+    return format_prompt(
+        CRITIC_EVALUATION_PROMPT,
+        task_text=task_text,
+        prediction=prediction,
+        result=result,
+        objective=objective,
+    )
 
 
 def _parse_critic_response(response: str) -> Tuple[bool, str]:
@@ -83,4 +344,3 @@ def _parse_critic_response(response: str) -> Tuple[bool, str]:
     except (json.JSONDecodeError, TypeError):
         logger.warning("Critic JSON parse failed - defaulting to failure (pessimistic)")
         return False, "Parse failed - treated as non-success"
-
@@ -0,0 +1,129 @@
+import re
+import hashlib
+from collections import Counter
+from itertools import count
+from typing import Dict, Iterable, List, Set
+
+from .models import TaskId
+from .retrieval import TokenIndex, jaccard, tokenize
+from .task import TaskState
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+
+def normalize_task_text(text: str) -> str:
+    """Case-folded words without punctuation, single-spaced (the duplicate key)."""
+    return " ".join(_PUNCTUATION.sub(" ", text.casefold()).split())
+
+
+def _digest(normalized: str) -> bytes:
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+
+class TaskDeduplicator:
+    """
+    Enqueue-time duplicate filter for new tasks.
+
+    A task is rejected if its normalized text is identical to, or at least
+    `threshold` similar (word-overlap Jaccard) to, a task that is queued or
+    has already SUCCEEDED, or an earlier task of the same batch. Exact
+    duplicates are found through a set of hashes of normalized texts; near
+    duplicates through inverted token indexes, so a lookup only visits tasks
+    that share a word with it.
+
+    The owning queue reports queued tasks through add()/discard(); succeeded
+    tasks are added by the agent (and seeded from an existing WorldModel).
+    Failed tasks are not remembered, so they may be proposed again.
+    """
+
+    def __init__(self, threshold: float = 0.75):
+        self.threshold = threshold
+        self._queued_hashes: Counter = Counter()
+        self._queued_keys: Dict[TaskId, bytes] = {}
+        self._queued = TokenIndex()
+        self._succeeded_hashes: Set[bytes] = set()
+        self._succeeded = TokenIndex()
+        self._succeeded_ids = count()
+
+        self.rejected_exact = 0
+        self.rejected_near = 0
+        self.rejected_succeeded = 0
+
+    # -- membership ----------------------------------------------------------
+
+    def add(self, task) -> None:
+        """A task entered the queue."""
+        normalized = normalize_task_text(task["text"])
+        key = _digest(normalized)
+        self._queued_hashes[key] += 1
+        self._queued_keys[task["id"]] = key
+        self._queued.add(task["id"], normalized)
+
+    def discard(self, task) -> None:
+        """A task left the queue (popped, dropped or cleared)."""
+        key = self._queued_keys.pop(task["id"], None)
+        if key is None:
+            return
+        self._queued_hashes[key] -= 1
+        if not self._queued_hashes[key]:
+            del self._queued_hashes[key]
+        self._queued.remove(task["id"])
+
+    def clear_queued(self) -> None:
+        self._queued_hashes.clear()
+        self._queued_keys.clear()
+        self._queued = TokenIndex()
+
+    def add_succeeded(self, text: str) -> None:
+        """Remember a task text that reached SUCCEEDED."""
+        normalized = normalize_task_text(text)
+        key = _digest(normalized)
+        if key not in self._succeeded_hashes:
+            self._succeeded_hashes.add(key)
+            self._succeeded.add(next(self._succeeded_ids), normalized)
+
+    def seed(self, memory) -> None:
+        """Load the SUCCEEDED tasks already recorded in a WorldModel."""
+        for _, record in memory.iter_tasks(state=TaskState.SUCCEEDED):
+            self.add_succeeded(record["task"])
+
+    # -- filtering -----------------------------------------------------------
+
+    def _near(self, index: TokenIndex, normalized: str) -> bool:
+        return self.threshold > 0 and bool(index.search(normalized, self.threshold))
+
+    def filter(self, texts: Iterable[str]) -> List[str]:
+        """Texts that are not duplicates (in order); rejections are counted."""
+        accepted: List[str] = []
+        batch_hashes: Set[bytes] = set()
+        batch_tokens: List = []
+        for text in texts:
+            normalized = normalize_task_text(text)
+            key = _digest(normalized)
+            tokens = tokenize(normalized)
+
+            if key in self._succeeded_hashes or self._near(self._succeeded, normalized):
+                self.rejected_succeeded += 1
+            elif key in self._queued_hashes or key in batch_hashes:
+                self.rejected_exact += 1
+            elif self._near(self._queued, normalized) or (
+                self.threshold > 0
+                and any(jaccard(tokens, other) >= self.threshold for other in batch_tokens)
+            ):
+                self.rejected_near += 1
+            else:
+                accepted.append(text)
+                batch_hashes.add(key)
+                batch_tokens.append(tokens)
+        return accepted
+
+    def stats(self) -> Dict[str, int]:
+        """Rejection counters (observability only)."""
+        return {
+            "rejected_exact": self.rejected_exact,
+            "rejected_near": self.rejected_near,
+            "rejected_succeeded": self.rejected_succeeded,
+            "rejected": self.rejected_exact + self.rejected_near + self.rejected_succeeded,
+            "queued": len(self._queued_keys),
+            "succeeded": len(self._succeeded_hashes),
+        }
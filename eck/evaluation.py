@@ -0,0 +1,170 @@
+import json
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Tuple
+
+from .prompts import format_prompt, FUSED_EVALUATION_PROMPT
+from .critic import (
+    ConsensusStrategy,
+    build_critic_prompt,
+    _VoteTally,
+    _collect_votes,
+    _collect_votes_async,
+    _resolve_strategy,
+)
+from .task_generation import clean_subtask_list
+
+logger = logging.getLogger("eck-core")
+
+
+@dataclass(frozen=True)
+class FusedEvaluation:
+    """
+    Result of one fused evaluation: critic verdict, goal verdict and subtasks.
+
+    success/feedback/error have the same meaning as critic_evaluate()'s tuple.
+    subtasks are cleaned and capped but NOT policy-gated; callers gate them.
+    """
+    success: bool
+    feedback: str
+    error: float
+    goal_achieved: bool
+    subtasks: Tuple[str, ...]
+
+
+def build_fused_prompt(
+    task_text: str,
+    prediction: str,
+    result: str,
+    objective: str,
+    max_subtasks: int = 5,
+) -> str:
+    """Format the fused evaluation prompt."""
+    return format_prompt(
+        FUSED_EVALUATION_PROMPT,
+        task_text=task_text,
+        prediction=prediction,
+        result=result,
+        objective=objective,
+        max_subtasks=max_subtasks,
+    )
+
+
+def parse_fused_response(
+    response: str,
+    max_subtasks: int = 5,
+) -> Tuple[bool, str, bool, Tuple[str, ...]]:
+    """
+    Parse a fused evaluation JSON object. Pessimistic fallback on failure.
+
+    Returns (success, feedback, goal_achieved, subtasks).
+    - Unparseable or non-object output: not a success, goal not achieved, no subtasks
+      (same fallback as the critic parser and safe_parse_json_array).
+    - goal_achieved counts only a literal JSON true.
+    - A malformed subtasks field yields no subtasks without affecting the verdict.
+    """
+    try:
+        data = json.loads(response.strip())
+        if not isinstance(data, dict):
+            raise TypeError("Not an object")
+    except (json.JSONDecodeError, TypeError):
+        logger.warning("Fused evaluation JSON parse failed - defaulting to failure (pessimistic)")
+        return False, "Parse failed - treated as non-success", False, ()
+
+    success = bool(data.get("success", False))
+    feedback = str(data.get("feedback", "No feedback"))
+    goal_achieved = data.get("goal_achieved", False) is True
+
+    raw_subtasks = data.get("subtasks", [])
+    if not isinstance(raw_subtasks, list):
+        logger.warning("Fused evaluation subtasks not a list - no subtasks generated")
+        raw_subtasks = []
+    subtasks = clean_subtask_list([str(item) for item in raw_subtasks], max_subtasks)
+
+    return success, feedback, goal_achieved, tuple(subtasks)
+
+
+def fused_evaluate(
+    task_text: str,
+    prediction: str,
+    result: str,
+    objective: str,
+    llm_call: Callable[[str], str],
+    critic_llm_call: Optional[Callable[[str], str]] = None,
+    max_subtasks: int = 5,
+    consensus: Optional[ConsensusStrategy] = None,
+) -> FusedEvaluation:
+    """
+    Evaluate a result, check the goal and propose subtasks in one LLM call.
+
+    The fused response counts as the first critic vote. Any further votes the
+    consensus strategy still needs use the plain critic prompt (via
+    critic_llm_call, default llm_call) and stop once the outcome is decided,
+    so the default 2-of-2 costs one call on rejection and two on approval.
+    Concurrent strategies issue those votes in waves no larger than the
+    remaining quorum, as in critic_evaluate().
+    """
+    strategy = _resolve_strategy(consensus, enable_cross_validation=True)
+    critic_llm_call = critic_llm_call or llm_call
+
+    prompt = build_fused_prompt(task_text, prediction, result, objective, max_subtasks)
+    success, feedback, goal_achieved, subtasks = parse_fused_response(
+        llm_call(prompt), max_subtasks
+    )
+
+    tally = _VoteTally(strategy, has_verifier=False)
+    tally.issued = 1
+    tally.add_parsed_vote(0, success, feedback)
+
+    critic_prompt = build_critic_prompt(task_text, prediction, result, objective)
+    _collect_votes(tally, critic_prompt, critic_llm_call)
+
+    return _fused_result(tally, goal_achieved, subtasks)
+
+
+async def fused_evaluate_async(
+    task_text: str,
+    prediction: str,
+    result: str,
+    objective: str,
+    llm_call: Callable[[str], Awaitable[str]],
+    critic_llm_call: Optional[Callable[[str], Awaitable[str]]] = None,
+    max_subtasks: int = 5,
+    consensus: Optional[ConsensusStrategy] = None,
+) -> FusedEvaluation:
+    """
+    Async counterpart of fused_evaluate() for awaitable LLM callables.
+
+    Same prompt, same parsing, same consensus rule.
+    """
+    strategy = _resolve_strategy(consensus, enable_cross_validation=True)
+    critic_llm_call = critic_llm_call or llm_call
+
+    prompt = build_fused_prompt(task_text, prediction, result, objective, max_subtasks)
+    success, feedback, goal_achieved, subtasks = parse_fused_response(
+        await llm_call(prompt), max_subtasks
+    )
+
+    tally = _VoteTally(strategy, has_verifier=False)
+    tally.issued = 1
+    tally.add_parsed_vote(0, success, feedback)
+
+    critic_prompt = build_critic_prompt(task_text, prediction, result, objective)
+    await _collect_votes_async(tally, critic_prompt, critic_llm_call)
+
+    return _fused_result(tally, goal_achieved, subtasks)
+
+
+def _fused_result(
+    tally: _VoteTally,
+    goal_achieved: bool,
+    subtasks: Tuple[str, ...],
+) -> FusedEvaluation:
+    success, feedback, error = tally.result()
+    return FusedEvaluation(
+        success=success,
+        feedback=feedback,
+        error=error,
+        goal_achieved=goal_achieved,
+        subtasks=subtasks,
+    )
@@ -0,0 +1,289 @@
+import os
+import json
+import secrets
+import mmap
+import zlib
+import struct
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .task import TaskState
+from .models import TaskId
+
+logger = logging.getLogger("eck-core")
+
+
+_FRAME = struct.Struct("<II")  # payload length, CRC-32 of payload
+_FIXED = struct.Struct("<qbB")  # timestamp_ns, success (-1 = None), id kind
+_INT_ID = struct.Struct("<q")
+_STR_LEN = struct.Struct("<I")
+_NONE = 0xFFFFFFFF
+
+_ID_INT = 0
+_ID_STR = 1
+
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".log"
+_LOG_ID_FILE = "log-id"
+
+
+@dataclass(frozen=True)
+class LifecycleEvent:
+    """One WorldModel.record() call, as stored in the event log."""
+    task_id: TaskId
+    task: str
+    state: TaskState
+    prediction: Optional[str]
+    outcome: Optional[str]
+    success: Optional[bool]
+    feedback: Optional[str]
+    timestamp_ns: int
+    metadata: Optional[Dict[str, Any]] = None
+
+
+def _pack_str(parts: List[bytes], value: Optional[str]) -> None:
+    if value is None:
+        parts.append(_STR_LEN.pack(_NONE))
+        return
+    raw = value.encode("utf-8")
+    parts.append(_STR_LEN.pack(len(raw)))
+    parts.append(raw)
+
+
+def _unpack_str(buf, offset: int) -> Tuple[Optional[str], int]:
+    (length,) = _STR_LEN.unpack_from(buf, offset)
+    offset += _STR_LEN.size
+    if length == _NONE:
+        return None, offset
+    return bytes(buf[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def encode_event(event: LifecycleEvent) -> bytes:
+    """Serialize an event as one length-prefixed, checksummed frame."""
+    success = -1 if event.success is None else int(bool(event.success))
+    is_int = isinstance(event.task_id, int)
+    parts = [_FIXED.pack(event.timestamp_ns, success, _ID_INT if is_int else _ID_STR)]
+    if is_int:
+        parts.append(_INT_ID.pack(event.task_id))
+    else:
+        _pack_str(parts, event.task_id)
+
+    _pack_str(parts, event.state.value)
+    _pack_str(parts, event.task)
+    _pack_str(parts, event.prediction)
+    _pack_str(parts, event.outcome)
+    _pack_str(parts, event.feedback)
+    try:
+        metadata = None if event.metadata is None else json.dumps(event.metadata)
+    except TypeError as e:
+        raise TypeError("metadata must be JSON-serializable when an event log is used") from e
+    _pack_str(parts, metadata)
+
+    payload = b"".join(parts)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_event(buf, offset: int = 0) -> LifecycleEvent:
+    """Deserialize the payload of one frame starting at offset."""
+    timestamp_ns, success, id_kind = _FIXED.unpack_from(buf, offset)
+    offset += _FIXED.size
+    if id_kind == _ID_INT:
+        (task_id,) = _INT_ID.unpack_from(buf, offset)
+        offset += _INT_ID.size
+    else:
+        task_id, offset = _unpack_str(buf, offset)
+
+    state, offset = _unpack_str(buf, offset)
+    task, offset = _unpack_str(buf, offset)
+    prediction, offset = _unpack_str(buf, offset)
+    outcome, offset = _unpack_str(buf, offset)
+    feedback, offset = _unpack_str(buf, offset)
+    metadata, offset = _unpack_str(buf, offset)
+
+    return LifecycleEvent(
+        task_id=task_id,
+        task=task,
+        state=TaskState(state),
+        prediction=prediction,
+        outcome=outcome,
+        success=None if success < 0 else bool(success),
+        feedback=feedback,
+        timestamp_ns=timestamp_ns,
+        metadata=None if metadata is None else json.loads(metadata),
+    )
+
+
+def _scan_frames(buf, size: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield (frame_offset, payload_offset, payload_length) for every intact frame.
+
+    Stops at the first truncated or corrupt frame (a torn write at the tail).
+    """
+    offset = 0
+    while offset + _FRAME.size <= size:
+        length, crc = _FRAME.unpack_from(buf, offset)
+        start = offset + _FRAME.size
+        if start + length > size or zlib.crc32(buf[start:start + length]) != crc:
+            return
+        yield offset, start, length
+        offset = start + length
+
+
+class EventLog:
+    """
+    Append-only log of task lifecycle events in rotating segment files.
+
+    Each event is a length-prefixed frame with a CRC-32, appended to the
+    newest segment (`segment-<n>.log`); a segment is closed and a new one
+    started once it reaches segment_max_bytes. Appends are buffered and
+    fsynced in batches of fsync_batch events (and on sync()/close()), so a
+    crash loses at most the unsynced batch. A torn frame at the tail is
+    ignored by readers and truncated when the log is reopened for writing.
+
+    Readers memory-map whole segments and decode frames in place.
+
+    log_id is a random token created with the log directory (`log-id`) and
+    kept for its lifetime, so anything keyed by it survives restarts.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        fsync_batch: int = 64,
+    ):
+        if segment_max_bytes < 1 or fsync_batch < 1:
+            raise ValueError("segment_max_bytes and fsync_batch must be >= 1")
+
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_batch = fsync_batch
+        os.makedirs(directory, exist_ok=True)
+        self.log_id = self._load_log_id()
+
+        self.events_written = 0
+        self.fsyncs = 0
+        self._pending = 0
+        self._file = None
+        self._size = 0
+
+        segments = self.segments()
+        if segments:
+            self._open_segment(self._segment_number(segments[-1]), recover=True)
+        else:
+            self._open_segment(1)
+
+    def _load_log_id(self) -> str:
+        """Read the directory's log id, creating it on first use."""
+        path = os.path.join(self.directory, _LOG_ID_FILE)
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(secrets.token_hex(8))
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.link(tmp, path)  # atomic; a concurrent creator's id wins
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp)
+        with open(path) as f:
+            return f.read().strip()
+
+    @staticmethod
+    def _segment_number(path: str) -> int:
+        name = os.path.basename(path)
+        return int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{_SEGMENT_PREFIX}{number:012d}{_SEGMENT_SUFFIX}")
+
+    def segments(self) -> List[str]:
+        """Segment file paths, oldest first."""
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _open_segment(self, number: int, recover: bool = False) -> None:
+        path = self._segment_path(number)
+        if recover and os.path.exists(path):
+            valid = self._valid_length(path)
+            if valid < os.path.getsize(path):
+                logger.warning(f"Truncating torn tail of {path} at byte {valid}")
+                with open(path, "r+b") as f:
+                    f.truncate(valid)
+        self._number = number
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    @staticmethod
+    def _valid_length(path: str) -> int:
+        size = os.path.getsize(path)
+        if size == 0:
+            return 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            end = 0
+            for _, start, length in _scan_frames(buf, size):
+                end = start + length
+            return end
+
+    def append(self, event: LifecycleEvent) -> None:
+        """Append one event (durable after the next batched fsync)."""
+        frame = encode_event(event)
+        if self._size and self._size + len(frame) > self.segment_max_bytes:
+            self._rotate()
+        self._file.write(frame)
+        self._size += len(frame)
+        self.events_written += 1
+        self._pending += 1
+        if self._pending >= self.fsync_batch:
+            self.sync()
+
+    def _rotate(self) -> None:
+        self.sync()
+        self._file.close()
+        self._open_segment(self._number + 1)
+
+    def sync(self) -> None:
+        """Flush buffered events and fsync the active segment."""
+        if self._file is None:
+            return
+        self._file.flush()
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+            self._pending = 0
+
+    def flush(self) -> None:
+        """Make buffered events visible to readers (without fsync)."""
+        if self._file is not None:
+            self._file.flush()
+
+    def replay(self) -> Iterator[LifecycleEvent]:
+        """Yield every event in append order (memory-mapped segment scans)."""
+        self.flush()
+        for path in self.segments():
+            size = os.path.getsize(path)
+            if size == 0:
+                continue
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for _, start, _ in _scan_frames(buf, size):
+                    yield decode_event(buf, start)
+
+    def history(self, task_id: TaskId) -> List[LifecycleEvent]:
+        """All events for one task, oldest first (full scan of the log)."""
+        return [event for event in self.replay() if event.task_id == task_id]
+
+    def close(self) -> None:
+        """Sync and close the active segment."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def __repr__(self) -> str:
+        return f"EventLog({self.directory!r}, {len(self.segments())} segments)"
@@ -0,0 +1,102 @@
+import sys
+from collections import OrderedDict
+from typing import Optional
+
+from .models import TaskId, TaskRecord
+from .task import TaskState
+
+
+# Outcomes KeepFailuresEviction keeps longest (and evicted_failures counts)
+FAILURE_STATES = frozenset({TaskState.FAILED, TaskState.REJECTED_BY_CRITIC})
+
+
+def record_bytes(record: TaskRecord) -> int:
+    """Approximate heap footprint of a record (shallow sizes of its fields)."""
+    size = sys.getsizeof(record) + sys.getsizeof(record.timestamp_ns)
+    for value in (record.task, record.prediction, record.outcome, record.feedback):
+        if value is not None:
+            size += sys.getsizeof(value)
+    if record.metadata is not None:
+        size += sys.getsizeof(record.metadata)
+    return size
+
+
+def _first(order: "OrderedDict[TaskId, None]", exclude: TaskId) -> Optional[TaskId]:
+    """Oldest key other than exclude (O(1): exclude can only shadow one key)."""
+    for task_id in order:
+        if task_id != exclude:
+            return task_id
+    return None
+
+
+class AgeEviction:
+    """Evict the task whose latest record is oldest."""
+
+    def __init__(self):
+        self._order: "OrderedDict[TaskId, None]" = OrderedDict()
+
+    def recorded(self, task_id: TaskId, record: TaskRecord) -> None:
+        self._order[task_id] = None
+        self._order.move_to_end(task_id)
+
+    def hit(self, task_id: TaskId) -> None:
+        pass
+
+    def remove(self, task_id: TaskId) -> None:
+        self._order.pop(task_id, None)
+
+    def victim(self, exclude: TaskId) -> Optional[TaskId]:
+        return _first(self._order, exclude)
+
+
+class LRUEviction(AgeEviction):
+    """Evict the task least recently recorded or returned by retrieval."""
+
+    def hit(self, task_id: TaskId) -> None:
+        if task_id in self._order:
+            self._order.move_to_end(task_id)
+
+
+class KeepFailuresEviction:
+    """
+    Age-ordered eviction that evicts other records before failures.
+
+    Mirrors prefer_negative_memory: failed outcomes are the most useful
+    context, so FAILED and REJECTED_BY_CRITIC records are kept until no
+    other record is left to evict. Decided by state, since in-progress records (CREATED, PREDICTED)
+    also have success=False.
+    """
+
+    def __init__(self):
+        self._others: "OrderedDict[TaskId, None]" = OrderedDict()
+        self._failures: "OrderedDict[TaskId, None]" = OrderedDict()
+
+    def recorded(self, task_id: TaskId, record: TaskRecord) -> None:
+        self.remove(task_id)
+        (self._failures if record.state in FAILURE_STATES else self._others)[task_id] = None
+
+    def hit(self, task_id: TaskId) -> None:
+        pass
+
+    def remove(self, task_id: TaskId) -> None:
+        self._others.pop(task_id, None)
+        self._failures.pop(task_id, None)
+
+    def victim(self, exclude: TaskId) -> Optional[TaskId]:
+        victim = _first(self._others, exclude)
+        return victim if victim is not None else _first(self._failures, exclude)
+
+
+EVICTION_POLICIES = {
+    "age": AgeEviction,
+    "lru": LRUEviction,
+    "keep_failures": KeepFailuresEviction,
+}
+
+
+def make_eviction_policy(name: str):
+    """Build the eviction policy named by config.memory_eviction_policy."""
+    try:
+        return EVICTION_POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown eviction policy: {name}") from None
@@ -1,8 +1,10 @@
-from typing import Callable
+from typing import Awaitable, Callable, List, Optional, Sequence
 import re
 import ast
 import operator
 
+from .utils import call_batch
+
 _ALLOWED_OPERATORS = {
     ast.Add: operator.add,
     ast.Sub: operator.sub,
@@ -34,6 +36,28 @@ def _safe_eval(expr: str) -> float:
     except Exception as e:
         raise ValueError(f"Safe evaluation failed: {e}")
 
+def _tool_outcome(task_text: str) -> Optional[str]:
+    """Return the dummy calculator outcome, or None if the task is not a tool call."""
+    # Dummy tool: explicit calculator
+    match = re.search(r'^CALC:\s*(.+)$', task_text.strip(), re.IGNORECASE)
+    if not match:
+        return None
+
+    expr = match.group(1)
+    try:
+        result = _safe_eval(expr)
+        outcome = f"Calculation result: {result}"
+        # Normalize tool output too (symmetry with other modules)
+        return ' '.join(outcome.split())
+    except Exception as e:
+        return f"Calculation failed (invalid expression)"
+
+
+def _normalize_outcome(outcome: str) -> str:
+    """Normalize internal whitespace (symmetry with prediction/task gen)."""
+    return ' '.join(outcome.strip().split())
+
+
 def execute_task(
     task_text: str,
     llm_call: Callable[[str], str],
@@ -46,22 +70,49 @@ def execute_task(
     Supports optional dummy calculator tool for seam validation.
     """
     if use_tools:
-        # Dummy tool: explicit calculator
-        match = re.search(r'^CALC:\s*(.+)$', task_text.strip(), re.IGNORECASE)
-        if match:
-            expr = match.group(1)
-            try:
-                result = _safe_eval(expr)
-                outcome = f"Calculation result: {result}"
-                # Normalize tool output too (symmetry with other modules)
-                outcome = ' '.join(outcome.split())
-            except Exception as e:
-                outcome = f"Calculation failed (invalid expression)"
-        else:
-            outcome = llm_call(task_text).strip()
-    else:
-        outcome = llm_call(task_text).strip()
-
-    # Normalize internal whitespace (symmetry with prediction/task gen)
-    return ' '.join(outcome.split())
+        outcome = _tool_outcome(task_text)
+        if outcome is not None:
+            return _normalize_outcome(outcome)
+
+    return _normalize_outcome(llm_call(task_text))
+
+
+async def execute_task_async(
+    task_text: str,
+    llm_call: Callable[[str], Awaitable[str]],
+    use_tools: bool = False,
+) -> str:
+    """
+    Async counterpart of execute_task() for awaitable LLM callables.
+
+    Same seam, same tool handling, same normalization.
+    """
+    if use_tools:
+        outcome = _tool_outcome(task_text)
+        if outcome is not None:
+            return _normalize_outcome(outcome)
+
+    return _normalize_outcome(await llm_call(task_text))
+
+
+def execute_tasks_batch(
+    task_texts: Sequence[str],
+    llm_batch_call: Callable[[List[str]], List[str]],
+    use_tools: bool = False,
+) -> List[str]:
+    """
+    Batched counterpart of execute_task(): one provider call for all LLM-executed tasks.
+
+    Tool tasks are resolved locally and never sent to the backend.
+    Outcomes are returned in the same order as task_texts.
+    """
+    outcomes: List[Optional[str]] = [
+        _tool_outcome(task_text) if use_tools else None
+        for task_text in task_texts
+    ]
+    pending = [i for i, outcome in enumerate(outcomes) if outcome is None]
+    responses = call_batch(llm_batch_call, [task_texts[i] for i in pending])
+    for i, response in zip(pending, responses):
+        outcomes[i] = response
 
+    return [_normalize_outcome(outcome) for outcome in outcomes]
@@ -0,0 +1,239 @@
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .phase import Phase
+from .config import ECKConfig
+from .utils import call_batch
+
+logger = logging.getLogger("eck-core")
+
+
+# Critic votes (incl. fused evaluation) are meant to be independent samples;
+# execution is the effects seam.
+DEFAULT_UNCACHED_PHASES: FrozenSet[Phase] = frozenset(
+    {Phase.CRITIC, Phase.FUSED_EVALUATION, Phase.EXECUTION}
+)
+
+
+class LLMCache:
+    """
+    Opt-in response cache for the llm_call seam.
+
+    Entries are keyed by phase and a SHA-256 hash of the prompt.
+    The in-memory tier is a bounded LRU; an optional SQLite file adds a
+    persistent tier that can be shared across runs. Both tiers honour the TTL.
+
+    Phases in uncached_phases always pass through to the underlying callable.
+    The cache never interprets responses — it only replays them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        path: Optional[str] = None,
+        uncached_phases: FrozenSet[Phase] = DEFAULT_UNCACHED_PHASES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            max_entries: Maximum entries held in memory (LRU eviction beyond this).
+            ttl_seconds: Entry lifetime; None means entries never expire.
+            path: Optional SQLite file for the persistent tier.
+            uncached_phases: Phases that bypass the cache entirely.
+            clock: Wall-clock source (seconds); injectable for tests.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.uncached_phases = frozenset(uncached_phases)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, phase TEXT NOT NULL,"
+                " response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_config(cls, config: ECKConfig) -> "LLMCache":
+        """Build a cache from the llm_cache_* fields of ECKConfig."""
+        return cls(
+            max_entries=config.llm_cache_max_entries,
+            ttl_seconds=config.llm_cache_ttl_seconds,
+            path=config.llm_cache_path,
+        )
+
+    @staticmethod
+    def make_key(phase: Phase, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"{phase.value}:{digest}"
+
+    def is_cacheable(self, phase: Phase) -> bool:
+        return phase not in self.uncached_phases
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_seconds is not None and self._clock() - created > self.ttl_seconds
+
+    def _remember(self, key: str, response: str, created: float) -> None:
+        self._entries[key] = (response, created)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, phase: Phase, prompt: str) -> Optional[str]:
+        """Return a cached response, or None on miss (counters updated)."""
+        key = self.make_key(phase, prompt)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                if not self._expired(cached[1]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return cached[0]
+                del self._entries[key]
+                self.expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, created FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1]):
+                        self._remember(key, row[0], row[1])
+                        self.disk_hits += 1
+                        return row[0]
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.expirations += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, phase: Phase, prompt: str, response: str) -> None:
+        """Store a response in both tiers."""
+        key = self.make_key(phase, prompt)
+        created = self._clock()
+        with self._lock:
+            self._remember(key, response, created)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, phase, response, created)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, phase.value, response, created),
+                )
+                self._db.commit()
+
+    def wrap(self, llm_call: Callable[[str], str], phase: Phase) -> Callable[[str], str]:
+        """Return a phase-bound llm_call that consults the cache first."""
+        if not self.is_cacheable(phase):
+            def passthrough(prompt: str) -> str:
+                self.bypassed += 1
+                return llm_call(prompt)
+            return passthrough
+
+        def cached_call(prompt: str) -> str:
+            response = self.get(phase, prompt)
+            if response is None:
+                response = llm_call(prompt)
+                self.put(phase, prompt, response)
+            return response
+
+        return cached_call
+
+    def wrap_async(
+        self,
+        llm_call: Callable[[str], Awaitable[str]],
+        phase: Phase,
+    ) -> Callable[[str], Awaitable[str]]:
+        """Awaitable counterpart of wrap()."""
+        if not self.is_cacheable(phase):
+            async def passthrough(prompt: str) -> str:
+                self.bypassed += 1
+                return await llm_call(prompt)
+            return passthrough
+
+        async def cached_call(prompt: str) -> str:
+            response = self.get(phase, prompt)
+            if response is None:
+                response = await llm_call(prompt)
+                self.put(phase, prompt, response)
+            return response
+
+        return cached_call
+
+    def wrap_batch(
+        self,
+        llm_batch_call: Callable[[List[str]], List[str]],
+        phase: Phase,
+    ) -> Callable[[List[str]], List[str]]:
+        """Batched counterpart of wrap(): only cache misses reach the backend."""
+        if not self.is_cacheable(phase):
+            def passthrough(prompts: List[str]) -> List[str]:
+                self.bypassed += len(prompts)
+                return call_batch(llm_batch_call, prompts)
+            return passthrough
+
+        def cached_batch(prompts: List[str]) -> List[str]:
+            responses = [self.get(phase, prompt) for prompt in prompts]
+            missing = [i for i, response in enumerate(responses) if response is None]
+            fresh = call_batch(llm_batch_call, [prompts[i] for i in missing])
+            for i, response in zip(missing, fresh):
+                responses[i] = response
+                self.put(phase, prompts[i], response)
+            return responses
+
+        return cached_batch
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters (observability only)."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the persistent tier, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"LLMCache({len(self)}/{self.max_entries} entries, hits={self.hits + self.disk_hits}, misses={self.misses})"
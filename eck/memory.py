@@ -1,8 +1,18 @@
+import heapq
+import secrets
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Optional, Any, List
+from itertools import islice, takewhile
+from typing import Callable, Dict, Iterable, Iterator, Optional, Any, List, Tuple, Union
 
 from .task import TaskState
+from .sqlite_memory import SQLiteWorldModel
+from .event_log import EventLog, LifecycleEvent
+from .models import RecordView, TaskId, TaskRecord, TasksView, datetime_to_ns, now_ns
 from .utils import score_memory_entry
+from .retrieval import EmbedFn, exact_search, make_index, tokenize
+from .context_cache import ContextCache
+from .eviction import FAILURE_STATES, make_eviction_policy, record_bytes
 from .config import PolicyMode, ECKConfig
 
 
@@ -10,16 +20,105 @@ class WorldModel:
     """
     Minimal in-memory store for task history — no vector DB required yet.
 
-    Maps task_id to a dict of task details (text, prediction, outcome, etc.).
+    Maps task_id to a TaskRecord (text, prediction, outcome, etc.); records
+    are compact __slots__ objects that still support dict-style reads.
     Note: Records latest state only (overwrites previous entry for the same task_id).
+    With config.event_log_dir set, every record() call is also appended to an
+    on-disk event log; the model is rebuilt from the log on construction and
+    history() returns a task's full lifecycle.
     """
 
-    def __init__(self):
-        self.tasks: Dict[str, Dict[str, Any]] = {}
+    def __init__(
+        self,
+        config: ECKConfig = None,
+        embed_fn: Optional[EmbedFn] = None,
+        cold_storage: Optional[Callable[[TaskId, Dict[str, Any]], None]] = None,
+    ):
+        self.config = config or ECKConfig()
+        self.tasks: Dict[TaskId, TaskRecord] = {}
+
+        # Optional bounds (memory_max_entries / memory_max_bytes) with eviction
+        self._bounded = (
+            self.config.memory_max_entries is not None
+            or self.config.memory_max_bytes is not None
+        )
+        self.eviction = make_eviction_policy(self.config.memory_eviction_policy) if self._bounded else None
+        self.cold_storage = cold_storage
+        self.bytes_used: int = 0
+        self.evicted: int = 0
+        self.evicted_failures: int = 0
+        self.evicted_bytes: int = 0
+
+        # Tasks changed / removed since the last take_changes() (delta checkpoints);
+        # None until track_changes() is called
+        self._changed: Optional[Dict[TaskId, None]] = None
+        self._removed: Optional[set] = None
+
+        # Similarity index over task text, maintained incrementally by record()
+        self.index = make_index(self.config, embed_fn=embed_fn)
+
+        # A shared on-disk index holds other processes' tasks too, so integer
+        # ids are indexed under "<index_owner>:<id>" (string ids as-is). The
+        # owner is the event log's id when there is one (or is restored from a
+        # checkpoint), so a restarted writer and readers of its log resolve
+        # the same keys.
+        self.index_owner: Optional[str] = None
+        self._index_keys: Optional[Dict[TaskId, str]] = None
+        self._index_ids: Dict[str, TaskId] = {}
+        if getattr(self.index, "shared", False):
+            self._index_keys = {}
+            self.index_owner = secrets.token_hex(8)
+
+        # Similarity-ranked indexes select the top `limit` matches themselves
+        # (not for a shared index: other processes' keys would fill the top)
+        self._limit_search = getattr(self.index, "ranked", False) and self._index_keys is None
+
+        # Index adds made inside batch() are embedded together on flush (add_many)
+        self._batch_depth = 0
+        self._pending_index: Dict[TaskId, str] = {}
+
+        # Monotonic change counter (every record, eviction or discard)
+        self.version: int = 0
+
+        # Optional prediction-context cache; exact word-overlap retrieval
+        # allows invalidating only the queries a change can affect
+        self.context_cache: Optional[ContextCache] = None
+        if self.config.enable_context_cache:
+            self.context_cache = ContextCache(
+                self.config.context_cache_max_entries,
+                targeted=self.config.retrieval_backend == "token",
+            )
+        self._next_seq: int = 0
+
+        # Largest integer task id ever recorded (evicted tasks included)
+        self._max_int_id: Optional[int] = None
+
+        # Sampled recall of the retrieval backend vs. the exact scan (observability only)
+        self._queries: int = 0
+        self.recall_samples: int = 0
+        self.recall_total: float = 0.0
+
+        # Optional append-only lifecycle log; this model is its latest-state view
+        self.event_log: Optional[EventLog] = None
+        if self.config.event_log_dir is not None:
+            self.event_log = EventLog(
+                self.config.event_log_dir,
+                segment_max_bytes=self.config.event_log_segment_bytes,
+                fsync_batch=self.config.event_log_fsync_batch,
+            )
+            if self.index_owner is not None:
+                self.index_owner = self.event_log.log_id
+            with self.batch():
+                for event in self.event_log.replay():
+                    self._apply(
+                        event.task_id, event.task, event.state, event.prediction, event.outcome,
+                        event.success, event.feedback, event.timestamp_ns, event.metadata,
+                        replaying=True,
+                    )
 
     def record(
         self,
-        task_id: str,
+        task_id: TaskId,
         task_text: str,
         prediction: str,
         outcome: str,
@@ -35,40 +134,331 @@ class WorldModel:
         Optional metadata may be supplied for provenance or annotations.
         Optional state records the task's lifecycle position.
         """
-        entry = {
-            "task": task_text,
-            "state": state.value,  # "created", "predicted", etc.
-            "prediction": prediction,
-            "outcome": outcome,
-            "success": success,
-            "feedback": feedback,
-            "timestamp": datetime.utcnow(),  # Store datetime object (serialize at boundaries)
-        }
-
         if metadata is not None:
             if not isinstance(metadata, dict):
                 raise TypeError("metadata must be a dict if provided")
-            entry["metadata"] = dict(metadata)  # shallow copy
+            metadata = dict(metadata)  # shallow copy
+
+        timestamp_ns = now_ns()
+        if self.event_log is not None:
+            self.event_log.append(LifecycleEvent(
+                task_id, task_text, state, prediction, outcome, success,
+                feedback, timestamp_ns, metadata,
+            ))
+        self._apply(task_id, task_text, state, prediction, outcome, success, feedback, timestamp_ns, metadata)
+
+    def _apply(
+        self,
+        task_id: TaskId,
+        task_text: str,
+        state: TaskState,
+        prediction: str,
+        outcome: str,
+        success: bool,
+        feedback: str,
+        timestamp_ns: int,
+        metadata: Optional[Dict[str, Any]],
+        replaying: bool = False,
+    ) -> None:
+        """Update the latest-state table and the similarity index."""
+        self.version += 1
+        if isinstance(task_id, int) and (self._max_int_id is None or task_id > self._max_int_id):
+            self._max_int_id = task_id
+        record = self.tasks.get(task_id)
+        if self.context_cache is not None:
+            self.context_cache.invalidate(tokenize(task_text))
+            if record is not None and record.task != task_text:
+                self.context_cache.invalidate(tokenize(record.task))
+        if record is None:
+            record = self.tasks[task_id] = TaskRecord(
+                task_text, state, prediction, outcome, success, feedback,
+                timestamp_ns, metadata, seq=self._next_seq,
+            )
+            self._next_seq += 1
+            self._index_add(task_id, task_text)
+        else:
+            if self._bounded:
+                self.bytes_used -= record_bytes(record)
+            if record.task != task_text:
+                self._index_add(task_id, task_text)
+            # Lifecycle updates overwrite the record in place
+            record.update(task_text, state, prediction, outcome, success, feedback, timestamp_ns, metadata)
+            # Keep the table in last-recorded order (the recency index)
+            del self.tasks[task_id]
+            self.tasks[task_id] = record
+
+        if self._changed is not None:
+            self._changed.pop(task_id, None)  # keep last-recorded order
+            self._changed[task_id] = None
+            self._removed.discard(task_id)
+
+        if self._bounded:
+            self.bytes_used += record_bytes(record)
+            self.eviction.recorded(task_id, record)
+            self._enforce_bounds(keep=task_id, cold=not replaying)
+
+    def _over_bounds(self) -> bool:
+        max_entries = self.config.memory_max_entries
+        max_bytes = self.config.memory_max_bytes
+        return (
+            (max_entries is not None and len(self.tasks) > max_entries)
+            or (max_bytes is not None and self.bytes_used > max_bytes)
+        )
+
+    def _enforce_bounds(self, keep: TaskId, cold: bool = True) -> None:
+        """Evict until within bounds; the record just written is never evicted."""
+        while self._over_bounds():
+            task_id = self.eviction.victim(exclude=keep)
+            if task_id is None:
+                break
+            self._evict(task_id, cold)
 
-        self.tasks[task_id] = entry
+    def _drop(self, task_id: TaskId) -> TaskRecord:
+        """Remove a task from the table, the index and the bounds accounting."""
+        record = self.tasks.pop(task_id)
+        key = self._index_key(task_id)
+        self._pending_index.pop(key, None)
+        self.index.remove(key)
+        if self._index_keys is not None:
+            self._index_ids.pop(self._index_keys.pop(task_id), None)
+        self.version += 1
+        if self.context_cache is not None:
+            self.context_cache.invalidate(tokenize(record.task))
+        if self._bounded:
+            self.eviction.remove(task_id)
+            self.bytes_used -= record_bytes(record)
+        if self._changed is not None:
+            self._changed.pop(task_id, None)
+            self._removed.add(task_id)
+        return record
+
+    def _evict(self, task_id: TaskId, cold: bool) -> None:
+        record = self._drop(task_id)
+
+        size = record_bytes(record)
+        self.evicted += 1
+        self.evicted_bytes += size
+        if record.state in FAILURE_STATES:
+            self.evicted_failures += 1
+
+        if cold and self.cold_storage is not None:
+            self.cold_storage(task_id, record.to_dict())
+
+    def eviction_stats(self) -> Dict[str, int]:
+        """Eviction counters and current footprint (observability only)."""
+        return {
+            "entries": len(self.tasks),
+            "bytes": self.bytes_used,
+            "evicted": self.evicted,
+            "evicted_failures": self.evicted_failures,
+            "evicted_bytes": self.evicted_bytes,
+        }
+
+    def track_changes(self) -> None:
+        """Start (or restart) tracking changed and removed tasks for take_changes()."""
+        self._changed = {}
+        self._removed = set()
+
+    def take_changes(self) -> Tuple[List[TaskId], List[TaskId]]:
+        """
+        (changed, removed) task ids since tracking started or the last call.
+
+        Changed ids are in last-recorded order; tracking restarts empty.
+        Used for delta checkpoints (see eck.checkpoint).
+        """
+        if self._changed is None:
+            raise ValueError("take_changes() requires track_changes() first")
+        changed, removed = list(self._changed), list(self._removed)
+        self.track_changes()
+        return changed, removed
+
+    def load(self, event: LifecycleEvent, seq: int) -> None:
+        """
+        Apply a checkpointed record as-is (checkpoint restore).
+
+        Keeps the saved timestamp and first-record order; nothing is appended
+        to the event log and bounds evictions skip cold storage.
+        """
+        self._apply(
+            event.task_id, event.task, event.state, event.prediction, event.outcome,
+            event.success, event.feedback, event.timestamp_ns, event.metadata,
+            replaying=True,
+        )
+        record = self.tasks.get(event.task_id)
+        if record is not None:
+            record.seq = seq
+        self._next_seq = max(self._next_seq, seq + 1)
+
+    def discard(self, task_id: TaskId) -> None:
+        """Remove a task without counting an eviction (checkpoint restore)."""
+        if task_id in self.tasks:
+            self._drop(task_id)
+
+    def _index_key(self, task_id: TaskId) -> TaskId:
+        """Key a task is indexed under (the task id unless the index is shared)."""
+        if self._index_keys is None:
+            return task_id
+        key = self._index_keys.get(task_id)
+        if key is None:
+            key = f"{self.index_owner}:{task_id}" if isinstance(task_id, int) else task_id
+            self._index_keys[task_id] = key
+            self._index_ids[key] = task_id
+        return key
+
+    def _index_add(self, task_id: TaskId, task_text: str) -> None:
+        key = self._index_key(task_id)
+        if self._index_keys is not None and self.index.holds(key, task_text):
+            # Already in the shared file (replay after a restart, or a reader
+            # of the writer's log): appending again would only add a dead row
+            self._pending_index.pop(key, None)
+            return
+        if not self._batch_depth:
+            self.index.add(key, task_text)
+            return
+        self._pending_index.pop(key, None)  # keep the latest text, in order
+        self._pending_index[key] = task_text
+
+    def _flush_index(self) -> None:
+        """Index the adds buffered by batch() (one embed_fn call where supported)."""
+        if not self._pending_index:
+            return
+        items = list(self._pending_index.items())
+        self._pending_index.clear()
+        add_many = getattr(self.index, "add_many", None)
+        if add_many is not None:
+            add_many(items)
+        else:
+            for key, task_text in items:
+                self.index.add(key, task_text)
+
+    def _search(
+        self,
+        task_text: str,
+        threshold: float,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[TaskId, float]]:
+        """
+        Index matches as (task_id, similarity) pairs of tasks held by this model.
+
+        limit is passed on to similarity-ranked indexes only (top-k there);
+        other backends return every match.
+        """
+        self._flush_index()
+        if limit is not None and self._limit_search:
+            matches = self.index.search(task_text, threshold, limit)
+        else:
+            matches = self.index.search(task_text, threshold)
+        if self._index_keys is None:
+            return matches
+        # Keys this model did not index belong to other processes sharing the
+        # file; a key whose latest text differs from ours was re-indexed elsewhere
+        resolved = []
+        for key, sim in matches:
+            task_id = self._index_ids.get(key)
+            record = self.tasks.get(task_id) if task_id is not None else None
+            if record is not None and self.index.holds(key, record.task):
+                resolved.append((task_id, sim))
+        return resolved
+
+    def max_int_id(self) -> Optional[int]:
+        """Largest integer task id recorded or replayed from the event log (None if none)."""
+        return self._max_int_id
+
+    def _hit(self, task_ids: Iterable[TaskId]) -> None:
+        """Report retrieval hits to the eviction policy (LRU recency)."""
+        if self.eviction is not None:
+            for task_id in task_ids:
+                self.eviction.hit(task_id)
+
+    def history(self, task_id: TaskId) -> List[LifecycleEvent]:
+        """
+        Full lifecycle history of a task (CREATED → … → terminal), oldest first.
 
-    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        Requires config.event_log_dir; scans the log on disk.
+        """
+        if self.event_log is None:
+            raise ValueError("Task history requires an event log (config.event_log_dir)")
+        return self.event_log.history(task_id)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group record() calls: new task texts are indexed together when the
+        outermost batch ends (or earlier, when a search needs them), so an
+        embedding backend embeds them in one add_many() call.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_index()
+
+    def close(self) -> None:
+        """Sync and close the event log, if any."""
+        if self.event_log is not None:
+            self.event_log.close()
+
+    def get(self, task_id: TaskId) -> Optional[Dict[str, Any]]:
         """Retrieve data for a specific task by ID, or None if not found."""
-        entry = self.tasks.get(task_id)
-        if entry is not None:
-            entry = dict(entry)
-            entry["timestamp"] = entry["timestamp"].isoformat()
-        return entry
+        record = self.tasks.get(task_id)
+        return record.to_dict() if record is not None else None
 
     def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Return the most recent tasks (sorted by timestamp descending)."""
-        sorted_tasks = sorted(
-            self.tasks.values(),
-            key=lambda e: e["timestamp"],
-            reverse=True
-        )
-        recent = sorted_tasks[:limit]
-        return [dict(t, timestamp=t["timestamp"].isoformat()) for t in recent]
+        """
+        Return the most recent tasks (newest first).
+
+        O(limit): the table is kept in last-recorded order, which is timestamp
+        order unless timestamps are edited by hand.
+        """
+        return [self.tasks[task_id].to_dict() for task_id in islice(reversed(self.tasks), limit)]
+
+    def view(self, task_id: TaskId) -> Optional[RecordView]:
+        """Read-only live view of a task's record (no copy), or None if not found."""
+        record = self.tasks.get(task_id)
+        return RecordView(record) if record is not None else None
+
+    def tasks_view(self) -> TasksView:
+        """Read-only lazy Mapping of the whole history (O(1); nothing is copied)."""
+        return TasksView(self.tasks)
+
+    def iter_tasks(
+        self,
+        since: Optional[Union[datetime, int]] = None,
+        state: Optional[Union[TaskState, str]] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Tuple[TaskId, RecordView]]:
+        """
+        Stream (task_id, view) pairs in recorded order.
+
+        since: only tasks last recorded at or after this time
+               (naive UTC datetime or integer nanoseconds).
+        state: only tasks currently in this lifecycle state.
+
+        Tasks older than `since` are never visited, so polling for recent
+        changes costs O(changes). The table must not be modified while iterating.
+        """
+        if isinstance(since, datetime):
+            since = datetime_to_ns(since)
+        if isinstance(state, str):
+            state = TaskState(state)
+
+        def selected(task_ids: Iterable[TaskId]) -> Iterator[Tuple[TaskId, RecordView]]:
+            for task_id in task_ids:
+                record = self.tasks[task_id]
+                if state is None or record.state is state:
+                    yield task_id, RecordView(record)
+
+        if since is None:
+            yield from selected(reversed(self.tasks) if newest_first else self.tasks)
+            return
+
+        newer = takewhile(lambda t: self.tasks[t].timestamp_ns >= since, reversed(self.tasks))
+        if newest_first:
+            yield from selected(newer)
+        else:
+            yield from selected(reversed(list(newer)))
 
     def get_similar(
         self,
@@ -79,22 +469,92 @@ class WorldModel:
         """
         Return tasks with similarity above threshold to the given task_text.
 
-        Placeholder similarity function (string overlap) — future: use real cosine sim on embeddings.
+        Similarity comes from the configured retrieval backend
+        (config.retrieval_backend; default: exact word overlap via an inverted
+        token index). The most recent `limit` matches are selected with a bounded heap.
+        Similarity-ranked backends ("embedding", "tfidf") first narrow the
+        matches to the `limit` most similar (top-k in the index).
+        """
+        recent = self._recent_ids(self._matches(task_text, threshold, limit), limit)
+        self._hit(recent)
+        return [self.tasks[task_id].to_dict() for task_id in recent]
+
+    def peek_similar(
+        self,
+        task_text: str,
+        threshold: float = 0.7,
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Same result as get_similar() for internal lookups (e.g. queue scoring):
+        not reported to the eviction policy as a hit and never recall-sampled.
+        """
+        recent = self._recent_ids(self._matches(task_text, threshold, limit, sample=False), limit)
+        return [self.tasks[task_id].to_dict() for task_id in recent]
+
+    def _recent_ids(self, matches: List[Tuple[str, float]], limit: int) -> List[TaskId]:
+        """The most recent `limit` matched ids, selected with a bounded heap."""
+        return heapq.nlargest(limit, (task_id for task_id, _ in matches), key=self._recency_key)
+
+    def _matches(
+        self,
+        task_text: str,
+        threshold: float,
+        limit: Optional[int] = None,
+        sample: bool = True,
+    ) -> List[Tuple[str, float]]:
+        """
+        (task_id, similarity) pairs from the retrieval backend; limit caps the
+        candidates of similarity-ranked backends. Recall is sampled unless
+        sample=False or the candidates were capped.
+        """
+        matches = self._search(task_text, threshold, limit)
+
+        interval = self.config.retrieval_recall_sample_interval
+        sample = sample and (limit is None or not self._limit_search)
+        if sample:
+            self._queries += 1
+        if sample and interval > 0 and self._queries % interval == 0:
+            self.recall_total += self._recall(task_text, threshold, matches)
+            self.recall_samples += 1
+        return matches
+
+    def measure_recall(self, task_text: str, threshold: float = 0.7) -> float:
+        """
+        Fraction of exact word-overlap matches that the retrieval backend finds.
+
+        Always 1.0 for the exact "token" backend; meaningful for "minhash".
+        Not meaningful for "tfidf" or "embedding", which use other similarity measures.
+        Runs a full scan — intended for sampling and diagnostics, not hot paths.
         """
-        similar = []
-        for entry in self.tasks.values():
-            past_text = entry.get("task", "")  # Safe default if key missing
-            union = set(task_text.split()) | set(past_text.split())
-            if not union:
-                continue  # Avoid division by zero
-            intersection = set(task_text.split()) & set(past_text.split())
-            sim = len(intersection) / len(union)
-            if sim >= threshold:
-                similar.append(entry)
+        return self._recall(task_text, threshold, self._search(task_text, threshold))
+
+    def _recall(self, task_text: str, threshold: float, matches) -> float:
+        exact = {
+            task_id
+            for task_id, _ in exact_search(
+                ((task_id, record.task) for task_id, record in self.tasks.items()),
+                task_text,
+                threshold,
+            )
+        }
+        if not exact:
+            return 1.0
+        found = {task_id for task_id, _ in matches}
+        return len(exact & found) / len(exact)
 
-        similar.sort(key=lambda e: e["timestamp"], reverse=True)
-        recent = similar[:limit]
-        return [dict(t, timestamp=t["timestamp"].isoformat()) for t in recent]
+    def recall_stats(self) -> Dict[str, float]:
+        """Sampled recall of get_similar() against the exact method."""
+        mean = self.recall_total / self.recall_samples if self.recall_samples else 1.0
+        return {"samples": self.recall_samples, "mean_recall": mean}
+
+    def _recency_key(self, task_id: TaskId) -> Tuple[int, int]:
+        return self._record_recency(self.tasks[task_id])
+
+    @staticmethod
+    def _record_recency(record: TaskRecord) -> Tuple[int, int]:
+        """Newest first; ties keep first-record order (matches a stable sort)."""
+        return record.timestamp_ns, -record.seq
 
     def retrieve_similar(
         self,
@@ -103,29 +563,41 @@ class WorldModel:
         threshold: float = 0.7,
         limit: int = 5,
         prefer_failures: bool = False,
+        peek: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve past tasks relevant to the current task_text.
 
         Optionally bias toward failed outcomes (negative memory).
         Deterministic ordering: failures first (when prefer_failures=True), then recency.
-
-        Not used anywhere yet — future consumer for prediction context.
+        With peek=True (speculative lookups) the result is the same but no
+        retrieval hit is reported and recall is not sampled, as in peek_similar().
         """
-        candidates = self.get_similar(
-            task_text,
-            threshold=threshold,
-            limit=limit * 2,  # Fetch extra for filtering/bias — future: configurable
+        candidates = self._candidates(
+            self._matches(task_text, threshold, limit * 2, sample=not peek),
+            window=limit * 2,
+            prefer_failures=prefer_failures,
         )
+        if not peek:
+            self._hit(task_id for task_id, _ in candidates[:limit])
+        return [self.tasks[task_id].to_dict() for task_id, _ in candidates[:limit]]
 
+    def _candidates(
+        self,
+        matches: List[Tuple[str, float]],
+        window: int,
+        prefer_failures: bool,
+    ) -> List[Tuple[str, float]]:
+        """
+        The `window` most recent matches, newest first; with prefer_failures,
+        failures among them come first (each group still newest first).
+        """
+        recent = heapq.nlargest(window, matches, key=lambda m: self._recency_key(m[0]))
         if prefer_failures:
-            failed = [e for e in candidates if not e.get("success", False)]
-            succeeded = [e for e in candidates if e.get("success", False)]
-            prioritized = failed + succeeded
-        else:
-            prioritized = candidates
-
-        return prioritized[:limit]  # No re-serialization — upstream already handles it
+            failed = [m for m in recent if not self.tasks[m[0]].success]
+            succeeded = [m for m in recent if self.tasks[m[0]].success]
+            recent = failed + succeeded
+        return recent
 
     def retrieve_scored(
         self,
@@ -136,44 +608,75 @@ class WorldModel:
         threshold: float = 0.7,
         limit: int = 5,
         prefer_failures: bool = False,
+        rank_all_matches: bool = False,
+        unified_similarity: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve past tasks relevant to the current task_text with computed scores.
 
         Scores are computed using score_memory_entry() and used for ranking.
         Drops entries with score == 0.
-        Deterministic ordering: score DESC.
+        Deterministic ordering: score DESC (ties keep candidate order).
+
+        Runs in one pass over the backend matches: similarity is computed once
+        by the index, ranking uses bounded heaps, and only the returned
+        entries are serialized.
 
-        Not used anywhere yet — future consumer for prediction context.
+        Two ranking choices are explicit options:
+
+        - rank_all_matches: by default only the 2 * limit most recent matches
+          (after failure preference, taken from the 4 * limit most recent) are
+          scored, so an older but higher-scoring match can be cut by recency
+          before ranking. True scores every match above the threshold.
+        - unified_similarity: by default the threshold uses the backend
+          similarity (case-sensitive word overlap for "token") while the score
+          recomputes a lowercase word overlap. True scores with the backend
+          similarity itself, so thresholding and ranking agree.
         """
-        candidates = self.retrieve_similar(
-            task_text=task_text,
-            threshold=threshold,
-            limit=limit * 2,
-            prefer_failures=prefer_failures,
-        )
+        if policy_mode == PolicyMode.HALT:
+            return []  # score_memory_entry() zeroes every entry under HALT
+
+        matches = self._matches(task_text, threshold, None if rank_all_matches else limit * 4)
+        if rank_all_matches:
+            candidates = matches
+        else:
+            recent = self._candidates(matches, window=limit * 4, prefer_failures=prefer_failures)
+            candidates = recent[: limit * 2]
 
         scored = []
-        for entry in candidates:
+        for position, (task_id, similarity) in enumerate(candidates):
             score = score_memory_entry(
-                entry=entry,
+                entry=self.tasks[task_id],  # read via dict-style access, not copied
                 current_task=task_text,
                 policy_mode=policy_mode,
                 config=config,
+                similarity=similarity if unified_similarity else None,
             )
             if score > 0:
-                entry_with_score = dict(entry)
-                entry_with_score["score"] = score
-                scored.append(entry_with_score)
+                if rank_all_matches:
+                    # Ties: failures first when preferred, then recency
+                    failed = prefer_failures and not self.tasks[task_id].success
+                    tie_break = (failed, self._recency_key(task_id))
+                else:
+                    tie_break = -position
+                scored.append((score, tie_break, task_id))
+
+        top = heapq.nlargest(limit, scored, key=lambda s: (s[0], s[1]))
+        self._hit(task_id for _, _, task_id in top)
+        return [
+            dict(self.tasks[task_id].to_dict(), score=score)
+            for score, _, task_id in top
+        ]
 
-        scored.sort(key=lambda e: e["score"], reverse=True)
-        return scored[:limit]
+    def all_tasks(self) -> Dict[TaskId, Dict[str, Any]]:
+        """
+        Return a copy of the entire task history with serialized timestamps.
 
-    def all_tasks(self) -> Dict[str, Dict[str, Any]]:
-        """Return a copy of the entire task history with serialized timestamps."""
+        O(N) allocations; prefer tasks_view() or iter_tasks() for polling.
+        """
         return {
-            k: dict(v, timestamp=v["timestamp"].isoformat())
-            for k, v in self.tasks.items()
+            task_id: record.to_dict()
+            for task_id, record in self.tasks.items()
         }
 
     def __len__(self) -> int:
@@ -182,3 +685,18 @@ class WorldModel:
 
     def __repr__(self) -> str:
         return f"WorldModel({len(self)} tasks recorded)"
+
+
+def make_world_model(
+    config: ECKConfig,
+    embed_fn: Optional[EmbedFn] = None,
+    cold_storage: Optional[Callable[[TaskId, Dict[str, Any]], None]] = None,
+):
+    """Build the WorldModel selected by config.memory_backend."""
+    if config.memory_backend == "memory":
+        return WorldModel(config=config, embed_fn=embed_fn, cold_storage=cold_storage)
+    if config.memory_backend == "sqlite":
+        if config.memory_path is None:
+            raise ValueError("The sqlite memory backend requires memory_path")
+        return SQLiteWorldModel(config.memory_path, config=config)
+    raise ValueError(f"Unknown memory backend: {config.memory_backend}")
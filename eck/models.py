@@ -1 +1,331 @@
 # Data models for ECK (Task, WorldModel, etc)
+import sys
+import time
+import uuid
+import itertools
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .task import TaskState
+
+TaskId = Union[int, str]
+
+_EPOCH = datetime(1970, 1, 1)  # naive UTC, as datetime.utcnow()
+
+
+def now_ns() -> int:
+    """Current wall-clock time as integer nanoseconds since the epoch."""
+    return time.time_ns()
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Naive UTC datetime for a nanosecond timestamp (microsecond precision)."""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """Nanosecond timestamp for a naive UTC datetime."""
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+class TaskIdAllocator:
+    """
+    Monotonic integer task ids, optionally mapped to UUID4 strings.
+
+    Integer ids are compact and ordered; the UUID mapping exists for
+    boundaries that need globally unique identifiers (logs, shared stores).
+
+    With a reserve callable (reserve(count, at_least) -> first id), ids are
+    drawn from blocks reserved in a shared store, so several writers of one
+    store never hand out the same id; ids then increase but may skip.
+    """
+
+    def __init__(
+        self,
+        with_uuids: bool = False,
+        start: int = 1,
+        reserve: Optional[Callable[[int, int], int]] = None,
+        block: int = 64,
+    ):
+        self.with_uuids = with_uuids
+        self.next_id = start
+        self.reserve = reserve
+        self.block = block
+        self._block_end = 0  # ids below this (from next_id) are reserved
+        self._uuids: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+
+    def next(self) -> int:
+        if self.reserve is not None and self.next_id >= self._block_end:
+            self.next_id = self.reserve(self.block, self.next_id)
+            self._block_end = self.next_id + self.block
+        task_id = self.next_id
+        self.next_id += 1
+        if self.with_uuids:
+            uid = str(uuid.uuid4())
+            self._uuids[task_id] = uid
+            self._ids[uid] = task_id
+        return task_id
+
+    def advance_past(self, task_id: Optional[int]) -> None:
+        """Make later ids larger than task_id (persisted ids from a previous run)."""
+        if task_id is not None:
+            self.next_id = max(self.next_id, task_id + 1)
+
+    def uuid_for(self, task_id: int) -> Optional[str]:
+        """UUID mapped to an integer id (None without UUID mapping)."""
+        return self._uuids.get(task_id)
+
+    def id_for(self, uid: str) -> Optional[int]:
+        """Integer id mapped to a UUID (None if unknown)."""
+        return self._ids.get(uid)
+
+    def uuid_items(self, start: int = 0) -> List[Tuple[int, str]]:
+        """(id, uuid) pairs in allocation order, skipping the first `start`."""
+        return list(itertools.islice(self._uuids.items(), start, None))
+
+    def load(self, next_id: int, uuid_items: Iterable[Tuple[int, str]] = ()) -> None:
+        """Resume from saved state (checkpoint restore); mappings are added."""
+        self.next_id = next_id
+        self._block_end = 0
+        for task_id, uid in uuid_items:
+            self._uuids[task_id] = uid
+            self._ids[uid] = task_id
+
+    @property
+    def uuid_count(self) -> int:
+        return len(self._uuids)
+
+
+class Task:
+    """
+    Queue item: integer id and interned task text.
+
+    Supports task["id"] / task["text"] so code written against the
+    original {"id", "text"} dicts keeps working.
+    """
+
+    __slots__ = ("id", "text")
+
+    def __init__(self, id: TaskId, text: str):
+        self.id = id
+        self.text = sys.intern(text)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "text": self.text}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Task):
+            return (self.id, self.text) == (other.id, other.text)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Task({self.id!r}, {self.text!r})"
+
+
+class TaskRecord:
+    """
+    Latest recorded state of one task in the WorldModel.
+
+    Fixed __slots__ fields; the timestamp is integer nanoseconds (UTC) and
+    the task text is interned. Lifecycle updates modify the record in place.
+
+    Behaves like the original record dict for reads and for the keys that
+    existed there: record["timestamp"] is a datetime (assigning a datetime
+    updates timestamp_ns), record["state"] is the TaskState value string,
+    and "metadata" is present only when metadata was recorded.
+    """
+
+    __slots__ = (
+        "task", "state", "prediction", "outcome", "success",
+        "feedback", "timestamp_ns", "metadata", "seq",
+    )
+
+    KEYS: Tuple[str, ...] = (
+        "task", "state", "prediction", "outcome", "success", "feedback", "timestamp",
+    )
+
+    def __init__(
+        self,
+        task: str,
+        state: TaskState,
+        prediction: Optional[str],
+        outcome: Optional[str],
+        success: Optional[bool],
+        feedback: Optional[str],
+        timestamp_ns: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        seq: int = 0,
+    ):
+        self.task = sys.intern(task) if isinstance(task, str) else task
+        self.state = state
+        self.prediction = prediction
+        self.outcome = outcome
+        self.success = success
+        self.feedback = feedback
+        self.timestamp_ns = timestamp_ns
+        self.metadata = metadata
+        self.seq = seq  # first-record order (stable tie-break)
+
+    def update(
+        self,
+        task: str,
+        state: TaskState,
+        prediction: Optional[str],
+        outcome: Optional[str],
+        success: Optional[bool],
+        feedback: Optional[str],
+        timestamp_ns: int,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Overwrite every field in place (same semantics as a fresh record)."""
+        if task != self.task:
+            self.task = sys.intern(task) if isinstance(task, str) else task
+        self.state = state
+        self.prediction = prediction
+        self.outcome = outcome
+        self.success = success
+        self.feedback = feedback
+        self.timestamp_ns = timestamp_ns
+        self.metadata = metadata
+
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.KEYS + ("metadata",) if self.metadata is not None else self.KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "timestamp":
+            return self.timestamp
+        if key == "state":
+            return self.state.value
+        if key == "metadata" and self.metadata is None:
+            raise KeyError(key)
+        if key not in self.KEYS and key != "metadata":
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "timestamp":
+            self.timestamp_ns = datetime_to_ns(value)
+        elif key == "state":
+            self.state = TaskState(value)
+        elif key in self.KEYS or key == "metadata":
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with the timestamp serialized to isoformat (boundary form)."""
+        entry = {
+            "task": self.task,
+            "state": self.state.value,
+            "prediction": self.prediction,
+            "outcome": self.outcome,
+            "success": self.success,
+            "feedback": self.feedback,
+            "timestamp": self.timestamp.isoformat(),
+        }
+        if self.metadata is not None:
+            entry["metadata"] = dict(self.metadata)
+        return entry
+
+    def __repr__(self) -> str:
+        return f"TaskRecord({self.task!r}, state={self.state.value})"
+
+
+class RecordView(Mapping):
+    """
+    Read-only, zero-copy view of a TaskRecord in its serialized form.
+
+    Same keys and values as TaskRecord.to_dict(), but nothing is copied or
+    formatted until a key is read ("timestamp" is isoformatted on access).
+    The view is live: it reflects later in-place updates of the record.
+    """
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record: TaskRecord):
+        self._record = record
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "timestamp":
+            return self._record.timestamp.isoformat()
+        if key == "metadata":
+            if self._record.metadata is None:
+                raise KeyError(key)
+            return MappingProxyType(self._record.metadata)
+        return self._record[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._record.keys())
+
+    def __len__(self) -> int:
+        return len(self._record.keys())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._record.keys()
+
+    def __repr__(self) -> str:
+        return f"RecordView({self._record!r})"
+
+
+class TasksView(Mapping):
+    """
+    Read-only, lazy Mapping of task_id → RecordView over a WorldModel's records.
+
+    Creating the view is O(1); each access wraps one record.
+    Iteration follows the underlying table (last-recorded order).
+    """
+
+    __slots__ = ("_tasks",)
+
+    def __init__(self, tasks: Dict[TaskId, TaskRecord]):
+        self._tasks = tasks
+
+    def __getitem__(self, task_id: TaskId) -> RecordView:
+        return RecordView(self._tasks[task_id])
+
+    def __iter__(self) -> Iterator[TaskId]:
+        return iter(self._tasks)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def __repr__(self) -> str:
+        return f"TasksView({len(self)} tasks)"
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class Phase(Enum):
+    """
+    LLM call sites within one ECK control cycle.
+
+    Used to key per-phase infrastructure (e.g. response caching).
+    Phases name *where* a call happens, never how its result is interpreted.
+    """
+    SEED = "seed"
+    PREDICTION = "prediction"
+    EXECUTION = "execution"
+    CRITIC = "critic"
+    GOAL_CHECK = "goal_check"
+    SUBTASKS = "subtasks"
+    FUSED_EVALUATION = "fused_evaluation"
+    PRIORITIZATION = "prioritization"
@@ -3,11 +3,13 @@
 # Prediction must not interpret, parse, or branch on its contents.
 # All semantic interpretation belongs to policy layers only.
 
-from typing import Callable
+from typing import Awaitable, Callable, List, Optional, Sequence
 
 from .prompts import format_prompt, PREDICTION_PROMPT_TEMPLATE
 from .memory import WorldModel
 from .config import ECKConfig
+from .utils import call_batch
+from .retrieval import tokenize
 
 
 def build_prediction_context(
@@ -15,6 +17,7 @@ def build_prediction_context(
     objective: str,
     memory: WorldModel,
     config: ECKConfig,
+    peek: bool = False,
 ) -> str:
     """
     Build optional context from relevant past task outcomes for the prediction prompt.
@@ -23,17 +26,44 @@ def build_prediction_context(
     Disabled by default via config.enable_memory_retrieval.
 
     Returns empty string when disabled or no relevant outcomes found.
+    With memory.context_cache set, contexts are reused until a memory change
+    can affect them (cache hits are not reported as LRU-eviction hits).
+    peek=True builds a speculative context (prediction prefetch): the cache
+    is bypassed and no retrieval hits or recall samples are recorded.
     """
     if not config.enable_memory_retrieval:
         return ""
 
-    similar = memory.retrieve_similar(
+    cache = getattr(memory, "context_cache", None)
+    if cache is None or peek:
+        return _format_context(_retrieve(task_text, memory, config, peek))
+
+    key = (
+        task_text,
+        config.memory_similarity_threshold,
+        config.memory_retrieval_limit,
+        config.prefer_negative_memory,
+    )
+    version = memory.version
+    context = cache.get(key, version)
+    if context is None:
+        context = _format_context(_retrieve(task_text, memory, config))
+        cache.put(key, version, context, tokenize(task_text))
+    return context
+
+
+def _retrieve(task_text: str, memory: WorldModel, config: ECKConfig, peek: bool = False) -> List[dict]:
+    return memory.retrieve_similar(
         task_text=task_text,
         threshold=config.memory_similarity_threshold,
         limit=config.memory_retrieval_limit,
         prefer_failures=config.prefer_negative_memory,
+        peek=peek,
     )
 
+
+def _format_context(similar: List[dict]) -> str:
+    """Render retrieved entries as the context block (empty string if none)."""
     if not similar:
         return ""
 
@@ -57,33 +87,34 @@ def build_prediction_context(
     return "\n".join(context_lines)
 
 
-def generate_prediction(
+def build_prediction_prompt(
     task_text: str,
     objective: str,
-    llm_call: Callable[[str], str],
     memory: WorldModel,
     config: ECKConfig,
-    max_length: int = 200,
+    memory_context: Optional[str] = None,
 ) -> str:
     """
-    Generate a concise prediction of the expected task outcome.
-
-    This function is pure: it formats the prompt, calls the LLM, and safely parses the result.
-    No side effects, no logging, no state changes.
+    Format the prediction prompt, including optional memory context.
 
-    Memory context is opaque text. Do not interpret here.
+    Read-only: shared by the sync and async prediction paths.
+    A precomputed memory_context (from build_prediction_context) is used as-is.
     """
     # Build memory context (empty if disabled or no relevant outcomes)
-    memory_context = build_prediction_context(task_text, objective, memory, config)
+    if memory_context is None:
+        memory_context = build_prediction_context(task_text, objective, memory, config)
 
-    prompt = format_prompt(
+    return format_prompt(
         PREDICTION_PROMPT_TEMPLATE,
         memory_context=memory_context,
         objective=objective,
         task_text=task_text,
     )
 
-    raw_prediction = llm_call(prompt).strip()
+
+def _normalize_prediction(raw_prediction: str, max_length: int) -> str:
+    """Normalize a raw LLM prediction (whitespace, empty output, length cap)."""
+    raw_prediction = raw_prediction.strip()
 
     # Normalize internal whitespace (collapse multiples, remove newlines/tabs)
     raw_prediction = " ".join(raw_prediction.split())
@@ -98,3 +129,64 @@ def generate_prediction(
 
     return raw_prediction
 
+
+def generate_prediction(
+    task_text: str,
+    objective: str,
+    llm_call: Callable[[str], str],
+    memory: WorldModel,
+    config: ECKConfig,
+    max_length: int = 200,
+    memory_context: Optional[str] = None,
+) -> str:
+    """
+    Generate a concise prediction of the expected task outcome.
+
+    This function is pure: it formats the prompt, calls the LLM, and safely parses the result.
+    No side effects, no logging, no state changes.
+
+    Memory context is opaque text. Do not interpret here.
+    """
+    prompt = build_prediction_prompt(task_text, objective, memory, config, memory_context)
+    return _normalize_prediction(llm_call(prompt), max_length)
+
+
+async def generate_prediction_async(
+    task_text: str,
+    objective: str,
+    llm_call: Callable[[str], Awaitable[str]],
+    memory: WorldModel,
+    config: ECKConfig,
+    max_length: int = 200,
+    memory_context: Optional[str] = None,
+) -> str:
+    """
+    Async counterpart of generate_prediction() for awaitable LLM callables.
+
+    Same prompt, same normalization, same purity guarantees.
+    """
+    prompt = build_prediction_prompt(task_text, objective, memory, config, memory_context)
+    return _normalize_prediction(await llm_call(prompt), max_length)
+
+
+def generate_predictions_batch(
+    task_texts: Sequence[str],
+    objective: str,
+    llm_batch_call: Callable[[List[str]], List[str]],
+    memory: WorldModel,
+    config: ECKConfig,
+    max_length: int = 200,
+) -> List[str]:
+    """
+    Batched counterpart of generate_prediction(): one provider call for all tasks.
+
+    Predictions are returned in the same order as task_texts.
+    """
+    prompts = [
+        build_prediction_prompt(task_text, objective, memory, config)
+        for task_text in task_texts
+    ]
+    return [
+        _normalize_prediction(response, max_length)
+        for response in call_batch(llm_batch_call, prompts)
+    ]
@@ -0,0 +1,169 @@
+import json
+import logging
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .config import ECKConfig
+from .prompts import format_prompt, PRIORITIZATION_PROMPT
+from .queue import PriorityTaskQueue, Scorer
+from .retrieval import jaccard, tokenize
+from .task import TaskState
+from .utils import safe_parse_json_array
+
+logger = logging.getLogger("eck-core")
+
+
+_FINISHED = frozenset({
+    TaskState.SUCCEEDED.value,
+    TaskState.FAILED.value,
+    TaskState.REJECTED_BY_CRITIC.value,
+})
+
+
+class HeuristicScorer:
+    """Local scorer: word overlap between the task and the objective."""
+
+    def __init__(self, objective: str):
+        self._objective = tokenize(objective)
+
+    def __call__(self, texts: Sequence[str], queue: Optional[PriorityTaskQueue] = None) -> List[float]:
+        return [jaccard(tokenize(text), self._objective) for text in texts]
+
+
+class MemoryScorer(HeuristicScorer):
+    """
+    Heuristic score, lowered for work the WorldModel has already finished.
+
+    Each similar task that already ended (succeeded, failed or was rejected)
+    costs penalty / limit, so novel tasks rank above retries and repeats.
+    Lookups use peek_similar(), so scoring does not count as retrieval
+    (no LRU hits, no recall samples).
+    """
+
+    def __init__(
+        self,
+        objective: str,
+        memory,
+        threshold: float = 0.6,
+        limit: int = 5,
+        penalty: float = 0.5,
+    ):
+        super().__init__(objective)
+        self.memory = memory
+        self.threshold = threshold
+        self.limit = limit
+        self.penalty = penalty
+
+    def __call__(self, texts: Sequence[str], queue: Optional[PriorityTaskQueue] = None) -> List[float]:
+        scores = super().__call__(texts)
+        for i, text in enumerate(texts):
+            similar = self.memory.peek_similar(text, threshold=self.threshold, limit=self.limit)
+            finished = sum(1 for entry in similar if entry["state"] in _FINISHED)
+            scores[i] -= self.penalty * finished / self.limit
+        return scores
+
+
+class LLMScorer:
+    """
+    Batched LLM prioritization with PRIORITIZATION_PROMPT.
+
+    One call ranks all new tasks together with up to max_anchors queued tasks
+    (spread evenly over the current priority order). New tasks get scores
+    between the anchors the LLM ranked them between, so queued tasks are
+    never rescored. Tasks missing from the response rank below everything
+    (pessimistic, as for other unparseable LLM output).
+    """
+
+    def __init__(self, objective: str, llm_call: Callable[[str], str], max_anchors: int = 8):
+        self.objective = objective
+        self.llm_call = llm_call
+        self.max_anchors = max_anchors
+        self.calls = 0
+
+    def _anchors(self, queue: Optional[PriorityTaskQueue]) -> List[Tuple[float, str]]:
+        if queue is None or not len(queue) or self.max_anchors < 1:
+            return []
+        queued = queue.scored_tasks()
+        if len(queued) > self.max_anchors:
+            step = (len(queued) - 1) / (self.max_anchors - 1) if self.max_anchors > 1 else 0
+            queued = [queued[round(i * step)] for i in range(self.max_anchors)]
+        return [(score, task["text"]) for score, task in queued]
+
+    def __call__(self, texts: Sequence[str], queue: Optional[PriorityTaskQueue] = None) -> List[float]:
+        anchors = self._anchors(queue)
+        prompt = format_prompt(
+            PRIORITIZATION_PROMPT,
+            objective=self.objective,
+            task_list_json=json.dumps([text for _, text in anchors] + list(texts)),
+        )
+        self.calls += 1
+        ranked = safe_parse_json_array(self.llm_call(prompt))
+        return rank_scores(ranked, anchors, texts)
+
+
+def rank_scores(
+    ranked: Sequence[str],
+    anchors: Sequence[Tuple[float, str]],
+    texts: Sequence[str],
+) -> List[float]:
+    """
+    Scores for texts from an LLM ranking that also contains scored anchors.
+
+    A run of new texts ranked between two anchors is spread evenly between
+    their scores; above the first or below the last anchor, scores step by 1.0.
+    """
+    position = {}
+    for i, text in enumerate(ranked):
+        position.setdefault(text, i)
+
+    end = len(ranked)
+    items = sorted(
+        [(position[text], 0, score) for score, text in anchors if text in position]
+        + [(position.get(text, end), 1, i) for i, text in enumerate(texts)],
+        key=lambda item: (item[0], item[1]),
+    )
+
+    scores = [0.0] * len(texts)
+
+    def place(run: List[int], above: Optional[float], below: Optional[float]) -> None:
+        k = len(run)
+        for j, index in enumerate(run):
+            if above is not None and below is not None:
+                scores[index] = above - (above - below) * (j + 1) / (k + 1)
+            elif above is not None:
+                scores[index] = above - (j + 1)
+            elif below is not None:
+                scores[index] = below + (k - j)
+            else:
+                scores[index] = float(k - j)
+
+    run: List[int] = []
+    above: Optional[float] = None
+    for _, is_new, value in items:
+        if is_new:
+            run.append(value)
+        else:
+            place(run, above, value)
+            run, above = [], value
+    place(run, above, None)
+    return scores
+
+
+def make_scorer(
+    config: ECKConfig,
+    objective: str,
+    memory=None,
+    llm_call: Optional[Callable[[str], str]] = None,
+) -> Scorer:
+    """Build the scorer named by config.queue_scorer."""
+    name = config.queue_scorer
+    if name == "heuristic":
+        return HeuristicScorer(objective)
+    if name == "memory":
+        if memory is None:
+            raise ValueError('queue_scorer="memory" requires a WorldModel')
+        return MemoryScorer(objective, memory, threshold=config.memory_similarity_threshold)
+    if name == "llm":
+        if llm_call is None:
+            raise ValueError('queue_scorer="llm" requires an llm_call')
+        return LLMScorer(objective, llm_call, max_anchors=config.queue_llm_anchors)
+    raise ValueError(f"Unknown queue scorer: {name}")
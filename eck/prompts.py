@@ -53,6 +53,28 @@ Return ONLY valid JSON:
 Respond with true if the result meaningfully advances the objective.
 """
 
+# Fused evaluation: critic verdict, goal check and subtasks in one response
+FUSED_EVALUATION_PROMPT = """
+Evaluate the result against the task and objective, then propose next steps.
+
+Task: {task_text}
+Prediction: {prediction}
+Result: {result}
+Objective: {objective}
+
+Return ONLY valid JSON:
+{{
+  "success": true/false,
+  "feedback": "brief explanation",
+  "goal_achieved": true/false,
+  "subtasks": ["Subtask 1", "Subtask 2"]
+}}
+
+"success": true if the result meaningfully advances the objective.
+"goal_achieved": true only if the result achieves the final objective.
+"subtasks": 0-{max_subtasks} concise subtasks that directly advance the objective, or [] if none are needed.
+"""
+
 GOAL_ACHIEVED_PROMPT = """
 Did this result achieve the final objective?
 
@@ -1,5 +1,17 @@
+import heapq
+import sqlite3
+import threading
 from collections import deque
-from typing import Dict, List, Optional
+from collections.abc import Sequence as SequenceABC
+from itertools import count, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .dedup import TaskDeduplicator
+from .models import Task, TaskId
+
+# Scores the texts of new tasks (higher is popped first); the queue is passed
+# so a scorer can compare against what is already queued.
+Scorer = Callable[[Sequence[str], "PriorityTaskQueue"], List[float]]
 
 
 class TaskQueue:
@@ -9,29 +21,51 @@ class TaskQueue:
     Automatically drops oldest tasks when exceeding max_size.
     """
 
-    def __init__(self, max_size: int = 50):
+    def __init__(self, max_size: int = 50, dedup: Optional[TaskDeduplicator] = None):
         """
         Initialize with a maximum size limit.
 
         Args:
             max_size: Maximum number of tasks allowed (default 50).
+            dedup: Optional duplicate filter kept informed of queued tasks.
         """
         self.queue: deque[Dict] = deque()
         self.max_size = max_size
+        self.dedup = dedup
 
     def push(self, task: Dict) -> None:
         """Add a task to the end; drop oldest if over max_size."""
         self.queue.append(task)
+        if self.dedup is not None:
+            self.dedup.add(task)
         if len(self.queue) > self.max_size:
-            self.queue.popleft()
+            dropped = self.queue.popleft()
+            if self.dedup is not None:
+                self.dedup.discard(dropped)
+
+    def push_many(self, tasks: Iterable[Dict]) -> None:
+        """Push tasks in order (same semantics as repeated push())."""
+        for task in tasks:
+            self.push(task)
 
     def pop(self) -> Optional[Dict]:
         """Remove and return the oldest task, or None if empty."""
-        return self.queue.popleft() if self.queue else None
+        if not self.queue:
+            return None
+        task = self.queue.popleft()
+        if self.dedup is not None:
+            self.dedup.discard(task)
+        return task
+
+    def peek(self, limit: int = 1) -> List[Dict]:
+        """Return up to limit upcoming tasks (oldest first) without removing them."""
+        return list(islice(self.queue, limit))
 
     def clear(self) -> None:
         """Remove all tasks."""
         self.queue.clear()
+        if self.dedup is not None:
+            self.dedup.clear_queued()
 
     def __len__(self) -> int:
         """Current number of tasks in queue."""
@@ -44,3 +78,487 @@ class TaskQueue:
     def __repr__(self) -> str:
         return f"TaskQueue({len(self)}/{self.max_size} tasks)"
 
+
+
+class PriorityTaskQueue:
+    """
+    Bounded task queue ordered by a pluggable scorer (highest score first).
+
+    Push and pop are O(log n) heap operations. Only new arrivals are scored
+    (push_many() scores a whole batch in one scorer call); queued tasks keep
+    their scores. When over max_size the lowest-priority task is dropped.
+    Equal scores keep FIFO order, for popping and for dropping, so a constant
+    scorer behaves exactly like TaskQueue.
+
+    Two heaps (max for pop, min for eviction) share entries; removed entries
+    are marked dead and skipped, and the heaps are rebuilt once dead entries
+    outnumber live ones.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 50,
+        scorer: Optional[Scorer] = None,
+        dedup: Optional[TaskDeduplicator] = None,
+    ):
+        """
+        Args:
+            max_size: Maximum number of tasks allowed (default 50).
+            scorer: Scores new task texts; None scores every task 0.0 (FIFO).
+            dedup: Optional duplicate filter kept informed of queued tasks.
+        """
+        self.max_size = max_size
+        self.scorer = scorer
+        self.dedup = dedup
+        self._seq = count()
+        # entry: [score, seq, task, alive]
+        self._max: List[list] = []  # keyed (-score, seq)
+        self._min: List[list] = []  # keyed (score, seq)
+        self._live = 0
+        self.scored = 0
+        self.dropped = 0
+
+    def push(self, task: Dict, score: Optional[float] = None) -> None:
+        """Score (unless given) and add a task; drop the lowest if over max_size."""
+        if score is None:
+            self.push_many([task])
+        else:
+            self._insert(task, score)
+
+    def push_many(self, tasks: Iterable[Dict]) -> None:
+        """Score a batch of new tasks in one scorer call, then add them in order."""
+        tasks = list(tasks)
+        if not tasks:
+            return
+        if self.scorer is None:
+            scores = [0.0] * len(tasks)
+        else:
+            scores = self.scorer([task["text"] for task in tasks], self)
+            self.scored += len(tasks)
+        for task, score in zip(tasks, scores):
+            self._insert(task, float(score))
+
+    def _insert(self, task: Dict, score: float) -> None:
+        entry = [score, next(self._seq), task, True]
+        heapq.heappush(self._max, (-score, entry[1], entry))
+        heapq.heappush(self._min, (score, entry[1], entry))
+        self._live += 1
+        if self.dedup is not None:
+            self.dedup.add(task)
+        if self._live > self.max_size:
+            self._take(self._min)
+            self.dropped += 1
+
+    def _take(self, heap: List[tuple]) -> Optional[list]:
+        """Remove and return the top live entry of one heap."""
+        while heap:
+            entry = heapq.heappop(heap)[2]
+            if entry[3]:
+                entry[3] = False
+                self._live -= 1
+                if self.dedup is not None:
+                    self.dedup.discard(entry[2])
+                self._maybe_compact()
+                return entry
+        return None
+
+    def _maybe_compact(self) -> None:
+        if len(self._max) + len(self._min) > 4 * max(self._live, 8):
+            self._max = [item for item in self._max if item[2][3]]
+            self._min = [item for item in self._min if item[2][3]]
+            heapq.heapify(self._max)
+            heapq.heapify(self._min)
+
+    def pop(self) -> Optional[Dict]:
+        """Remove and return the highest-priority task, or None if empty."""
+        entry = self._take(self._max)
+        return entry[2] if entry is not None else None
+
+    def _ordered(self) -> List[list]:
+        return sorted(
+            (item[2] for item in self._max if item[2][3]),
+            key=lambda entry: (-entry[0], entry[1]),
+        )
+
+    def peek(self, limit: int = 1) -> List[Dict]:
+        """Return up to limit upcoming tasks (highest priority first) without removing them."""
+        top = heapq.nsmallest(limit, (item for item in self._max if item[2][3]))
+        return [item[2][2] for item in top]
+
+    def scored_tasks(self) -> List[Tuple[float, Dict]]:
+        """(score, task) pairs in pop order."""
+        return [(entry[0], entry[2]) for entry in self._ordered()]
+
+    def clear(self) -> None:
+        """Remove all tasks."""
+        self._max.clear()
+        self._min.clear()
+        self._live = 0
+        if self.dedup is not None:
+            self.dedup.clear_queued()
+
+    def __len__(self) -> int:
+        """Current number of tasks in queue."""
+        return self._live
+
+    def as_list(self) -> List[Dict]:
+        """Return a copy of all tasks as a list, in pop order."""
+        return [entry[2] for entry in self._ordered()]
+
+    def __repr__(self) -> str:
+        return f"PriorityTaskQueue({len(self)}/{self.max_size} tasks)"
+
+
+_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id,  -- no affinity: integer and string ids are kept as given
+    text TEXT NOT NULL
+);
+"""
+
+
+class DurableTaskQueue:
+    """
+    Unbounded FIFO task queue persisted in SQLite, with a bounded in-memory head.
+
+    Nothing is dropped on overflow. Every task is written to the database
+    when pushed and deleted when popped (one transaction per push, push_many
+    or pop), so reopening the same path resumes the queue after a crash.
+    Only the first max_size tasks are held in memory; later tasks are
+    "spilled" and stay on disk until the head runs empty, when the next
+    max_size are read back in one query.
+
+    len() uses counters and as_list() returns a lazy view, so neither loads
+    spilled tasks into memory. Delivery is at-most-once: a task popped just
+    before a crash is not queued again (its PREDICTED record is in memory).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 50,
+        dedup: Optional[TaskDeduplicator] = None,
+        timeout: float = 30.0,
+    ):
+        """
+        Args:
+            path: SQLite file holding the queue (created if missing).
+            max_size: Tasks kept in memory at the head of the queue.
+            dedup: Optional duplicate filter kept informed of queued tasks.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+
+        self.path = path
+        self.max_size = max_size
+        self.dedup = dedup
+        self._db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None,
+            check_same_thread=False,  # callers serialize access (see ThreadedRunner)
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_QUEUE_SCHEMA)
+
+        self._head: deque = deque()  # (seq, task), lowest seqs
+        self._spilled, first = self._db.execute("SELECT COUNT(*), MIN(seq) FROM queue").fetchone()
+        # Highest seq loaded into the head (push_front() may use seqs <= 0)
+        self._head_end = 0 if first is None else min(0, first - 1)
+        start = self._head_end
+        self.spilled_reads = 0
+        self._refill()
+
+        if dedup is not None:
+            for task in self._iter_rows(start):
+                dedup.add(task)
+
+    def _iter_rows(self, after_seq: int, chunk: int = 256) -> Iterator[Task]:
+        """Stream persisted tasks with seq > after_seq in queue order."""
+        cursor = self._db.execute(
+            "SELECT task_id, text FROM queue WHERE seq > ? ORDER BY seq", (after_seq,),
+        )
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                return
+            for task_id, text in rows:
+                yield Task(task_id, text)
+
+    def _refill(self) -> None:
+        """Load the next max_size spilled tasks into the (empty) head."""
+        if not self._spilled:
+            return
+        rows = self._db.execute(
+            "SELECT seq, task_id, text FROM queue WHERE seq > ? ORDER BY seq LIMIT ?",
+            (self._head_end, self.max_size - len(self._head)),
+        ).fetchall()
+        for seq, task_id, text in rows:
+            self._head.append((seq, Task(task_id, text)))
+        if rows:
+            self._head_end = rows[-1][0]
+        self._spilled -= len(rows)
+        self.spilled_reads += 1
+
+    def push(self, task: Dict) -> None:
+        """Append a task (durable on return)."""
+        self.push_many([task])
+
+    def push_many(self, tasks: Iterable[Dict]) -> None:
+        """Append tasks in order, in one transaction."""
+        tasks = list(tasks)
+        if not tasks:
+            return
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            seqs = [
+                self._db.execute(
+                    "INSERT INTO queue (task_id, text) VALUES (?, ?)", (task["id"], task["text"]),
+                ).lastrowid
+                for task in tasks
+            ]
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+        for seq, task in zip(seqs, tasks):
+            if not self._spilled and len(self._head) < self.max_size:
+                self._head.append((seq, task))
+                self._head_end = seq
+            else:
+                self._spilled += 1
+            if self.dedup is not None:
+                self.dedup.add(task)
+
+    def push_front(self, tasks: Iterable[Dict]) -> None:
+        """
+        Put tasks at the head of the queue, in order, in one transaction
+        (tasks popped but not finished, e.g. restored from a checkpoint).
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            (first,) = self._db.execute("SELECT MIN(seq) FROM queue").fetchone()
+            if first is not None:
+                seqs = list(range(first - len(tasks), first))
+                self._db.executemany(
+                    "INSERT INTO queue (seq, task_id, text) VALUES (?, ?, ?)",
+                    [(seq, task["id"], task["text"]) for seq, task in zip(seqs, tasks)],
+                )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+        if first is None:
+            self.push_many(tasks)  # empty queue: the front is the back
+            return
+
+        if not self._head:
+            self._head_end = seqs[-1]
+        for seq, task in zip(reversed(seqs), reversed(tasks)):
+            self._head.appendleft((seq, task))
+            if self.dedup is not None:
+                self.dedup.add(task)
+        # Keep the head bounded: its last tasks go back to being spilled
+        while len(self._head) > self.max_size:
+            self._head.pop()
+            self._spilled += 1
+            self._head_end = self._head[-1][0]
+
+    def has_task(self, task_id: TaskId) -> bool:
+        """True if a task with this id is queued (in memory or on disk)."""
+        return self._db.execute(
+            "SELECT 1 FROM queue WHERE task_id = ? LIMIT 1", (task_id,),
+        ).fetchone() is not None
+
+    def pop(self) -> Optional[Dict]:
+        """Remove and return the oldest task, or None if empty."""
+        if not self._head:
+            self._refill()
+            if not self._head:
+                return None
+        seq, task = self._head.popleft()
+        self._db.execute("DELETE FROM queue WHERE seq = ?", (seq,))
+        if self.dedup is not None:
+            self.dedup.discard(task)
+        return task
+
+    def peek(self, limit: int = 1) -> List[Dict]:
+        """Return up to limit upcoming tasks (oldest first) without removing them."""
+        head = [task for _, task in islice(self._head, limit)]
+        if len(head) < limit and self._spilled:
+            head.extend(islice(self._iter_rows(self._head_end), limit - len(head)))
+        return head
+
+    def clear(self) -> None:
+        """Remove all tasks (in memory and on disk)."""
+        self._db.execute("DELETE FROM queue")
+        self._head.clear()
+        self._spilled = 0
+        if self.dedup is not None:
+            self.dedup.clear_queued()
+
+    def max_int_id(self) -> Optional[int]:
+        """Largest integer task id on disk (None if none), for resuming id allocation."""
+        return self._db.execute(
+            "SELECT MAX(task_id) FROM queue WHERE typeof(task_id) = 'integer'"
+        ).fetchone()[0]
+
+    @property
+    def spilled(self) -> int:
+        """Number of tasks currently held only on disk."""
+        return self._spilled
+
+    def __len__(self) -> int:
+        """Current number of tasks in queue (no disk read)."""
+        return len(self._head) + self._spilled
+
+    def as_list(self) -> "QueueListView":
+        """Read-only sequence of all tasks; spilled tasks are streamed on access."""
+        return QueueListView(self)
+
+    def close(self) -> None:
+        """Close the database (queued tasks stay on disk)."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __repr__(self) -> str:
+        return f"DurableTaskQueue({len(self)} tasks, {self._spilled} spilled)"
+
+
+class QueueListView(SequenceABC):
+    """
+    Lazy, read-only Sequence over a DurableTaskQueue (queue order).
+
+    The head comes from memory; spilled tasks are streamed from disk in
+    chunks while iterating and are never held all at once. Compares equal
+    to a list of the same tasks. The queue must not change while iterating.
+    """
+
+    __slots__ = ("_queue",)
+
+    def __init__(self, queue: DurableTaskQueue):
+        self._queue = queue
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __iter__(self) -> Iterator[Dict]:
+        queue = self._queue
+        for _, task in list(queue._head):
+            yield task
+        if queue._spilled:
+            yield from queue._iter_rows(queue._head_end)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(islice(self, *index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("queue index out of range")
+        return next(islice(self, index, None))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SequenceABC):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"QueueListView({len(self)} tasks)"
+
+
+class ConcurrentTaskQueue:
+    """
+    Thread-safe multi-producer/multi-consumer wrapper around a task queue.
+
+    Every operation runs under one reentrant lock (`mutex`), so callers can
+    hold it across several calls, e.g. a dedup filter and the push it guards.
+    pop() can block until a task arrives. close() stops the producers: later
+    pushes raise ValueError, consumers still receive the tasks already
+    queued, and once the queue is closed and empty pop() returns None at
+    once. Ordering, capacity and dedup are those of the wrapped queue.
+    """
+
+    def __init__(self, inner):
+        """
+        Args:
+            inner: TaskQueue, PriorityTaskQueue or DurableTaskQueue to guard.
+        """
+        self.inner = inner
+        self.mutex = threading.RLock()
+        self._changed = threading.Condition(self.mutex)
+        self.closed = False
+
+    def push(self, task: Dict) -> None:
+        """Add a task and wake one waiting consumer."""
+        self.push_many([task])
+
+    def push_many(self, tasks: Iterable[Dict]) -> None:
+        """Add tasks (one inner push_many) and wake waiting consumers."""
+        tasks = list(tasks)
+        with self.mutex:
+            if self.closed:
+                raise ValueError("push to a closed ConcurrentTaskQueue")
+            self.inner.push_many(tasks)
+            self._changed.notify(len(tasks))
+
+    def pop(self, timeout: Optional[float] = 0.0) -> Optional[Dict]:
+        """
+        Remove and return the next task.
+
+        timeout=0 (default) returns at once, like the wrapped queue; None
+        waits until a task arrives or the queue is closed; otherwise waits at
+        most timeout seconds. Returns None if no task is available.
+        """
+        with self.mutex:
+            if timeout is None or timeout > 0:
+                self._changed.wait_for(lambda: len(self.inner) or self.closed, timeout)
+            return self.inner.pop()
+
+    def close(self) -> None:
+        """Reject further pushes and wake all waiting consumers."""
+        with self.mutex:
+            self.closed = True
+            self._changed.notify_all()
+
+    def drain(self) -> List[Dict]:
+        """Remove and return all queued tasks in pop order."""
+        tasks = []
+        with self.mutex:
+            while True:
+                task = self.inner.pop()
+                if task is None:
+                    return tasks
+                tasks.append(task)
+
+    def peek(self, limit: int = 1) -> List[Dict]:
+        with self.mutex:
+            return self.inner.peek(limit)
+
+    def clear(self) -> None:
+        with self.mutex:
+            self.inner.clear()
+
+    def __len__(self) -> int:
+        with self.mutex:
+            return len(self.inner)
+
+    def as_list(self) -> List[Dict]:
+        """Return a snapshot copy of all tasks (in pop order)."""
+        with self.mutex:
+            return list(self.inner.as_list())
+
+    def __getattr__(self, name: str):
+        # Read-only extras of the wrapped queue (max_size, scored_tasks, spilled, ...)
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def __repr__(self) -> str:
+        state = ", closed" if self.closed else ""
+        return f"ConcurrentTaskQueue({self.inner!r}{state})"
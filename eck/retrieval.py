@@ -0,0 +1,593 @@
+import math
+import heapq
+import random
+import hashlib
+from array import array
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .config import ECKConfig
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Whitespace tokens of text, as used by the word-overlap similarity."""
+    return frozenset(text.split())
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets (0.0 for two empty sets)."""
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def exact_search(
+    entries: Iterable[Tuple[str, str]],
+    text: str,
+    threshold: float,
+) -> List[Tuple[str, float]]:
+    """
+    Reference full scan over (task_id, text) pairs.
+
+    Same semantics as TokenIndex.search(); used to measure approximate recall.
+    """
+    query = tokenize(text)
+    matches = []
+    for task_id, past_text in entries:
+        tokens = tokenize(past_text)
+        if not (query | tokens):
+            continue  # Avoid division by zero
+        similarity = jaccard(query, tokens)
+        if similarity >= threshold:
+            matches.append((task_id, similarity))
+    return matches
+
+
+class TokenIndex:
+    """
+    Exact word-overlap (Jaccard) retrieval backed by an inverted index.
+
+    Maintains token → task_id postings and a cached token set per task,
+    updated incrementally via add()/remove(). Queries only visit entries
+    that share at least one token with the query text.
+
+    Similarity semantics match the original full scan:
+    |A ∩ B| / |A ∪ B| over whitespace tokens, skipping empty unions.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def add(self, task_id: str, text: str) -> None:
+        """Index (or re-index) a task's text."""
+        tokens = tokenize(text)
+        if self._tokens.get(task_id) == tokens:
+            return
+
+        self.remove(task_id)
+        self._tokens[task_id] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(task_id)
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task from the index (no-op if absent)."""
+        tokens = self._tokens.pop(task_id, None)
+        if tokens is None:
+            return
+
+        for token in tokens:
+            ids = self._postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self._postings[token]
+
+    def tokens(self, task_id: str) -> FrozenSet[str]:
+        """Cached token set for an indexed task (empty if unknown)."""
+        return self._tokens.get(task_id, frozenset())
+
+    def search(self, text: str, threshold: float) -> List[Tuple[str, float]]:
+        """
+        Return (task_id, similarity) for every entry with similarity >= threshold.
+
+        Order is unspecified; callers rank the matches.
+        A non-positive threshold admits entries with zero overlap, so it
+        falls back to scanning every entry.
+        """
+        query = tokenize(text)
+
+        # Overlap counts via postings: |A ∩ B| without building intersections
+        overlap: Counter = Counter()
+        for token in query:
+            overlap.update(self._postings.get(token, ()))
+
+        candidates: Iterable[str] = self._tokens if threshold <= 0 else overlap
+
+        matches = []
+        for task_id in candidates:
+            shared = overlap.get(task_id, 0)
+            union = len(query) + len(self._tokens[task_id]) - shared
+            if not union:
+                continue  # Avoid division by zero
+            similarity = shared / union
+            if similarity >= threshold:
+                matches.append((task_id, similarity))
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tokens
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class MinHashLSHIndex:
+    """
+    Approximate word-overlap retrieval using MinHash signatures and LSH banding.
+
+    Each task gets a num_perm-value MinHash signature at add() time, split
+    into `bands` bands of num_perm // bands rows. A query only visits
+    entries that collide with it in at least one band, and similarity is
+    the signature agreement rate (an unbiased Jaccard estimate).
+
+    Recall/speed trade-off: an entry with true similarity s becomes a
+    candidate with probability 1 - (1 - s**rows)**bands. More bands (fewer
+    rows) raise recall and candidate counts; fewer bands do the opposite.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, seed: int = 1):
+        if num_perm < 1 or bands < 1 or num_perm % bands:
+            raise ValueError("num_perm must be a positive multiple of bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self._signatures: Dict[str, array] = {}
+        self._empty: Set[str] = set()  # entries with no tokens (no signature)
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in range(bands)]
+
+    @staticmethod
+    def _hash_token(token: str) -> int:
+        # Stable across processes (unlike hash(), which is salted for str)
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def signature(self, text: str) -> array:
+        """MinHash signature of text's token set (empty array if no tokens)."""
+        hashes = [self._hash_token(token) for token in tokenize(text)]
+        if not hashes:
+            return array("Q")
+        return array(
+            "Q",
+            (min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms),
+        )
+
+    def _band_keys(self, signature: array) -> List[int]:
+        rows = self.rows
+        return [
+            hash(tuple(signature[band * rows:(band + 1) * rows]))
+            for band in range(self.bands)
+        ]
+
+    def add(self, task_id: str, text: str) -> None:
+        """Index (or re-index) a task's text."""
+        self.remove(task_id)
+
+        signature = self.signature(text)
+        if not signature:
+            self._empty.add(task_id)
+            return
+
+        self._signatures[task_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(task_id)
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task from the index (no-op if absent)."""
+        self._empty.discard(task_id)
+        signature = self._signatures.pop(task_id, None)
+        if signature is None:
+            return
+
+        for band, key in enumerate(self._band_keys(signature)):
+            ids = self._buckets[band][key]
+            ids.discard(task_id)
+            if not ids:
+                del self._buckets[band][key]
+
+    def _estimate(self, a: array, b: array) -> float:
+        return sum(1 for x, y in zip(a, b) if x == y) / self.num_perm
+
+    def search(self, text: str, threshold: float) -> List[Tuple[str, float]]:
+        """
+        Return (task_id, estimated_similarity) for LSH candidates >= threshold.
+
+        Order is unspecified. A non-positive threshold returns every entry.
+        """
+        query = self.signature(text)
+
+        if threshold <= 0:
+            matches = [(task_id, 0.0) for task_id in self._empty if query]
+            matches += [
+                (task_id, self._estimate(query, signature) if query else 0.0)
+                for task_id, signature in self._signatures.items()
+            ]
+            return matches
+
+        if not query:
+            return []
+
+        candidates: Set[str] = set()
+        for band, key in enumerate(self._band_keys(query)):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        matches = []
+        for task_id in candidates:
+            similarity = self._estimate(query, self._signatures[task_id])
+            if similarity >= threshold:
+                matches.append((task_id, similarity))
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._signatures) + len(self._empty)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._signatures or task_id in self._empty
+
+
+def _require_numpy():
+    """Import NumPy for optional backends, with an actionable error if missing."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "This retrieval backend requires NumPy: "
+            "pip install epistemic-control-kernel[embeddings]"
+        ) from e
+    return numpy
+
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def embed_unit(np, embed_fn: EmbedFn, texts: List[str]):
+    """Embed texts and L2-normalise the rows (zero vectors stay zero)."""
+    vectors = np.asarray(embed_fn(list(texts)), dtype=np.float32)
+    if vectors.ndim != 2 or vectors.shape[0] != len(texts):
+        raise ValueError("embed_fn must return one vector per input text")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class QueryVectorCache:
+    """Bounded LRU of unit query vectors, so repeated queries skip embed_fn."""
+
+    def __init__(self, embed: Callable[[List[str]], object], max_entries: int = 256):
+        self._embed = embed
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, text: str):
+        vector = self._entries.get(text)
+        if vector is None:
+            vector = self._embed([text])[0]
+            self._entries[text] = vector
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(text)
+        return vector
+
+
+class EmbeddingIndex:
+    """
+    Cosine-similarity retrieval over user-supplied embeddings (requires NumPy).
+
+    embed_fn maps a list of texts to one vector per text, so backends can
+    batch. Vectors are L2-normalised and stored as rows of a contiguous,
+    preallocated float32 matrix that doubles when full; removed rows are
+    zeroed and reused. A query is one matrix-vector product over all rows.
+
+    Zero-magnitude vectors score 0.0 against everything (as utils.cosine_sim).
+    """
+
+    ranked = True  # search(limit=k) returns the k most similar matches
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        initial_capacity: int = 1024,
+        query_cache_size: int = 256,
+    ):
+        self._np = _require_numpy()
+        self.embed_fn = embed_fn
+        self._capacity = max(1, initial_capacity)
+        self._matrix = None  # allocated once the dimension is known
+        self._size = 0  # rows in use (including free rows below it)
+        self._row_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._query_cache = QueryVectorCache(self._embed, query_cache_size)
+
+    def _embed(self, texts: List[str]):
+        return embed_unit(self._np, self.embed_fn, texts)
+
+    def _allocate_row(self) -> int:
+        np = self._np
+        if self._free:
+            return self._free.pop()
+        if self._size == self._matrix.shape[0]:
+            grown = np.zeros((self._matrix.shape[0] * 2, self._matrix.shape[1]), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        self._size += 1
+        self._row_ids.append(None)
+        return self._size - 1
+
+    def add(self, task_id: str, text: str) -> None:
+        """Embed and index (or re-index) a task's text."""
+        self.add_many([(task_id, text)])
+
+    def add_many(self, items: Sequence[Tuple[str, str]]) -> None:
+        """Embed many (task_id, text) pairs with a single embed_fn call."""
+        if not items:
+            return
+        np = self._np
+        vectors = self._embed([text for _, text in items])
+
+        if self._matrix is None:
+            self._matrix = np.zeros((self._capacity, vectors.shape[1]), dtype=np.float32)
+        elif vectors.shape[1] != self._matrix.shape[1]:
+            raise ValueError("embed_fn returned vectors of inconsistent dimension")
+
+        for (task_id, _), vector in zip(items, vectors):
+            row = self._rows.get(task_id)
+            if row is None:
+                row = self._allocate_row()
+                self._rows[task_id] = row
+                self._row_ids[row] = task_id
+            self._matrix[row] = vector
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task from the index (no-op if absent)."""
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+        self._matrix[row] = 0.0
+        self._row_ids[row] = None
+        self._free.append(row)
+
+    def scores(self, text: str):
+        """Cosine similarity of text against every row (one matrix-vector product)."""
+        return self._matrix[: self._size] @ self._query_cache.get(text)
+
+    def search(
+        self,
+        text: str,
+        threshold: float,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return (task_id, cosine_similarity) for entries >= threshold.
+
+        With limit, only the `limit` most similar matches are returned
+        (argpartition, most similar first); otherwise order is unspecified.
+        """
+        if self._matrix is None or not self._rows:
+            return []
+        np = self._np
+        scores = self.scores(text)
+        if self._free:
+            scores[self._free] = -np.inf  # removed rows never match
+
+        if limit is None:
+            rows = np.flatnonzero(scores >= threshold)
+        else:
+            # Top-k over every live row first, then the threshold, so a low
+            # threshold still yields `limit` matches when that many exist
+            rows = np.arange(len(scores))
+            if limit < len(scores):
+                rows = np.argpartition(scores, -limit)[len(scores) - limit:]
+            rows = rows[scores[rows] >= threshold]
+            rows = rows[np.argsort(-scores[rows], kind="stable")]
+
+        return [(self._row_ids[row], float(scores[row])) for row in rows.tolist()]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._rows
+
+
+class TfidfIndex:
+    """
+    Pure-Python TF-IDF cosine retrieval over whitespace tokens (lnc.ltc weighting).
+
+    Each entry's sparse vector — log-scaled term frequencies, cosine-normalised —
+    is computed once at add() time and appended to per-token postings.
+    Document frequencies are maintained incrementally; IDF is applied to the
+    query side only, so stored vectors never need rewriting as the corpus grows.
+    A query accumulates dot products over the postings of its own tokens.
+
+    Removed or re-indexed entries leave dead postings behind; they are
+    skipped at query time and compacted once they outnumber live entries.
+
+    With use_numpy=True, postings are scored as zero-copy NumPy views of the
+    underlying arrays instead of Python loops.
+    """
+
+    ranked = True  # search(limit=k) returns the k most similar matches
+
+    def __init__(self, use_numpy: bool = False):
+        self._np = _require_numpy() if use_numpy else None
+        self._rows: Dict[str, int] = {}  # task_id → current row
+        self._row_ids: List[Optional[str]] = []  # row → task_id (None once dead)
+        self._row_terms: List[Tuple[str, ...]] = []
+        self._postings: Dict[str, Tuple[array, array]] = {}  # token → (rows, weights)
+        self._df: Counter = Counter()
+        self._dead = 0
+
+    @staticmethod
+    def _weights(text: str) -> Dict[str, float]:
+        counts = Counter(text.split())
+        weights = {term: 1.0 + math.log(tf) for term, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {term: w / norm for term, w in weights.items()}
+
+    def add(self, task_id: str, text: str) -> None:
+        """Index (or re-index) a task's text."""
+        self.remove(task_id)
+
+        weights = self._weights(text)
+        row = len(self._row_ids)
+        self._rows[task_id] = row
+        self._row_ids.append(task_id)
+        self._row_terms.append(tuple(weights))
+        for term, weight in weights.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array("q"), array("d"))
+            posting[0].append(row)
+            posting[1].append(weight)
+        self._df.update(weights.keys())
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task from the index (no-op if absent)."""
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+
+        self._row_ids[row] = None
+        self._df.subtract(self._row_terms[row])
+        self._dead += 1
+        if self._dead > max(len(self._rows), 1024):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rebuild postings without dead rows (renumbers rows)."""
+        renumber = {}
+        for row, task_id in enumerate(self._row_ids):
+            if task_id is not None:
+                renumber[row] = len(renumber)
+                self._rows[task_id] = renumber[row]
+
+        postings = {}
+        for term, (rows, weights) in self._postings.items():
+            live = [(renumber[r], w) for r, w in zip(rows, weights) if r in renumber]
+            if live:
+                postings[term] = (array("q", (r for r, _ in live)), array("d", (w for _, w in live)))
+
+        self._postings = postings
+        self._row_ids = [t for t in self._row_ids if t is not None]
+        self._row_terms = [
+            terms for row, terms in enumerate(self._row_terms) if row in renumber
+        ]
+        self._df = +self._df  # drop zero counts
+        self._dead = 0
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency: ln((1 + N) / (1 + df)) + 1."""
+        return math.log((1 + len(self._rows)) / (1 + self._df.get(term, 0))) + 1.0
+
+    def _query(self, text: str) -> Dict[str, float]:
+        counts = Counter(text.split())
+        weights = {term: (1.0 + math.log(tf)) * self.idf(term) for term, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {
+            term: w / norm for term, w in weights.items() if term in self._postings
+        } if norm else {}
+
+    def search(
+        self,
+        text: str,
+        threshold: float,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return (task_id, cosine_similarity) for entries >= threshold.
+
+        With limit, only the `limit` most similar matches are returned
+        (most similar first); otherwise order is unspecified.
+        A non-positive threshold admits entries with no shared tokens.
+        """
+        query = self._query(text)
+
+        if self._np is not None:
+            matches = self._accumulate_numpy(query, threshold)
+        else:
+            scores: Dict[int, float] = {}
+            for term, q in query.items():
+                rows, weights = self._postings[term]
+                for row, weight in zip(rows, weights):
+                    scores[row] = scores.get(row, 0.0) + q * weight
+            matches = [
+                (self._row_ids[row], score)
+                for row, score in scores.items()
+                if score >= threshold and self._row_ids[row] is not None
+            ]
+
+        if threshold <= 0:
+            matched = {task_id for task_id, _ in matches}
+            matches += [(task_id, 0.0) for task_id in self._rows if task_id not in matched]
+
+        if limit is not None:
+            matches = heapq.nlargest(limit, matches, key=lambda m: m[1])
+        return matches
+
+    def _accumulate_numpy(self, query: Dict[str, float], threshold: float) -> List[Tuple[str, float]]:
+        np = self._np
+        scores = np.zeros(len(self._row_ids))
+        for term, q in query.items():
+            rows, weights = self._postings[term]
+            # Rows are unique within a posting, so fancy-index += is safe
+            scores[np.frombuffer(rows, dtype=np.int64)] += q * np.frombuffer(weights)
+
+        hits = np.flatnonzero(scores >= max(threshold, np.finfo(float).tiny))
+        return [
+            (self._row_ids[row], float(scores[row]))
+            for row in hits.tolist()
+            if self._row_ids[row] is not None
+        ]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._rows
+
+
+def make_index(config: ECKConfig, embed_fn: Optional[EmbedFn] = None):
+    """Build the retrieval index selected by config.retrieval_backend."""
+    if config.retrieval_backend == "token":
+        return TokenIndex()
+    if config.retrieval_backend == "minhash":
+        return MinHashLSHIndex(num_perm=config.minhash_num_perm, bands=config.minhash_bands)
+    if config.retrieval_backend == "embedding":
+        if embed_fn is None:
+            raise ValueError("The embedding retrieval backend requires an embed_fn")
+        return EmbeddingIndex(embed_fn, initial_capacity=config.embedding_initial_capacity)
+    if config.retrieval_backend == "ivf":
+        if embed_fn is None or config.vector_index_path is None:
+            raise ValueError("The ivf retrieval backend requires an embed_fn and vector_index_path")
+        from .vector_index import MmapIVFIndex
+        return MmapIVFIndex(
+            config.vector_index_path,
+            embed_fn,
+            partitions=config.ivf_partitions,
+            probe=config.ivf_probe,
+            read_only=config.vector_index_read_only,
+        )
+    if config.retrieval_backend == "tfidf":
+        return TfidfIndex(use_numpy=config.tfidf_use_numpy)
+    raise ValueError(f"Unknown retrieval backend: {config.retrieval_backend}")
@@ -0,0 +1,221 @@
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set
+
+from .queue import ConcurrentTaskQueue
+from .prediction import build_prediction_context
+from .task import TaskState
+
+logger = logging.getLogger("eck-core")
+
+
+class ThreadedRunner:
+    """
+    Runs an ECKAgent's control cycles for several tasks at once on a thread pool.
+
+    The LLM phases of a task (prediction, execution, critic, goal check,
+    subtask generation) run concurrently with those of other tasks. All
+    agent state (WorldModel records, drift and feasibility signals, policy
+    upgrades, enqueues, cycle count) is changed under one lock, so updates
+    are serialized; each task is handled by one worker from start to end,
+    so its lifecycle records (PREDICTED, EXECUTED, final state) stay in
+    order. Drift is fed in completion order rather than pop order.
+
+    The agent's queue is wrapped in a ConcurrentTaskQueue, so other threads
+    can add work with submit() while run() is active. Phases are the same
+    ECKAgent helpers step() uses; a periodic checkpoint written while other
+    tasks are in flight saves them as queued, so a restore runs them again.
+    """
+
+    def __init__(self, agent, workers: Optional[int] = None, poll_interval: float = 0.1):
+        """
+        Args:
+            agent: ECKAgent to drive (its LLM callables must be thread-safe).
+            workers: Tasks in flight at once (default config.worker_threads).
+            poll_interval: Seconds between stop checks while waiting for tasks.
+        """
+        workers = agent.config.worker_threads if workers is None else workers
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+
+        self.agent = agent
+        self.workers = workers
+        self.poll_interval = poll_interval
+        if not isinstance(agent.queue, ConcurrentTaskQueue):
+            agent.queue = ConcurrentTaskQueue(agent.queue)
+        self.queue: ConcurrentTaskQueue = agent.queue
+
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self.completed = 0
+
+    @contextmanager
+    def _serialized(self):
+        """Exclusive access to agent state, memory writes in one batch."""
+        with self._lock, self.agent.memory.batch():
+            yield
+
+    def submit(self, task_texts: List[str]) -> None:
+        """Enqueue new tasks from any thread (recorded CREATED, deduplicated)."""
+        with self._serialized(), self.queue.mutex:
+            self.agent._enqueue_tasks(task_texts)
+
+    def stop(self) -> None:
+        """Stop dispatching; tasks already in flight finish."""
+        self._stopped.set()
+
+    def run(self, wait_for_tasks: bool = False) -> None:
+        """
+        Process tasks until halt, goal, max iterations or an empty queue.
+
+        With wait_for_tasks=True an empty queue does not end the run: it
+        waits for submit()ted tasks until stop() or queue.close() (after
+        close the remaining queued tasks are still processed).
+        Exceptions from a worker stop the run and are re-raised.
+        """
+        agent = self.agent
+        logger.info(f"Starting threaded ECK run ({self.workers} workers) with objective: {agent.objective}")
+        self._stopped.clear()
+        in_flight: Set[Future] = set()
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="eck-worker") as pool:
+            while not self._stopped.is_set():
+                if in_flight and (
+                    len(in_flight) >= self.workers
+                    or agent.cycles + len(in_flight) >= agent.config.max_iterations
+                ):
+                    error = self._reap(in_flight, block=True)
+                    if error is not None:
+                        break
+                    continue
+                if agent.cycles >= agent.config.max_iterations:
+                    break
+
+                error = self._reap(in_flight, block=False)
+                if error is not None:
+                    break
+
+                task = self._next_task(in_flight, wait_for_tasks)
+                if task is None:
+                    if self._stopped.is_set():
+                        break
+                    if in_flight or (wait_for_tasks and not self.queue.closed):
+                        continue
+                    logger.info("Task queue empty — nothing to do")
+                    break
+
+                in_flight.add(pool.submit(self._process, task))
+
+            # In-flight tasks always finish (their records are kept)
+            while in_flight:
+                error = self._reap(in_flight, block=True) or error
+
+        if error is not None:
+            raise error
+        logger.info(f"ECK run completed after {agent.cycles} cycles")
+
+    def _next_task(self, in_flight: Set[Future], wait_for_tasks: bool) -> Optional[Dict]:
+        """Pop the next task and record it PREDICTED (None: none available yet)."""
+        with self._serialized():
+            if not self.agent._policy_allows_cycle():
+                self._stopped.set()
+                return None
+
+        task = self.queue.pop()
+        if task is None:
+            if in_flight:
+                # A running task may still enqueue subtasks
+                wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                return None
+            if not wait_for_tasks:
+                return None
+            task = self.queue.pop(timeout=self.poll_interval)
+            if task is None:
+                return None
+
+        with self._serialized():
+            self.agent._in_flight[task["id"]] = task
+            self.agent._record(task["id"], task["text"], "", "", False, "", TaskState.PREDICTED)
+        return task
+
+    def _reap(self, in_flight: Set[Future], block: bool) -> Optional[BaseException]:
+        """Remove finished futures; return the first worker exception, if any."""
+        if block:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        else:
+            done = {future for future in in_flight if future.done()}
+        in_flight.difference_update(done)
+        for future in done:
+            if future.exception() is not None:
+                self._stopped.set()
+                return future.exception()
+        return None
+
+    def _process(self, task: Dict) -> None:
+        """One control cycle for a popped task (the phases of ECKAgent.step())."""
+        try:
+            self._cycle(task)
+        finally:
+            with self._lock:
+                self.agent._in_flight.pop(task["id"], None)
+
+    def _cycle(self, task: Dict) -> None:
+        agent = self.agent
+        task_id = task["id"]
+        task_text = task["text"]
+
+        # 1. Prediction (memory is read under the lock, the LLM call is not)
+        with self._lock:
+            memory_context = build_prediction_context(task_text, agent.objective, agent.memory, agent.config)
+        prediction = agent._predict(task_text, memory_context)
+
+        # 2. Execution (policy-gated)
+        with self._lock:
+            executed, recommended_breadth = agent._execution_decision()
+        outcome = agent._execute(task_text, executed)
+
+        with self._serialized():
+            agent._record(task_id, task_text, prediction, outcome, False, "", TaskState.EXECUTED)
+
+        # 3. Critic (fused or local verdicts as in ECKAgent.step())
+        local = agent._local_verdict(executed, outcome)
+        with self._lock:
+            fused_subtasks = agent._fused_subtask_limit(local)
+        success, feedback, error, final_state, fused = agent._evaluate(
+            task_text, prediction, outcome, local, fused_subtasks,
+        )
+
+        # 4. Final record + drift tracking (serialized, completion order)
+        with self._serialized():
+            agent._record(task_id, task_text, prediction, outcome, success, feedback, final_state)
+            if final_state != TaskState.DEFERRED:
+                if not agent._track_drift(error, prediction, outcome, success):
+                    self._stopped.set()
+                    return
+
+        # 5. Goal check
+        if agent._check_goal(outcome, local, fused):
+            self._stopped.set()
+            return
+
+        # 6. Subtask generation (policy-gated, throttled by queue backpressure;
+        #    skipped once stopping or closed)
+        max_subtasks = None
+        with self._lock:
+            if not (self._stopped.is_set() or self.queue.closed):
+                max_subtasks = agent._subtask_request(recommended_breadth, fused)
+        if max_subtasks is not None:
+            subtasks = agent._subtasks_for(task_text, fused, max_subtasks)
+            with self._serialized(), self.queue.mutex:
+                if not self.queue.closed:
+                    agent._enqueue_tasks(subtasks)
+
+        # 7. Cycle count + periodic guard (a checkpoint written here keeps
+        #    the other in-flight tasks queued, see ECKAgent._in_flight)
+        with self._serialized(), self.queue.mutex:
+            agent._in_flight.pop(task_id, None)
+            agent._end_cycle()
+            self.completed += 1
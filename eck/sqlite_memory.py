@@ -0,0 +1,502 @@
+import json
+import sqlite3
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .task import TaskState
+from .utils import score_memory_entry
+from .models import TaskId, datetime_to_ns, now_ns, ns_to_datetime
+from .retrieval import jaccard, tokenize
+from .context_cache import ContextCache
+from .config import PolicyMode, ECKConfig
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id PRIMARY KEY,  -- no affinity: integer and string ids are kept as given
+    task TEXT NOT NULL,
+    state TEXT NOT NULL,
+    prediction TEXT,
+    outcome TEXT,
+    success INTEGER,
+    feedback TEXT,
+    timestamp_ns INTEGER NOT NULL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks(state);
+CREATE INDEX IF NOT EXISTS tasks_timestamp ON tasks(timestamp_ns);
+CREATE INDEX IF NOT EXISTS tasks_success ON tasks(success);
+
+-- Next unreserved integer task id (one row), shared by all writers
+CREATE TABLE IF NOT EXISTS task_ids (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    next_id INTEGER NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    task, content='tasks', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, task) VALUES (new.rowid, new.task);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, task) VALUES ('delete', old.rowid, old.task);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF task ON tasks
+WHEN old.task IS NOT new.task BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, task) VALUES ('delete', old.rowid, old.task);
+    INSERT INTO tasks_fts(rowid, task) VALUES (new.rowid, new.task);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO tasks (task_id, task, state, prediction, outcome, success, feedback, timestamp_ns, metadata)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(task_id) DO UPDATE SET
+    task = excluded.task, state = excluded.state, prediction = excluded.prediction,
+    outcome = excluded.outcome, success = excluded.success, feedback = excluded.feedback,
+    timestamp_ns = excluded.timestamp_ns, metadata = excluded.metadata
+"""
+
+_COLUMNS = "task_id, task, state, prediction, outcome, success, feedback, timestamp_ns, metadata"
+
+# Newest first; ties keep first-record order (rowid is assigned on first insert)
+_RECENCY = "ORDER BY timestamp_ns DESC, rowid ASC"
+
+
+def _row_to_entry(row: Tuple) -> Dict[str, Any]:
+    _, task, state, prediction, outcome, success, feedback, timestamp_ns, metadata = row
+    entry = {
+        "task": task,
+        "state": state,
+        "prediction": prediction,
+        "outcome": outcome,
+        "success": None if success is None else bool(success),
+        "feedback": feedback,
+        "timestamp": ns_to_datetime(timestamp_ns).isoformat(),
+    }
+    if metadata is not None:
+        entry["metadata"] = json.loads(metadata)
+    return entry
+
+
+def _fts_query(task_text: str) -> Optional[str]:
+    """OR of the query's tokens as quoted FTS5 phrases (None if nothing is searchable)."""
+    phrases = [
+        '"' + token.replace('"', '""') + '"'
+        for token in tokenize(task_text)
+        if any(c.isalnum() for c in token)
+    ]
+    return " OR ".join(sorted(phrases)) or None
+
+
+class SQLiteWorldModel:
+    """
+    Persistent WorldModel on stdlib sqlite3, shareable by several processes.
+
+    Same Python API as WorldModel (record/get/get_recent/get_similar/
+    retrieve_similar/retrieve_scored/…), so build_prediction_context works
+    unchanged. The database runs in WAL mode: readers never block the writer.
+
+    Writes are buffered inside batch() and committed in one transaction when
+    the batch ends — or earlier, when a read needs them (read-your-writes).
+    Outside batch() each record() commits on its own.
+
+    Rows are keyed by task id, so writers sharing a database must not reuse
+    ids: agents draw integer ids from blocks handed out by reserve_task_ids().
+
+    Similarity candidates come from an FTS5 index over task text, ranked by
+    BM25 and capped at fts_candidate_limit; the exact word-overlap threshold is
+    then applied to those candidates only. Recency ordering happens in SQL and
+    is streamed, so a query stops reading once it has enough matches.
+    FTS tokens are case-folded and split on punctuation; a shared token made
+    only of punctuation is not a candidate source.
+
+    config.retrieval_backend does not apply (FTS5 is the index).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        config: ECKConfig = None,
+        fts_candidate_limit: Optional[int] = 1000,
+        timeout: float = 30.0,
+    ):
+        self.config = config or ECKConfig()
+        self.path = path
+        self.fts_candidate_limit = fts_candidate_limit
+
+        self._db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None,
+            check_same_thread=False,  # callers serialize access (see ThreadedRunner)
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        self._pending: Dict[TaskId, Tuple] = {}
+        self._batch_depth = 0
+        self.transactions = 0
+
+        # Change counter: local record() calls plus commits seen from other connections
+        self._version = 0
+        self._data_version = self._data_version_now()
+
+        # Other processes may write at any time, so cached contexts are only
+        # valid at the exact version they were built at (no targeted invalidation)
+        self.context_cache: Optional[ContextCache] = None
+        if self.config.enable_context_cache:
+            self.context_cache = ContextCache(self.config.context_cache_max_entries)
+
+        # Retrieval here is exact over FTS candidates; kept for API parity
+        self.recall_samples: int = 0
+        self.recall_total: float = 0.0
+
+    # -- writes ----------------------------------------------------------
+
+    def record(
+        self,
+        task_id: TaskId,
+        task_text: str,
+        prediction: str,
+        outcome: str,
+        success: bool,
+        feedback: str,
+        state: TaskState = TaskState.CREATED,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record a task's execution data (same contract as WorldModel.record)."""
+        if metadata is not None:
+            if not isinstance(metadata, dict):
+                raise TypeError("metadata must be a dict if provided")
+            metadata = json.dumps(metadata)
+
+        self._version += 1
+        self._pending[task_id] = (
+            task_id, task_text, state.value, prediction, outcome,
+            None if success is None else int(bool(success)),
+            feedback, now_ns(), metadata,
+        )
+        if not self._batch_depth:
+            self._flush()
+
+    def reserve_task_ids(self, count: int, at_least: int = 1) -> int:
+        """
+        Reserve `count` consecutive integer task ids for this writer; returns the first.
+
+        Reservations are serialized by a write transaction, so writers of one
+        database get disjoint ranges. The first reservation of a database
+        starts after its largest recorded integer id.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT next_id FROM task_ids").fetchone()
+            if row is None:
+                (last,) = self._db.execute(
+                    "SELECT MAX(task_id) FROM tasks WHERE typeof(task_id) = 'integer'"
+                ).fetchone()
+                row = (1 if last is None else last + 1,)
+            start = max(row[0], at_least)
+            self._db.execute("INSERT OR REPLACE INTO task_ids (id, next_id) VALUES (0, ?)", (start + count,))
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+        return start
+
+    def _data_version_now(self) -> int:
+        return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    @property
+    def version(self) -> int:
+        """Monotonic change counter (bumped by commits from other connections too)."""
+        data_version = self._data_version_now()
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._version += 1
+        return self._version
+
+    @contextmanager
+    def batch(self):
+        """Group record() calls into one transaction (nesting is allowed)."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany(_UPSERT, self._pending.values())
+            self._db.execute("COMMIT")
+        except BaseException:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            raise  # the rows stay pending for the next flush
+        self._pending.clear()
+        self.transactions += 1
+
+    def _query(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        self._flush()
+        return self._db.execute(sql, params)
+
+    # -- point and recency reads -------------------------------------------
+
+    def get(self, task_id: TaskId) -> Optional[Dict[str, Any]]:
+        """Retrieve data for a specific task by ID, or None if not found."""
+        row = self._query(f"SELECT {_COLUMNS} FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return _row_to_entry(row) if row is not None else None
+
+    def get_recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the most recent tasks (newest first)."""
+        rows = self._query(f"SELECT {_COLUMNS} FROM tasks {_RECENCY} LIMIT ?", (limit,))
+        return [_row_to_entry(row) for row in rows]
+
+    def max_int_id(self) -> Optional[int]:
+        """Largest integer task id in the database (None if none)."""
+        return self._query("SELECT MAX(task_id) FROM tasks WHERE typeof(task_id) = 'integer'").fetchone()[0]
+
+    def view(self, task_id: TaskId) -> Optional[Mapping]:
+        """Read-only snapshot of a task's record, or None if not found."""
+        entry = self.get(task_id)
+        return MappingProxyType(entry) if entry is not None else None
+
+    def tasks_view(self) -> "SQLiteTasksView":
+        """Read-only lazy Mapping of the whole history (rows are read on access)."""
+        return SQLiteTasksView(self)
+
+    def iter_tasks(
+        self,
+        since: Optional[Union[datetime, int]] = None,
+        state: Optional[Union[TaskState, str]] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Tuple[TaskId, Mapping]]:
+        """Stream (task_id, snapshot) pairs in recorded order, filtered in SQL."""
+        if isinstance(since, datetime):
+            since = datetime_to_ns(since)
+        if isinstance(state, TaskState):
+            state = state.value
+
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("timestamp_ns >= ?")
+            params.append(since)
+        if state is not None:
+            clauses.append("state = ?")
+            params.append(state)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = _RECENCY if newest_first else "ORDER BY timestamp_ns ASC, rowid ASC"
+
+        for row in self._query(f"SELECT {_COLUMNS} FROM tasks {where} {order}", tuple(params)):
+            yield row[0], MappingProxyType(_row_to_entry(row))
+
+    def all_tasks(self) -> Dict[TaskId, Dict[str, Any]]:
+        """Return a copy of the entire task history with serialized timestamps."""
+        rows = self._query(f"SELECT {_COLUMNS} FROM tasks ORDER BY timestamp_ns ASC, rowid ASC")
+        return {row[0]: _row_to_entry(row) for row in rows}
+
+    def _fetch(self, task_ids: List[TaskId]) -> Dict[TaskId, Dict[str, Any]]:
+        if not task_ids:
+            return {}
+        marks = ", ".join("?" * len(task_ids))
+        rows = self._query(f"SELECT {_COLUMNS} FROM tasks WHERE task_id IN ({marks})", tuple(task_ids))
+        return {row[0]: _row_to_entry(row) for row in rows}
+
+    # -- similarity --------------------------------------------------------
+
+    def _matches(self, task_text: str, threshold: float) -> Iterator[Tuple[TaskId, float, bool]]:
+        """Stream (task_id, similarity, success) for matches, newest first."""
+        if threshold <= 0:
+            rows = self._query(f"SELECT task_id, task, success FROM tasks {_RECENCY}")
+        else:
+            match = _fts_query(task_text)
+            if match is None:
+                return
+            limit = -1 if self.fts_candidate_limit is None else self.fts_candidate_limit
+            rows = self._query(
+                "SELECT task_id, task, success FROM tasks WHERE rowid IN ("
+                " SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ? ORDER BY rank LIMIT ?"
+                f") {_RECENCY}",
+                (match, limit),
+            )
+
+        query = tokenize(task_text)
+        try:
+            for task_id, past_text, success in rows:
+                tokens = tokenize(past_text)
+                if not (query | tokens):
+                    continue  # Avoid division by zero
+                similarity = jaccard(query, tokens)
+                if similarity >= threshold:
+                    yield task_id, similarity, bool(success)
+        finally:
+            rows.close()  # callers may stop early
+
+    def _recent_matches(
+        self,
+        task_text: str,
+        threshold: float,
+        window: int,
+        prefer_failures: bool,
+    ) -> List[Tuple[TaskId, float, bool]]:
+        """The `window` most recent matches; failures first when preferred."""
+        recent = []
+        matches = self._matches(task_text, threshold)
+        for match in matches:
+            recent.append(match)
+            if len(recent) >= window:
+                break
+        matches.close()
+        if prefer_failures:
+            recent = [m for m in recent if not m[2]] + [m for m in recent if m[2]]
+        return recent
+
+    def get_similar(
+        self,
+        task_text: str,
+        threshold: float = 0.7,
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Return the most recent `limit` tasks with similarity >= threshold."""
+        ids = [m[0] for m in self._recent_matches(task_text, threshold, limit, False)]
+        entries = self._fetch(ids)
+        return [entries[task_id] for task_id in ids]
+
+    def peek_similar(
+        self,
+        task_text: str,
+        threshold: float = 0.7,
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Same as get_similar() (this backend keeps no hit or recall statistics)."""
+        return self.get_similar(task_text, threshold, limit)
+
+    def retrieve_similar(
+        self,
+        task_text: str,
+        *,
+        threshold: float = 0.7,
+        limit: int = 5,
+        prefer_failures: bool = False,
+        peek: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Same ordering contract as WorldModel.retrieve_similar() (peek changes nothing here)."""
+        ids = [m[0] for m in self._recent_matches(task_text, threshold, limit * 2, prefer_failures)][:limit]
+        entries = self._fetch(ids)
+        return [entries[task_id] for task_id in ids]
+
+    def retrieve_scored(
+        self,
+        task_text: str,
+        policy_mode: PolicyMode,
+        config: ECKConfig,
+        *,
+        threshold: float = 0.7,
+        limit: int = 5,
+        prefer_failures: bool = False,
+        rank_all_matches: bool = False,
+        unified_similarity: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Same ranking contract and options as WorldModel.retrieve_scored()."""
+        if policy_mode == PolicyMode.HALT:
+            return []
+
+        if rank_all_matches:
+            candidates = list(self._matches(task_text, threshold))
+        else:
+            candidates = self._recent_matches(task_text, threshold, limit * 4, prefer_failures)[: limit * 2]
+
+        texts = {}
+        if not unified_similarity:
+            ids = [m[0] for m in candidates]
+            texts = {task_id: entry["task"] for task_id, entry in self._fetch(ids).items()}
+
+        scored = []
+        for position, (task_id, similarity, success) in enumerate(candidates):
+            score = score_memory_entry(
+                entry={"task": texts.get(task_id, ""), "success": success},
+                current_task=task_text,
+                policy_mode=policy_mode,
+                config=config,
+                similarity=similarity if unified_similarity else None,
+            )
+            if score > 0:
+                if rank_all_matches:
+                    # Candidates arrive newest first; ties: failures first when preferred
+                    tie_break = (prefer_failures and not success, -position)
+                else:
+                    tie_break = -position
+                scored.append((score, tie_break, task_id))
+
+        scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+        top = scored[:limit]
+        entries = self._fetch([task_id for _, _, task_id in top])
+        return [dict(entries[task_id], score=score) for score, _, task_id in top]
+
+    def measure_recall(self, task_text: str, threshold: float = 0.7) -> float:
+        """Fraction of exact word-overlap matches found via FTS candidates (full scan)."""
+        query = tokenize(task_text)
+        exact = set()
+        for task_id, past_text in self._query("SELECT task_id, task FROM tasks"):
+            tokens = tokenize(past_text)
+            if (query | tokens) and jaccard(query, tokens) >= threshold:
+                exact.add(task_id)
+        if not exact:
+            return 1.0
+        found = {m[0] for m in self._matches(task_text, threshold)}
+        return len(exact & found) / len(exact)
+
+    def recall_stats(self) -> Dict[str, float]:
+        """Sampled recall (not sampled for this backend)."""
+        return {"samples": self.recall_samples, "mean_recall": 1.0}
+
+    def history(self, task_id: TaskId) -> List:
+        raise ValueError("Task history is not kept by SQLiteWorldModel")
+
+    def close(self) -> None:
+        """Commit pending writes and close the connection."""
+        if self._db is not None:
+            self._flush()
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        """Number of recorded tasks."""
+        return self._query("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def __contains__(self, task_id: TaskId) -> bool:
+        return self._query("SELECT 1 FROM tasks WHERE task_id = ?", (task_id,)).fetchone() is not None
+
+    def __repr__(self) -> str:
+        return f"SQLiteWorldModel({self.path!r}, {len(self)} tasks recorded)"
+
+
+class SQLiteTasksView(Mapping):
+    """Read-only lazy Mapping of task_id → snapshot over a SQLiteWorldModel."""
+
+    def __init__(self, model: SQLiteWorldModel):
+        self._model = model
+
+    def __getitem__(self, task_id: TaskId) -> Mapping:
+        view = self._model.view(task_id)
+        if view is None:
+            raise KeyError(task_id)
+        return view
+
+    def __iter__(self) -> Iterator[TaskId]:
+        for (task_id,) in self._model._query("SELECT task_id FROM tasks ORDER BY timestamp_ns, rowid"):
+            yield task_id
+
+    def __len__(self) -> int:
+        return len(self._model)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._model
@@ -1,7 +1,7 @@
-from typing import Callable, List
+from typing import Awaitable, Callable, List, Sequence
 
 from .prompts import format_prompt, SUBTASK_GENERATION_PROMPT
-from .utils import safe_parse_json_array
+from .utils import call_batch, safe_parse_json_array
 
 def generate_subtasks(
     current_task: str,
@@ -24,16 +24,59 @@ def generate_subtasks(
     Returns:
         List of cleaned subtask strings (empty list if no subtasks needed or parsing fails).
     """
-    prompt = format_prompt(
+    prompt = build_subtask_prompt(current_task, objective)
+    return _clean_subtasks(llm_call(prompt), max_subtasks)
+
+
+async def generate_subtasks_async(
+    current_task: str,
+    objective: str,
+    llm_call: Callable[[str], Awaitable[str]],
+    max_subtasks: int = 5,
+) -> List[str]:
+    """
+    Async counterpart of generate_subtasks() for awaitable LLM callables.
+
+    Same prompt, same parsing, same cap.
+    """
+    prompt = build_subtask_prompt(current_task, objective)
+    return _clean_subtasks(await llm_call(prompt), max_subtasks)
+
+
+def generate_subtasks_batch(
+    current_tasks: Sequence[str],
+    objective: str,
+    llm_batch_call: Callable[[List[str]], List[str]],
+    max_subtasks: int = 5,
+) -> List[List[str]]:
+    """
+    Batched counterpart of generate_subtasks(): one provider call for all tasks.
+
+    Returns one subtask list per current task, in the same order.
+    """
+    prompts = [build_subtask_prompt(task, objective) for task in current_tasks]
+    return [
+        _clean_subtasks(response, max_subtasks)
+        for response in call_batch(llm_batch_call, prompts)
+    ]
+
+
+def build_subtask_prompt(current_task: str, objective: str) -> str:
+    """Format the subtask generation prompt."""
+    return format_prompt(
         SUBTASK_GENERATION_PROMPT,
         objective=objective,
         current_task=current_task
     )
 
-    raw_response = llm_call(prompt).strip()
 
-    subtasks = safe_parse_json_array(raw_response)
+def _clean_subtasks(raw_response: str, max_subtasks: int) -> List[str]:
+    """Parse and clean a raw subtask response (pessimistic: [] on failure)."""
+    return clean_subtask_list(safe_parse_json_array(raw_response.strip()), max_subtasks)
+
 
+def clean_subtask_list(subtasks: List[str], max_subtasks: int) -> List[str]:
+    """Normalize whitespace, drop empty entries and enforce the max_subtasks cap."""
     # Defensive cleanup: strip whitespace, drop empty/whitespace-only entries
     cleaned_subtasks = [
         ' '.join(sub.strip().split())  # normalize internal whitespace
@@ -2,7 +2,7 @@ import uuid
 import logging
 import math
 import json
-from typing import List, Any, Dict
+from typing import Callable, List, Any, Dict, Optional, Sequence
 
 from .config import PolicyMode, ECKConfig
 
@@ -45,6 +45,27 @@ def cosine_sim(a: List[float], b: List[float]) -> float:
     return dot / (mag_a * mag_b)
 
 
+def call_batch(
+    llm_batch_call: Callable[[List[str]], List[str]],
+    prompts: Sequence[str],
+) -> List[str]:
+    """
+    Invoke a batched LLM callable, enforcing one response per prompt.
+
+    Returns an empty list without calling the backend when prompts is empty.
+    Raises ValueError if the backend returns a different number of responses.
+    """
+    if not prompts:
+        return []
+
+    responses = list(llm_batch_call(list(prompts)))
+    if len(responses) != len(prompts):
+        raise ValueError(
+            f"Batched LLM call returned {len(responses)} responses for {len(prompts)} prompts"
+        )
+    return responses
+
+
 def safe_parse_json_array(response: str) -> List[str]:
     """
     Safely parse a JSON array string from LLM output.
@@ -97,21 +118,25 @@ def score_memory_entry(
     current_task: str,
     policy_mode: PolicyMode,
     config: ECKConfig,
+    similarity: Optional[float] = None,
 ) -> float:
     """
     Compute a scalar relevance score for a past task entry.
 
     Pure function: no side effects, no memory mutation.
+    A precomputed similarity (e.g. from the retrieval backend) replaces the
+    default lowercase word-overlap similarity.
     """
-    current_words = set(current_task.lower().split())
-    past_text = entry.get("task", "")
-    past_words = set(past_text.lower().split())
-    union = current_words | past_words
-
-    if not union:
-        similarity = 0.0
-    else:
-        similarity = len(current_words & past_words) / len(union)
+    if similarity is None:
+        current_words = set(current_task.lower().split())
+        past_text = entry.get("task", "")
+        past_words = set(past_text.lower().split())
+        union = current_words | past_words
+
+        if not union:
+            similarity = 0.0
+        else:
+            similarity = len(current_words & past_words) / len(union)
 
     success = entry.get("success", False)
     severity = 1.0 if success else 2.0
@@ -0,0 +1,346 @@
+import os
+import mmap
+import struct
+import hashlib
+import logging
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .retrieval import EmbedFn, EmbeddingIndex, QueryVectorCache, _require_numpy, embed_unit
+
+logger = logging.getLogger("eck-core")
+
+
+_MAGIC = b"ECKV"
+_VERSION = 2  # 2: string keys only, text digest per record
+_HEADER = struct.Struct("<4sII4x")  # magic, version, dim (16 bytes)
+_KEY_BYTES = 64
+
+# Partition markers stored in a record
+_UNASSIGNED = -1  # appended before the partitions were trained
+_TOMBSTONE = -2  # removal of the key
+
+
+class MmapIVFIndex:
+    """
+    Persistent cosine-similarity index in an append-only, memory-mapped file.
+
+    File layout: a 16-byte header, then fixed-size records of
+    (key, text digest, partition, unit float32 vector). Keys are strings of
+    up to 64 bytes and must be unique across every process sharing the
+    file, so per-process integer task ids are never stored: WorldModel
+    indexes an integer id under a key qualified by its index_owner (the id
+    of its event log, kept across restarts and shared with readers of the
+    log). Re-indexing or removing a
+    key appends a newer record; the latest record per key wins.
+
+    Vectors are read straight from the mapping, so several processes that
+    open the same file share its pages through the OS page cache.
+    Opened with read_only=True, an index never writes; it picks up records
+    appended by the (single) writer on the next search(). Its own add()s
+    are kept in an in-memory EmbeddingIndex that is searched alongside the
+    file (and shadows the file's record for the same key).
+
+    Retrieval is IVF-style: once `partitions * train_factor` vectors exist,
+    the writer trains coarse centroids (spherical k-means) and stores them
+    next to the file (`<path>.centroids`). From then on each record carries
+    its partition, and a query scores only the `probe` partitions whose
+    centroids are closest to it. Results are therefore approximate.
+
+    Requires NumPy (the `embeddings` extra).
+    """
+
+    shared = True  # keys are global: callers map their task ids (see WorldModel)
+    ranked = True  # search(limit=k) returns the k most similar matches
+
+    def __init__(
+        self,
+        path: str,
+        embed_fn: EmbedFn,
+        partitions: int = 64,
+        probe: int = 4,
+        read_only: bool = False,
+        train_factor: int = 8,
+        seed: int = 1,
+    ):
+        if partitions < 1 or not 1 <= probe <= partitions:
+            raise ValueError("MmapIVFIndex requires 1 <= probe <= partitions")
+
+        self._np = _require_numpy()
+        self.path = path
+        self.embed_fn = embed_fn
+        self.partitions = partitions
+        self.probe = probe
+        self.read_only = read_only
+        self.train_size = partitions * train_factor
+        self.seed = seed
+
+        self._dim: Optional[int] = None
+        self._dtype = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._table = None
+        self._count = 0  # records read so far
+
+        self._rows: Dict[str, int] = {}  # key → latest live row
+        self._row_ids: List[str] = []
+        self._members: Dict[int, array] = {}  # partition → rows (may include dead rows)
+        self._alive = bytearray()
+        self._centroids = None
+
+        self._query_cache = QueryVectorCache(self._embed)
+        self._writer = None
+
+        # Read-only: this process's own entries (key → text digest alongside)
+        self._local = EmbeddingIndex(embed_fn) if read_only else None
+        self._local_digests: Dict[str, int] = {}
+        self.refresh()
+
+    @property
+    def centroids_path(self) -> str:
+        return self.path + ".centroids"
+
+    def _embed(self, texts: List[str]):
+        return embed_unit(self._np, self.embed_fn, texts)
+
+    def _set_dim(self, dim: int) -> None:
+        np = self._np
+        self._dim = dim
+        self._dtype = np.dtype([
+            ("key", f"S{_KEY_BYTES}"),
+            ("digest", "<u8"),  # text_digest() of the indexed text
+            ("partition", "<i4"),
+            ("vector", "<f4", (dim,)),
+        ])
+
+    def refresh(self) -> None:
+        """Map records appended since the last call (and centroids, once trained)."""
+        np = self._np
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return
+        if size < _HEADER.size:
+            return
+
+        if self._dim is None:
+            with open(self.path, "rb") as f:
+                magic, version, dim = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{self.path} is not a version {_VERSION} ECK vector index")
+            self._set_dim(dim)
+
+        count = (size - _HEADER.size) // self._dtype.itemsize
+        if count > self._count:
+            # The previous mapping is released once no views of it remain
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._table = np.frombuffer(
+                self._mmap, dtype=self._dtype, count=count, offset=_HEADER.size
+            )
+            self._index_records(self._count, count)
+
+        if self._centroids is None and os.path.exists(self.centroids_path):
+            self._load_centroids(np.load(self.centroids_path))
+
+    def _index_records(self, start: int, stop: int) -> None:
+        """Apply records [start, stop) to the in-memory row bookkeeping."""
+        keys = self._table["key"][start:stop].tolist()
+        partitions = self._table["partition"][start:stop].tolist()
+        for row, (raw_key, partition) in enumerate(zip(keys, partitions), start):
+            key = raw_key.decode("utf-8")
+            previous = self._rows.pop(key, None)
+            if previous is not None:
+                self._alive[previous] = 0
+
+            self._row_ids.append(key)
+            if partition == _TOMBSTONE:
+                self._alive.append(0)
+                continue
+
+            self._alive.append(1)
+            self._rows[key] = row
+            if partition == _UNASSIGNED and self._centroids is not None:
+                partition = self._assign(self._table["vector"][row : row + 1])[0]
+            self._members.setdefault(partition, array("q")).append(row)
+        self._count = stop
+
+    def _assign(self, vectors):
+        return (vectors @ self._centroids.T).argmax(axis=1).tolist()
+
+    def _load_centroids(self, centroids) -> None:
+        """Adopt trained centroids and move unassigned rows into partitions."""
+        self._centroids = centroids.astype(self._np.float32)
+        unassigned = self._members.pop(_UNASSIGNED, array("q"))
+        if not len(unassigned):
+            return
+        rows = self._np.frombuffer(unassigned, dtype=self._np.int64)
+        for row, partition in zip(unassigned, self._assign(self._table["vector"][rows])):
+            self._members.setdefault(partition, array("q")).append(row)
+
+    def _train(self) -> None:
+        """Spherical k-means over the live vectors; writes <path>.centroids."""
+        np = self._np
+        rows = np.fromiter(self._rows.values(), dtype=np.int64)
+        vectors = self._table["vector"][rows]
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(len(vectors), self.partitions, replace=False)]
+
+        for _ in range(10):
+            labels = (vectors @ centroids.T).argmax(axis=1)
+            for k in range(self.partitions):
+                members = vectors[labels == k]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm:
+                        centroids[k] = centroid / norm
+
+        tmp = self.centroids_path + ".tmp.npy"
+        np.save(tmp, centroids)
+        os.replace(tmp, self.centroids_path)  # readers never see a partial file
+        self._load_centroids(centroids)
+        logger.info(f"Trained {self.partitions} IVF partitions over {len(vectors)} vectors")
+
+    def _append(self, records) -> None:
+        if self.read_only:
+            raise TypeError("MmapIVFIndex opened read-only")
+        if self._writer is None:
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._writer = open(self.path, "ab")
+            if new:
+                self._writer.write(_HEADER.pack(_MAGIC, _VERSION, self._dim))
+        self._writer.write(records.tobytes())
+        self._writer.flush()
+        self.refresh()
+
+    def _fill_keys(self, records, keys: List[str]) -> None:
+        raw_keys = []
+        for key in keys:
+            if not isinstance(key, str):
+                raise TypeError(f"MmapIVFIndex keys must be globally unique strings, not {key!r}")
+            raw = key.encode("utf-8")
+            if len(raw) > _KEY_BYTES:
+                raise ValueError(f"Key longer than {_KEY_BYTES} bytes: {key!r}")
+            raw_keys.append(raw)
+        records["key"] = raw_keys
+
+    def holds(self, key: str, text: str) -> bool:
+        """True if key's latest live record was indexed from exactly this text."""
+        if key in self._local_digests:
+            return self._local_digests[key] == text_digest(text)
+        row = self._rows.get(key)
+        return row is not None and int(self._table["digest"][row]) == text_digest(text)
+
+    def add(self, key: str, text: str) -> None:
+        """Embed and append a vector for key (kept in memory when read-only)."""
+        self.add_many([(key, text)])
+
+    def add_many(self, items: List[Tuple[str, str]]) -> None:
+        """Embed many (key, text) pairs with one embed_fn call and append them."""
+        if not items:
+            return
+        if self.read_only:
+            self._local.add_many(items)
+            for key, text in items:
+                self._local_digests[key] = text_digest(text)
+            return
+        vectors = self._embed([text for _, text in items])
+        if self._dim is None:
+            self._set_dim(vectors.shape[1])
+        elif vectors.shape[1] != self._dim:
+            raise ValueError("embed_fn returned vectors of inconsistent dimension")
+
+        records = self._np.zeros(len(items), dtype=self._dtype)
+        self._fill_keys(records, [key for key, _ in items])
+        records["digest"] = [text_digest(text) for _, text in items]
+        records["vector"] = vectors
+        records["partition"] = (
+            self._assign(vectors) if self._centroids is not None else _UNASSIGNED
+        )
+        self._append(records)
+
+        if self._centroids is None and len(self._rows) >= self.train_size:
+            self._train()
+
+    def remove(self, key: str) -> None:
+        """Append a tombstone for key (no-op if absent; in memory when read-only)."""
+        if self.read_only:
+            self._local.remove(key)
+            self._local_digests.pop(key, None)
+            return
+        if key not in self._rows:
+            return
+        records = self._np.zeros(1, dtype=self._dtype)
+        self._fill_keys(records, [key])
+        records["partition"] = _TOMBSTONE
+        self._append(records)
+
+    def _candidate_rows(self, query):
+        np = self._np
+        if self._centroids is None:
+            groups = list(self._members.values())
+        else:
+            nearest = np.argsort(-(self._centroids @ query))[: self.probe].tolist()
+            groups = [self._members[k] for k in nearest if k in self._members]
+        if not groups:
+            return np.empty(0, dtype=np.int64)
+        rows = np.concatenate([np.frombuffer(g, dtype=np.int64) for g in groups])
+        return rows[np.frombuffer(self._alive, dtype=np.uint8)[rows].astype(bool)]
+
+    def search(
+        self,
+        text: str,
+        threshold: float,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Return (key, cosine_similarity) for probed entries >= threshold.
+
+        With limit, only the `limit` most similar matches are returned
+        (most similar first); otherwise order is unspecified.
+        """
+        matches = self._search_file(text, threshold, limit)
+        if not self._local_digests:
+            return matches
+        matches = [m for m in matches if m[0] not in self._local_digests]
+        matches += self._local.search(text, threshold, limit)
+        if limit is not None:
+            matches = sorted(matches, key=lambda m: -m[1])[:limit]
+        return matches
+
+    def _search_file(self, text: str, threshold: float, limit: Optional[int]) -> List[Tuple[str, float]]:
+        self.refresh()
+        if not self._rows:
+            return []
+
+        np = self._np
+        query = self._query_cache.get(text)
+        rows = self._candidate_rows(query)
+        scores = self._table["vector"][rows] @ query
+
+        keep = np.flatnonzero(scores >= threshold)
+        if limit is not None:
+            if len(keep) > limit:
+                keep = keep[np.argpartition(scores[keep], -limit)[-limit:]]
+            keep = keep[np.argsort(-scores[keep], kind="stable")]
+
+        return [(self._row_ids[rows[i]], float(scores[i])) for i in keep.tolist()]
+
+    def close(self) -> None:
+        """Release the mapping and the writer handle."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._table = None
+        self._mmap = None
+
+    def __len__(self) -> int:
+        return len(self._rows) + sum(1 for key in self._local_digests if key not in self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows or key in self._local_digests
+
+
+def text_digest(text: str) -> int:
+    """64-bit digest of a text (stored per record to verify key matches)."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
@@ -2,6 +2,7 @@ import pytest
 
 from eck.agent import ECKAgent
 from eck.config import ECKConfig, PolicyMode
+from eck.task import TaskState
 
 
 def dummy_llm(prompt: str) -> str:
@@ -169,3 +170,255 @@ def test_goal_check_yes_stops_step_early(monkeypatch):
     a.seed("Seed task")
     assert a.step() is False  # stops due to goal check YES
     assert seen["goal_check_prompt"] is True
+
+
+def test_keep_failures_eviction_keeps_critic_rejections(monkeypatch):
+    """A task the critic rejects is kept (and counted) like a FAILED one."""
+    import eck.agent as agent_mod
+
+    a = ECKAgent(
+        objective="Test eviction",
+        llm_call=dummy_llm,
+        config=ECKConfig(memory_max_entries=2, memory_eviction_policy="keep_failures"),
+    )
+    monkeypatch.setattr(agent_mod, "generate_prediction", lambda *a, **k: "pred")
+    monkeypatch.setattr(agent_mod, "get_recommended_breadth", lambda *a, **k: "FULL")
+    monkeypatch.setattr(agent_mod, "should_execute", lambda *a, **k: True)
+    monkeypatch.setattr(agent_mod, "execute_task", lambda *a, **k: "outcome")
+    monkeypatch.setattr(agent_mod, "generate_subtasks", lambda *a, **k: [])
+    verdicts = iter([(False, "contradicts the prediction", 1.0), (True, "", 0.0), (True, "", 0.0)])
+    monkeypatch.setattr(agent_mod, "critic_evaluate", lambda *a, **k: next(verdicts))
+    monkeypatch.setattr(a.drift, "get_policy_mode", lambda: PolicyMode.NORMAL)
+
+    for text in ["rejected task", "second task", "third task"]:
+        a.seed(text)
+        assert a.step() is True
+
+    kept = {record.task: record.state for record in a.memory.tasks.values()}
+    assert kept == {"rejected task": TaskState.REJECTED_BY_CRITIC, "third task": TaskState.SUCCEEDED}
+    assert a.memory.eviction_stats()["evicted_failures"] == 0
+
+
+def test_step_batch_issues_one_provider_call_per_phase():
+    """Batched mode: prediction, execution, critic votes, goal, subtasks each batched."""
+    batches = []
+
+    def batch_llm(prompts):
+        batches.append(list(prompts))
+        responses = []
+        for prompt in prompts:
+            if "Return ONLY valid JSON" in prompt:
+                responses.append('{"success": true, "feedback": "ok"}')
+            elif "Return ONLY a valid JSON array" in prompt:
+                responses.append("[]")
+            else:
+                responses.append("NO")
+        return responses
+
+    def single_llm(prompt: str) -> str:
+        raise AssertionError("single-prompt seam must not be used in batched mode")
+
+    a = ECKAgent(
+        objective="Batch objective",
+        llm_call=single_llm,
+        llm_batch_call=batch_llm,
+        config=ECKConfig(batch_size=3),
+    )
+    for text in ["t1", "t2", "t3", "t4"]:
+        a.seed(text)
+
+    assert a.step_batch() is True
+    assert a.cycles == 3
+    assert len(a.queue) == 1  # t4 left for the next batch
+
+    # prediction, execution, critic round 1, critic round 2, goal, subtasks
+    assert [len(b) for b in batches] == [3, 3, 3, 3, 3, 3]
+    assert batches[1] == ["t1", "t2", "t3"]
+
+    states = [e["state"] for e in a.memory.all_tasks().values() if e["task"] != "t4"]
+    assert states == ["succeeded"] * 3
+
+
+def test_step_batch_rejects_mismatched_backend_response_count():
+    a = ECKAgent(
+        objective="Batch objective",
+        llm_call=dummy_llm,
+        llm_batch_call=lambda prompts: ["only one"],
+    )
+    a.seed("t1")
+    a.seed("t2")
+
+    with pytest.raises(ValueError):
+        a.step_batch()
+
+
+def test_step_batch_falls_back_to_single_llm_call():
+    calls = []
+
+    def llm(prompt: str) -> str:
+        calls.append(prompt)
+        return "NO"
+
+    a = ECKAgent(objective="Batch objective", llm_call=llm)
+    a.seed("t1")
+    assert a.step_batch() is True
+    # prediction, execution, one critic vote (parse failure short-circuits), goal, subtasks
+    assert len(calls) == 5
+
+
+def test_fused_evaluation_replaces_goal_and_subtask_calls():
+    prompts = []
+
+    def llm(prompt: str) -> str:
+        prompts.append(prompt)
+        if '"goal_achieved"' in prompt:
+            return '{"success": true, "feedback": "ok", "goal_achieved": false, "subtasks": ["s1", "s2"]}'
+        if "Return ONLY valid JSON" in prompt:
+            return '{"success": true, "feedback": "agree"}'
+        return "result"
+
+    a = ECKAgent(
+        objective="Fused objective",
+        llm_call=llm,
+        config=ECKConfig(enable_fused_evaluation=True),
+    )
+    a.seed("Seed task")
+    assert a.step() is True
+
+    # prediction, execution, fused evaluation, second critic vote
+    assert len(prompts) == 4
+    assert not any('Answer ONLY "YES" or "NO"' in p for p in prompts)
+    assert [t["text"] for t in a.queue.as_list()] == ["s1", "s2"]
+
+
+def test_step_batch_uses_fused_evaluation(monkeypatch):
+    prompts = []
+
+    def llm(prompt: str) -> str:
+        prompts.append(prompt)
+        if '"goal_achieved"' in prompt:
+            task = "t1" if "t1" in prompt else "t2"
+            return f'{{"success": true, "feedback": "ok", "goal_achieved": false, "subtasks": ["{task}.a"]}}'
+        if "Return ONLY valid JSON" in prompt:
+            return '{"success": true, "feedback": "agree"}'
+        return "result"
+
+    a = ECKAgent(
+        objective="Fused objective",
+        llm_call=llm,
+        config=ECKConfig(enable_fused_evaluation=True),
+    )
+    a.seed("t1")
+    a.seed("t2")
+    assert a.step_batch() is True
+
+    # per task: prediction, execution, fused evaluation, second critic vote
+    assert len(prompts) == 8
+    assert not any('Answer ONLY "YES" or "NO"' in p for p in prompts)
+    assert [t["text"] for t in a.queue.as_list()] == ["t1.a", "t2.a"]
+
+
+def test_step_batch_sends_concurrent_vote_waves_in_one_round():
+    batches = []
+
+    def batch_llm(prompts):
+        batches.append(len(prompts))
+        return [
+            '{"success": true, "feedback": "ok"}' if "Return ONLY valid JSON" in p
+            else "[]" if "Return ONLY a valid JSON array" in p
+            else "NO"
+            for p in prompts
+        ]
+
+    a = ECKAgent(
+        objective="Batch objective",
+        llm_call=dummy_llm,
+        llm_batch_call=batch_llm,
+        config=ECKConfig(critic_votes=3, critic_votes_required=2, critic_concurrent_votes=True),
+    )
+    a.seed("t1")
+    a.seed("t2")
+    assert a.step_batch() is True
+    # prediction, execution, one critic round with both votes per task, goal, subtasks
+    assert batches == [2, 2, 4, 2, 2]
+
+
+def test_fused_evaluation_subtasks_still_policy_gated(monkeypatch):
+    import eck.agent as agent_mod
+
+    def llm(prompt: str) -> str:
+        return '{"success": true, "feedback": "ok", "goal_achieved": false, "subtasks": ["s1"]}'
+
+    a = ECKAgent(
+        objective="Fused objective",
+        llm_call=llm,
+        config=ECKConfig(enable_fused_evaluation=True),
+    )
+    monkeypatch.setattr(agent_mod, "should_execute", lambda *a, **k: False)
+
+    a.seed("Seed task")
+    assert a.step() is True
+    assert len(a.queue) == 0
+
+
+def test_deferred_execution_skips_critic_and_goal_llm_calls(monkeypatch):
+    """Deferred → local DEFERRED verdict, no critic/goal calls, no drift observation."""
+    import eck.agent as agent_mod
+
+    prompts = []
+
+    def llm(prompt: str) -> str:
+        prompts.append(prompt)
+        return "NO"
+
+    a = ECKAgent(objective="Deferred objective", llm_call=llm)
+    monkeypatch.setattr(agent_mod, "should_execute", lambda *a, **k: False)
+
+    def raise_if_called(*args, **kwargs):
+        raise AssertionError("critic must not run for deferred tasks")
+
+    monkeypatch.setattr(agent_mod, "critic_evaluate", raise_if_called)
+
+    a.seed("Seed task")
+    assert a.step() is True
+
+    assert len(prompts) == 1  # prediction only
+    entry = next(iter(a.memory.all_tasks().values()))
+    assert entry["state"] == "deferred"
+    assert entry["success"] is False
+    assert a.drift.error_history == []
+
+
+def test_empty_outcome_fails_locally_and_feeds_drift(monkeypatch):
+    import eck.agent as agent_mod
+
+    prompts = []
+
+    def llm(prompt: str) -> str:
+        prompts.append(prompt)
+        return "[]" if "JSON array" in prompt else "NO"
+
+    a = ECKAgent(objective="Empty objective", llm_call=llm)
+    monkeypatch.setattr(agent_mod, "execute_task", lambda *a, **k: "")
+
+    a.seed("Seed task")
+    assert a.step() is True
+
+    # prediction + subtasks; no critic votes, no goal check
+    assert len(prompts) == 2
+    entry = next(iter(a.memory.all_tasks().values()))
+    assert entry["state"] == "failed"
+    assert a.drift.error_history == [1.0]
+
+
+def test_durable_queue_agent_resumes_queued_tasks(tmp_path):
+    config = ECKConfig(queue_mode="durable", queue_path=str(tmp_path / "queue.db"), max_queue_size=1)
+    first = ECKAgent(objective="Test agent loop", llm_call=dummy_llm, config=config)
+    first._enqueue_tasks(["a", "b", "c"])
+    assert len(first.queue) == 3  # nothing dropped beyond max_queue_size
+    first.queue.close()
+
+    resumed = ECKAgent(objective="Test agent loop", llm_call=dummy_llm, config=config)
+    assert [t["text"] for t in resumed.queue.as_list()] == ["a", "b", "c"]
+    resumed._enqueue_task("d")
+    assert resumed.queue.as_list()[-1]["id"] == 4  # ids continue after the resumed ones
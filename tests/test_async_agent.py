@@ -0,0 +1,232 @@
+import asyncio
+
+import pytest
+
+from eck.async_agent import AsyncECKAgent
+from eck.config import ECKConfig, PolicyMode
+from eck.task import TaskState
+
+
+def make_llm(calls):
+    """Async stub recording prompts; critic approves, goal check says NO."""
+
+    async def llm(prompt: str) -> str:
+        calls.append(prompt)
+        if "Return ONLY valid JSON" in prompt:
+            return '{"success": true, "feedback": "ok"}'
+        if "Return ONLY a valid JSON array" in prompt:
+            return '["sub a"]'
+        return "NO"
+
+    return llm
+
+
+def test_step_async_runs_full_cycle_and_records_states():
+    calls = []
+    agent = AsyncECKAgent(objective="Test async", llm_call=make_llm(calls))
+
+    async def scenario():
+        await agent.seed_async("Seed task")
+        return await agent.step_async()
+
+    assert asyncio.run(scenario()) is True
+    assert agent.cycles == 1
+
+    # prediction, execution, two critic votes, goal check, subtasks
+    assert len(calls) == 6
+    assert "Predict the expected outcome" in calls[0]
+    assert calls[1] == "Seed task"
+
+    states = [e["state"] for e in agent.memory.all_tasks().values()]
+    assert TaskState.SUCCEEDED.value in states
+    assert [t["text"] for t in agent.queue.as_list()] == ["sub a"]
+
+
+def test_step_async_policy_upgrades_are_irreversible(monkeypatch):
+    calls = []
+    agent = AsyncECKAgent(
+        objective="Test async upgrades",
+        llm_call=make_llm(calls),
+        config=ECKConfig(policy_mode=PolicyMode.NORMAL),
+    )
+
+    seq = iter([PolicyMode.ENFORCED, PolicyMode.NORMAL])
+    monkeypatch.setattr(agent.drift, "get_policy_mode", lambda: next(seq))
+
+    async def scenario():
+        await agent.seed_async("t1")
+        await agent.step_async()
+        assert agent.current_policy_mode == PolicyMode.ENFORCED
+        await agent.step_async()
+        assert agent.current_policy_mode == PolicyMode.ENFORCED
+
+    asyncio.run(scenario())
+
+
+def test_async_agents_share_one_event_loop():
+    agents = [
+        AsyncECKAgent(
+            objective=f"Objective {i}",
+            llm_call=make_llm([]),
+            config=ECKConfig(max_iterations=2),
+        )
+        for i in range(20)
+    ]
+
+    async def scenario():
+        for a in agents:
+            await a.seed_async("Seed task")
+        await asyncio.gather(*(a.run_async() for a in agents))
+
+    asyncio.run(scenario())
+    assert all(a.cycles == 2 for a in agents)
+
+
+def test_sync_entry_points_are_disabled():
+    agent = AsyncECKAgent(objective="x", llm_call=make_llm([]))
+    with pytest.raises(TypeError):
+        agent.step()
+
+
+def make_yielding_llm(calls):
+    """Like make_llm, but yields to the event loop so background work can run."""
+
+    async def llm(prompt: str) -> str:
+        calls.append(prompt)
+        await asyncio.sleep(0)
+        if "Return ONLY valid JSON" in prompt:
+            return '{"success": true, "feedback": "ok"}'
+        if "Return ONLY a valid JSON array" in prompt:
+            return "[]"
+        return "NO"
+
+    return llm
+
+
+def prediction_calls(calls):
+    return [p for p in calls if "Predict the expected outcome" in p]
+
+
+def test_prefetch_predicts_next_task_during_critic():
+    calls = []
+    agent = AsyncECKAgent(
+        objective="Test prefetch",
+        llm_call=make_yielding_llm(calls),
+        config=ECKConfig(prediction_prefetch_depth=1),
+    )
+
+    async def scenario():
+        await agent.seed_async("first")
+        await agent.seed_async("second")
+        await agent.step_async()
+        # Second prediction was issued before the first task's goal check
+        assert len(prediction_calls(calls)) == 2
+        await agent.step_async()
+
+    asyncio.run(scenario())
+    assert len(prediction_calls(calls)) == 2  # not recomputed
+    assert agent.prefetch_hits == 1
+    assert agent.prefetch_discarded == 0
+
+
+def test_prefetch_discarded_after_policy_escalation(monkeypatch):
+    calls = []
+    agent = AsyncECKAgent(
+        objective="Test prefetch",
+        llm_call=make_yielding_llm(calls),
+        config=ECKConfig(prediction_prefetch_depth=1),
+    )
+    seq = iter([PolicyMode.NORMAL, PolicyMode.GUIDED])
+    monkeypatch.setattr(agent.drift, "get_policy_mode", lambda: next(seq))
+
+    async def scenario():
+        await agent.seed_async("first")
+        await agent.seed_async("second")
+        await agent.step_async()
+        await agent.step_async()
+
+    asyncio.run(scenario())
+    assert agent.prefetch_hits == 0
+    assert agent.prefetch_discarded == 1
+    assert len(prediction_calls(calls)) == 3  # speculative + recomputed + first
+
+
+def test_prefetch_cancelled_when_step_ends_the_run():
+    calls = []
+    llm = make_yielding_llm(calls)
+
+    async def goal_reached(prompt: str) -> str:
+        if prompt.lstrip().startswith("Did this result achieve"):
+            return "YES"
+        return await llm(prompt)
+
+    agent = AsyncECKAgent(
+        objective="Test prefetch",
+        llm_call=goal_reached,
+        config=ECKConfig(prediction_prefetch_depth=2),
+    )
+
+    async def scenario():
+        for text in ("first", "second", "third"):
+            await agent.seed_async(text)
+        assert await agent.step_async() is False  # goal reached
+        return list(agent._prefetched)
+
+    assert asyncio.run(scenario()) == []
+    assert agent.prefetch_started == 2
+    assert agent.prefetch_discarded == 2
+
+
+def test_prefetch_discarded_when_memory_context_changes():
+    calls = []
+    agent = AsyncECKAgent(
+        objective="Test prefetch",
+        llm_call=make_yielding_llm(calls),
+        config=ECKConfig(
+            prediction_prefetch_depth=1,
+            enable_memory_retrieval=True,
+            memory_similarity_threshold=0.3,
+        ),
+    )
+
+    async def scenario():
+        await agent.seed_async("write the report")
+        await agent.seed_async("write the summary")
+        await agent.step_async()  # first task's final state changes similar memory
+        await agent.step_async()
+
+    asyncio.run(scenario())
+    assert agent.prefetch_hits == 0
+    assert agent.prefetch_discarded == 1
+
+
+def test_speculative_context_reports_no_retrieval_hits():
+    agent = AsyncECKAgent(
+        objective="Test prefetch",
+        llm_call=make_yielding_llm([]),
+        config=ECKConfig(
+            prediction_prefetch_depth=1,
+            enable_memory_retrieval=True,
+            memory_similarity_threshold=0.3,
+            memory_max_entries=3,
+            memory_eviction_policy="lru",
+            enable_context_cache=True,
+            retrieval_recall_sample_interval=1,
+        ),
+    )
+    memory = agent.memory
+    memory.record("old", "write the report", "", "done", True, "", TaskState.SUCCEEDED)
+    memory.record("new", "read the news", "", "done", True, "", TaskState.SUCCEEDED)
+
+    async def scenario():
+        await agent.seed_async("write the summary")
+        agent._start_prefetch()
+        agent.cancel_prefetch()
+
+    asyncio.run(scenario())
+    assert agent.prefetch_started == 1
+    assert memory.recall_samples == 0
+    assert memory.context_cache.misses == 0
+    # "old" matched the speculative lookup but was not touched for LRU
+    memory.record("next", "plan the week", "", "", False, "", TaskState.CREATED)
+    assert "old" not in memory.tasks and "new" in memory.tasks
@@ -0,0 +1,97 @@
+import pytest
+
+from eck.agent import ECKAgent
+from eck.backpressure import SubtaskBackpressure
+from eck.config import ECKConfig, PolicyMode
+
+
+def test_watermarks_scale_the_cap():
+    assert SubtaskBackpressure().limit(size=2, capacity=20, cap=5) == 5  # below low
+
+    backpressure = SubtaskBackpressure(low_watermark=0.5, high_watermark=0.9)
+    assert backpressure.limit(size=14, capacity=20, cap=5) == 4  # headroom 18 - 14
+    assert backpressure.limit(size=18, capacity=20, cap=5) == 0  # at the high watermark
+
+    stats = backpressure.stats()
+    assert stats["throttled"] == 2
+    assert stats["calls_saved"] == 1
+    assert stats["subtasks_saved"] == 1 + 5
+
+
+def test_growth_lowers_the_cap_below_the_low_watermark():
+    backpressure = SubtaskBackpressure(low_watermark=0.5, high_watermark=0.9)
+    backpressure.limit(size=0, capacity=20, cap=5)
+    assert backpressure.limit(size=8, capacity=20, cap=5) == 5  # headroom 18 - 8 - 4
+    assert backpressure.growth == 4.0
+    assert backpressure.limit(size=9, capacity=20, cap=5) == 5
+    assert backpressure.limit(size=9, capacity=20, cap=5, tasks=4) == 1  # share per task
+
+
+def test_cap_never_exceeds_free_capacity():
+    backpressure = SubtaskBackpressure(low_watermark=1.0, high_watermark=1.0)
+    assert backpressure.limit(size=8, capacity=10, cap=5) == 2
+    assert backpressure.limit(size=8, capacity=10, cap=5, skippable=False, tasks=3) == 0
+    assert backpressure.calls_saved == 0  # a fused prompt is sent anyway
+
+
+def test_invalid_watermarks_are_rejected():
+    with pytest.raises(ValueError):
+        SubtaskBackpressure(low_watermark=0.9, high_watermark=0.5)
+
+
+def make_agent(monkeypatch, requested, **overrides):
+    import eck.agent as agent_mod
+
+    fields = dict(guard_interval=1000, max_queue_size=10)
+    fields.update(overrides)
+    agent = ECKAgent(objective="obj", llm_call=lambda prompt: "NO", config=ECKConfig(**fields))
+    monkeypatch.setattr(agent.drift, "get_policy_mode", lambda: agent.config.policy_mode)
+    monkeypatch.setattr(agent_mod, "should_execute", lambda *a: True)
+
+    def generate_subtasks(current_task, max_subtasks, **kwargs):
+        requested.append(max_subtasks)
+        return [f"{current_task} {i}" for i in range(max_subtasks)]
+
+    monkeypatch.setattr(agent_mod, "generate_subtasks", generate_subtasks)
+    return agent
+
+
+def test_agent_honors_policy_max_subtasks(monkeypatch):
+    requested = []
+    agent = make_agent(monkeypatch, requested, policy_mode=PolicyMode.GUIDED)
+    agent.seed("root")
+    assert agent.step() is True
+    assert requested == [2]
+    assert len(agent.queue) == 2
+
+
+def test_agent_skips_generation_when_queue_is_full(monkeypatch):
+    requested = []
+    agent = make_agent(monkeypatch, requested, enable_subtask_backpressure=True)
+    for i in range(10):
+        agent.seed(f"task {i}")
+
+    for _ in range(3):
+        assert agent.step() is True
+
+    # 9/10 queued after the first pop: at the high watermark, no call;
+    # then one slot of headroom per step
+    assert requested == [1, 1]
+    assert len(agent.queue) == 9
+    stats = agent.backpressure.stats()
+    assert stats["calls_saved"] == 1
+    assert stats["subtasks_saved"] == 5 + 4 + 4
+
+
+def test_backpressure_is_disabled_for_the_unbounded_durable_queue(tmp_path, caplog):
+    config = ECKConfig(
+        enable_subtask_backpressure=True,
+        queue_mode="durable",
+        queue_path=str(tmp_path / "queue.db"),
+        max_queue_size=2,
+    )
+    agent = ECKAgent(objective="obj", llm_call=lambda prompt: "NO", config=config)
+    assert agent.backpressure is None
+    assert "backpressure disabled" in caplog.text
+    agent._enqueue_tasks(["a", "b", "c"])  # past the in-memory head
+    assert agent._subtask_limit() == config.max_subtasks
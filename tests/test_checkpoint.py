@@ -0,0 +1,269 @@
+import os
+
+import pytest
+
+from eck.agent import ECKAgent
+from eck.checkpoint import CheckpointReader, delta_paths
+from eck.config import ECKConfig, PolicyMode
+from eck.task import TaskState
+
+
+def dummy_llm(prompt: str) -> str:
+    return "NO"
+
+
+def make_agent(**config):
+    return ECKAgent(objective="Checkpoint test", llm_call=dummy_llm, config=ECKConfig(**config))
+
+
+def populate(agent, n=5, start=0):
+    for i in range(start, start + n):
+        agent._enqueue_task(f"task number {i}")
+    task = agent.queue.pop()
+    agent._record(task["id"], task["text"], "pred", "out", i % 2 == 0, "fb", TaskState.SUCCEEDED)
+    agent.drift.record_error(0.1 * (start + n))
+    agent.drift.record_feasibility(True, False)
+    agent.drift.register_drift()
+    agent.cycles += 1
+
+
+def assert_same_state(restored, original):
+    assert restored.memory.all_tasks() == original.memory.all_tasks()
+    assert list(restored.memory.tasks) == list(original.memory.tasks)
+    assert restored.queue.as_list() == original.queue.as_list()
+    assert restored.cycles == original.cycles
+    assert restored.current_confidence == original.current_confidence
+    assert restored.current_policy_mode == original.current_policy_mode
+    assert restored.drift.error_history == original.drift.error_history
+    assert list(restored.drift.recent_drifts) == list(original.drift.recent_drifts)
+    assert list(restored.drift.feasibility_history) == list(original.drift.feasibility_history)
+    assert restored.drift.drift_streak == original.drift.drift_streak
+    assert restored.task_ids.next_id == original.task_ids.next_id
+
+
+def test_full_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent()
+    populate(agent)
+    agent.memory.record(99, "with metadata", "p", "o", None, None, metadata={"k": [1, 2]})
+    agent.current_confidence = 0.8
+    agent.checkpoint(path)
+
+    restored = make_agent()
+    restored.restore(path)
+    assert_same_state(restored, agent)
+    assert restored.memory.get_similar("task number 3", threshold=0.5)
+
+    # Task ids keep counting from where the checkpointed agent stopped
+    restored._enqueue_task("after restore")
+    assert restored.queue.as_list()[-1]["id"] == agent.task_ids.next_id
+
+
+def test_delta_checkpoints_apply_in_order(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent(memory_max_entries=8)
+    populate(agent)
+    agent.checkpoint(path)
+    base_size = os.path.getsize(path)
+
+    populate(agent, n=2, start=5)
+    first = agent.checkpoint(path, delta=True)
+    populate(agent, n=3, start=7)  # evicts the oldest records
+    agent.checkpoint(path, delta=True)
+
+    assert delta_paths(path) == [first, path + ".delta-000002"]
+    assert os.path.getsize(first) < base_size
+    with CheckpointReader(first) as reader:
+        assert reader.state.is_delta
+        assert len(list(reader.records())) == 3  # two created + one updated
+
+    restored = make_agent(memory_max_entries=8)
+    restored.restore(path)
+    assert_same_state(restored, agent)
+
+    # A new full checkpoint supersedes the old deltas
+    agent.checkpoint(path)
+    assert delta_paths(path) == []
+
+
+def test_restored_agent_continues_delta_chain(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent()
+    populate(agent)
+    agent.checkpoint(path)
+
+    restored = make_agent()
+    restored.restore(path)
+    populate(restored, n=2, start=5)
+    restored.checkpoint(path, delta=True)
+
+    again = make_agent()
+    again.restore(path)
+    assert_same_state(again, restored)
+
+
+def test_uuid_mapping_survives_restore(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent(task_uuids=True)
+    populate(agent, n=2)
+    agent.checkpoint(path)
+    populate(agent, n=2, start=2)
+    agent.checkpoint(path, delta=True)
+
+    restored = make_agent(task_uuids=True)
+    restored.restore(path)
+    assert restored.task_ids.uuid_items() == agent.task_ids.uuid_items()
+    uid = agent.task_ids.uuid_for(3)
+    assert restored.task_ids.id_for(uid) == 3
+
+
+def test_restore_never_downgrades_policy(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    halted = make_agent(policy_mode=PolicyMode.HALT)
+    halted.checkpoint(path)
+
+    restored = make_agent()
+    restored.restore(path)
+    assert restored.current_policy_mode == PolicyMode.HALT
+    assert restored.config.policy_mode == PolicyMode.HALT
+    assert restored.drift.config is restored.config
+
+    normal_path = str(tmp_path / "normal.ckpt")
+    make_agent().checkpoint(normal_path)
+    enforced = make_agent(policy_mode=PolicyMode.ENFORCED)
+    enforced.restore(normal_path)
+    assert enforced.current_policy_mode == PolicyMode.ENFORCED
+
+
+def test_automatic_checkpoints_every_k_cycles(tmp_path, monkeypatch):
+    import eck.agent as agent_mod
+
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent(
+        checkpoint_path=path, checkpoint_interval=2, checkpoint_full_interval=3, guard_interval=1000,
+    )
+    monkeypatch.setattr(agent.drift, "get_policy_mode", lambda: PolicyMode.NORMAL)
+    monkeypatch.setattr(agent_mod, "generate_subtasks", lambda *a, **k: ["next task"])
+
+    agent.seed("first task")
+    for _ in range(4):
+        assert agent.step() is True
+    assert os.path.exists(path)
+    assert len(delta_paths(path)) == 1
+
+    for _ in range(4):
+        agent.step()
+    # Cycles 2 (full), 4, 6 (deltas), 8 (full again)
+    assert agent.cycles == 8
+    assert delta_paths(path) == []
+
+    agent.step()
+    agent.step()
+    assert len(delta_paths(path)) == 1
+
+    restored = make_agent()
+    restored.restore(path)
+    assert_same_state(restored, agent)
+
+
+def test_corrupt_or_foreign_files_are_rejected(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent()
+    populate(agent)
+    agent.checkpoint(path)
+
+    with open(path, "r+b") as f:
+        f.seek(40)
+        f.write(b"\xff\xff")
+    with pytest.raises(ValueError):
+        make_agent().restore(path)
+
+    junk = tmp_path / "junk.ckpt"
+    junk.write_bytes(b"not a checkpoint at all, definitely not")
+    with pytest.raises(ValueError):
+        make_agent().restore(str(junk))
+
+
+def test_restore_requires_empty_memory(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent()
+    populate(agent)
+    agent.checkpoint(path)
+
+    busy = make_agent()
+    busy.seed("already running")
+    with pytest.raises(ValueError):
+        busy.restore(path)
+
+
+def test_priority_queue_scores_survive_restore(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    config = dict(queue_mode="priority", queue_scorer="heuristic")
+    agent = ECKAgent(objective="parse config", llm_call=dummy_llm, config=ECKConfig(**config))
+    agent._enqueue_tasks(["water plants", "parse the config", "config"])
+    agent.checkpoint(path)
+
+    restored = ECKAgent(objective="parse config", llm_call=dummy_llm, config=ECKConfig(**config))
+    restored.restore(path)
+    assert restored.queue.scored_tasks() == agent.queue.scored_tasks()
+    assert restored.queue.peek()[0]["text"] == "parse the config"
+
+
+def test_durable_queue_is_not_overwritten_by_restore(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    config = dict(queue_mode="durable", queue_path=str(tmp_path / "queue.db"), max_queue_size=2)
+    agent = make_agent(**config)
+    agent._enqueue_tasks(["a", "b", "c"])
+    agent.checkpoint(path)
+    agent.queue.pop()  # progress made after the checkpoint
+    agent._enqueue_task("d")
+    agent.queue.close()
+
+    restored = make_agent(**config)
+    restored.restore(path)
+    assert [task["text"] for task in restored.queue.as_list()] == ["b", "c", "d"]
+    with CheckpointReader(path) as reader:
+        assert reader.state.durable_queue and reader.state.queue == []
+
+
+def test_in_flight_tasks_return_to_the_head_of_a_durable_queue(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    config = dict(queue_mode="durable", queue_path=str(tmp_path / "queue.db"), max_queue_size=2)
+    agent = make_agent(**config)
+    agent._enqueue_tasks(["a", "b", "c", "d"])
+    for _ in range(2):  # popped by worker threads, not finished
+        task = agent.queue.pop()
+        agent._in_flight[task["id"]] = task
+    agent.checkpoint(path)
+    agent.queue.close()
+
+    restored = make_agent(**config)
+    restored.restore(path)
+    assert [task["text"] for task in restored.queue.as_list()] == ["a", "b", "c", "d"]
+    restored.queue.close()
+
+    # Restoring again does not queue them twice
+    again = make_agent(**config)
+    again.restore(path)
+    assert [task["text"] for task in again.queue.as_list()] == ["a", "b", "c", "d"]
+    again.queue.close()
+
+
+def test_in_flight_tasks_finished_since_the_checkpoint_are_not_requeued(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    config = dict(
+        queue_mode="durable", queue_path=str(tmp_path / "queue.db"),
+        memory_backend="sqlite", memory_path=str(tmp_path / "memory.db"),
+    )
+    agent = make_agent(**config)
+    agent._enqueue_tasks(["a", "b"])
+    task = agent.queue.pop()
+    agent._in_flight[task["id"]] = task
+    agent.checkpoint(path)
+    agent._record(task["id"], task["text"], "pred", "out", True, "", TaskState.SUCCEEDED)
+    agent.memory.close()
+    agent.queue.close()
+
+    restored = make_agent(**config)
+    restored.restore(path)
+    assert [task["text"] for task in restored.queue.as_list()] == ["b"]
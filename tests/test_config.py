@@ -27,6 +27,12 @@ def test_effective_policy_guided_returns_expected_keys_and_values():
     assert effective["prediction_bias_delta"] == config._guided_prediction_bias_delta
 
 
+def test_effective_policy_enforced_keeps_guided_limits():
+    enforced = ECKConfig(policy_mode=PolicyMode.ENFORCED).effective_policy()
+    guided = ECKConfig(policy_mode=PolicyMode.GUIDED).effective_policy()
+    assert dict(enforced) == dict(guided)
+
+
 def test_effective_policy_halt_returns_halt_true():
     config = ECKConfig(policy_mode=PolicyMode.HALT)
     effective = config.effective_policy()
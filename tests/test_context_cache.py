@@ -0,0 +1,129 @@
+import pytest
+
+from eck.config import ECKConfig
+from eck.context_cache import ContextCache
+from eck.memory import WorldModel
+from eck.prediction import build_prediction_context
+from eck.sqlite_memory import SQLiteWorldModel
+from eck.task import TaskState
+
+
+def cached_config(**overrides):
+    fields = dict(enable_memory_retrieval=True, enable_context_cache=True, memory_similarity_threshold=0.3)
+    fields.update(overrides)
+    return ECKConfig(**fields)
+
+
+def counting(memory, monkeypatch):
+    calls = []
+    original = memory.retrieve_similar
+
+    def retrieve_similar(**kwargs):
+        calls.append(kwargs["task_text"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(memory, "retrieve_similar", retrieve_similar)
+    return calls
+
+
+def test_repeated_queries_hit_until_a_related_task_changes(monkeypatch):
+    config = cached_config()
+    memory = WorldModel(config)
+    memory.record(1, "parse the config file", "p", "boom", False, "bad", TaskState.FAILED)
+    calls = counting(memory, monkeypatch)
+
+    first = build_prediction_context("parse config file", "obj", memory, config)
+    assert "boom" in first
+    assert build_prediction_context("parse config file", "obj", memory, config) == first
+    assert len(calls) == 1
+
+    # Sharing no token with the query cannot change its result
+    memory.record(2, "write unit tests", "p", "ok", True, "", TaskState.SUCCEEDED)
+    assert build_prediction_context("parse config file", "obj", memory, config) == first
+    assert len(calls) == 1
+
+    # A state change of a matching task invalidates exactly the affected entry
+    memory.record(1, "parse the config file", "p", "fixed", True, "", TaskState.SUCCEEDED)
+    updated = build_prediction_context("parse config file", "obj", memory, config)
+    assert "fixed" in updated
+    assert len(calls) == 2
+
+    stats = memory.context_cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
+    assert stats["invalidations"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cached_context_matches_uncached_context():
+    cached, plain = cached_config(), cached_config(enable_context_cache=False)
+    with_cache, without_cache = WorldModel(cached), WorldModel(plain)
+    queries = ["alpha beta", "beta gamma", "gamma delta", "alpha"]
+    for i in range(40):
+        text = queries[i % 4] + f" step{i % 7}"
+        args = (i % 13, text, "p", f"out{i}", i % 3 == 0, "f", TaskState.FAILED)
+        with_cache.record(*args)
+        without_cache.record(*args)
+        for query in queries:
+            assert (
+                build_prediction_context(query, "obj", with_cache, cached)
+                == build_prediction_context(query, "obj", without_cache, plain)
+            )
+    assert with_cache.context_cache.hits > 0
+
+
+def test_version_counts_every_change():
+    memory = WorldModel(ECKConfig(memory_max_entries=1))
+    assert memory.version == 0
+    memory.record(1, "a", "", "", False, "")
+    memory.record(1, "a", "", "", True, "")
+    memory.record(2, "b", "", "", False, "")  # evicts task 1
+    assert memory.version == 4
+
+
+def test_non_token_backends_invalidate_on_any_change(monkeypatch):
+    config = cached_config(retrieval_backend="minhash")
+    memory = WorldModel(config)
+    memory.record(1, "parse the config file", "p", "boom", False, "bad")
+    calls = counting(memory, monkeypatch)
+
+    build_prediction_context("parse config file", "obj", memory, config)
+    build_prediction_context("parse config file", "obj", memory, config)
+    memory.record(2, "write unit tests", "p", "ok", True, "")
+    build_prediction_context("parse config file", "obj", memory, config)
+    assert len(calls) == 2
+    assert memory.context_cache.stats()["stale"] == 1
+
+
+def test_sqlite_version_sees_other_connections(tmp_path):
+    path = str(tmp_path / "memory.db")
+    config = cached_config()
+    reader = SQLiteWorldModel(path, config)
+    writer = SQLiteWorldModel(path, config)
+
+    before = reader.version
+    assert reader.version == before
+    writer.record(1, "parse the config file", "p", "boom", False, "bad")
+    assert reader.version > before
+
+    context = build_prediction_context("parse config file", "obj", reader, config)
+    assert "boom" in context
+    writer.record(1, "parse the config file", "p", "fixed", True, "")
+    assert "fixed" in build_prediction_context("parse config file", "obj", reader, config)
+    reader.close()
+    writer.close()
+
+
+def test_cache_is_bounded_lru():
+    cache = ContextCache(max_entries=2, targeted=True)
+    for text in ("a", "b", "c"):
+        cache.put((text, 0.5, 5, True), 0, text.upper(), frozenset({text}))
+    assert len(cache) == 2
+    assert cache.get(("a", 0.5, 5, True), 0) is None
+    assert cache.get(("c", 0.5, 5, True), 0) == "C"
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate({"c"})
+    assert cache.get(("c", 0.5, 5, True), 0) is None
+
+    with pytest.raises(ValueError):
+        ContextCache(max_entries=0)
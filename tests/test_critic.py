@@ -60,3 +60,221 @@ def test_critic_cross_validation_disagreement_returns_failure(caplog):
     assert "Consensus:" in feedback
     assert error == 1.0
     assert any("Critic disagreement detected" in r.message for r in caplog.records)
+
+
+def test_critic_evaluate_async_matches_sync_consensus():
+    import asyncio
+    from eck.critic import critic_evaluate_async
+
+    async def good_llm(prompt: str) -> str:
+        return '{"success": true, "feedback": "good"}'
+
+    success, feedback, error = asyncio.run(
+        critic_evaluate_async(
+            task_text="task",
+            prediction="pred",
+            result="outcome",
+            objective="obj",
+            llm_call=good_llm,
+        )
+    )
+    assert success is True
+    assert feedback == "good | Consensus: True"
+    assert error == 0.0
+
+
+def test_critic_short_circuits_after_first_rejection():
+    from eck.critic import ConsensusStrategy
+
+    calls = {"n": 0}
+
+    def reject_llm(prompt: str) -> str:
+        calls["n"] += 1
+        return '{"success": false, "feedback": "no"}'
+
+    success, feedback, error = critic_evaluate(
+        task_text="task",
+        prediction="pred",
+        result="outcome",
+        objective="obj",
+        llm_call=reject_llm,
+        consensus=ConsensusStrategy(votes=2, required=2),
+    )
+    assert calls["n"] == 1  # second vote cannot change a 2-of-2 rejection
+    assert success is False
+    assert feedback == "no"
+    assert error == 1.0
+
+
+def test_critic_k_of_n_stops_once_decided():
+    from eck.critic import ConsensusStrategy
+
+    answers = iter(['{"success": false, "feedback": "no"}'] + ['{"success": true, "feedback": "yes"}'] * 4)
+    calls = {"n": 0}
+
+    def llm(prompt: str) -> str:
+        calls["n"] += 1
+        return next(answers)
+
+    success, feedback, _ = critic_evaluate(
+        task_text="task",
+        prediction="pred",
+        result="outcome",
+        objective="obj",
+        llm_call=llm,
+        consensus=ConsensusStrategy(votes=5, required=3),
+    )
+    assert success is True
+    assert calls["n"] == 4
+    assert feedback == "no | Consensus: True | Consensus: True | Consensus: True"
+
+
+def test_critic_failed_verifier_keeps_one_vote_feedback():
+    calls = {"n": 0}
+
+    def llm(prompt: str) -> str:
+        calls["n"] += 1
+        return '{"success": true, "feedback": "looks fine"}'
+
+    success, feedback, error = critic_evaluate(
+        task_text="task",
+        prediction="pred",
+        result="outcome",
+        objective="obj",
+        llm_call=llm,
+        verifier_callback=lambda task, result: False,
+    )
+    assert success is False
+    assert calls["n"] == 1  # the second vote is skipped
+    assert feedback == "looks fine | External verification failed"
+    assert error == 1.0
+
+
+def test_critic_concurrent_votes_reuse_one_pool():
+    import eck.critic as critic_mod
+    from eck.critic import ConsensusStrategy
+
+    def evaluate():
+        return critic_evaluate(
+            task_text="task",
+            prediction="pred",
+            result="outcome",
+            objective="obj",
+            llm_call=lambda prompt: '{"success": true, "feedback": "ok"}',
+            consensus=ConsensusStrategy(votes=2, required=2, concurrent=True),
+        )
+
+    assert evaluate()[0] is True
+    pool = critic_mod._pool
+    assert evaluate()[0] is True
+    assert critic_mod._pool is pool is not None
+
+
+def test_critic_concurrent_votes_run_in_parallel():
+    import threading
+    from eck.critic import ConsensusStrategy
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def llm(prompt: str) -> str:
+        barrier.wait()  # deadlocks unless both votes are in flight together
+        return '{"success": true, "feedback": "ok"}'
+
+    success, feedback, _ = critic_evaluate(
+        task_text="task",
+        prediction="pred",
+        result="outcome",
+        objective="obj",
+        llm_call=llm,
+        verifier_callback=lambda task, result: True,
+        consensus=ConsensusStrategy(votes=2, required=2, concurrent=True),
+    )
+    assert success is True
+    assert feedback == "ok | Consensus: True"
+
+
+def test_critic_concurrent_waves_never_exceed_the_remaining_quorum():
+    import threading
+    from eck.critic import ConsensusStrategy
+
+    lock = threading.Lock()
+    state = {"calls": 0, "running": 0, "peak": 0}
+
+    def llm(prompt: str) -> str:
+        with lock:
+            state["calls"] += 1
+            first = state["calls"] == 1
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        with lock:
+            state["running"] -= 1
+        return '{"success": false, "feedback": "no"}' if first else '{"success": true, "feedback": "ok"}'
+
+    success, _, _ = critic_evaluate(
+        task_text="task",
+        prediction="pred",
+        result="outcome",
+        objective="obj",
+        llm_call=llm,
+        consensus=ConsensusStrategy(votes=5, required=3, concurrent=True),
+    )
+    assert success is True
+    assert state["peak"] <= 3
+    assert state["calls"] == 4  # the wave of 3, then one more for the rejected vote
+
+
+def test_critic_async_concurrent_cancels_undecided_votes():
+    import asyncio
+    from eck.critic import ConsensusStrategy, critic_evaluate_async
+
+    state = {"started": 0, "cancelled": 0}
+
+    async def llm(prompt: str) -> str:
+        state["started"] += 1
+        if state["started"] == 1:
+            return '{"success": false, "feedback": "fast no"}'
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        return '{"success": true, "feedback": "slow yes"}'
+
+    async def scenario():
+        result = await critic_evaluate_async(
+            task_text="task",
+            prediction="pred",
+            result="outcome",
+            objective="obj",
+            llm_call=llm,
+            consensus=ConsensusStrategy(votes=2, required=2, concurrent=True),
+        )
+        await asyncio.sleep(0)  # let cancellation propagate
+        return result
+
+    success, feedback, _ = asyncio.run(scenario())
+    assert success is False
+    assert feedback == "fast no"
+    assert state == {"started": 2, "cancelled": 1}
+
+
+def test_critic_evaluate_batch_drops_decided_items_between_rounds():
+    from eck.critic import critic_evaluate_batch
+
+    rounds = []
+
+    def batch_llm(prompts):
+        rounds.append(len(prompts))
+        return [
+            '{"success": true, "feedback": "ok"}' if "good" in p else '{"success": false, "feedback": "bad"}'
+            for p in prompts
+        ]
+
+    results = critic_evaluate_batch(
+        items=[("good task", "p", "r"), ("bad task", "p", "r")],
+        objective="obj",
+        llm_batch_call=batch_llm,
+    )
+    assert rounds == [2, 1]  # rejected item needs no second vote
+    assert results[0] == (True, "ok | Consensus: True", 0.0)
+    assert results[1] == (False, "bad", 1.0)
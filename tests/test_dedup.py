@@ -0,0 +1,73 @@
+from eck.agent import ECKAgent
+from eck.config import ECKConfig, PolicyMode
+from eck.dedup import TaskDeduplicator, normalize_task_text
+from eck.memory import WorldModel
+from eck.queue import PriorityTaskQueue, TaskQueue
+from eck.task import TaskState
+
+
+def test_normalization_ignores_case_punctuation_and_spacing():
+    assert normalize_task_text("  Write the  PARSER tests!") == "write the parser tests"
+
+
+def test_rejects_exact_and_near_duplicates_of_queued_tasks():
+    dedup = TaskDeduplicator(threshold=0.75)
+    queue = TaskQueue(max_size=10, dedup=dedup)
+    queue.push({"id": 1, "text": "write the parser unit tests"})
+
+    accepted = dedup.filter([
+        "Write the parser unit tests.",  # exact after normalization
+        "write the parser unit tests now",  # 5/6 overlap
+        "benchmark the parser",
+        "benchmark the parser!",  # duplicate within the batch
+    ])
+    assert accepted == ["benchmark the parser"]
+    assert dedup.stats()["rejected_exact"] == 2
+    assert dedup.stats()["rejected_near"] == 1
+
+    # Once the task leaves the queue it may be proposed again
+    queue.pop()
+    assert dedup.filter(["write the parser unit tests"]) == ["write the parser unit tests"]
+
+
+def test_dropped_and_cleared_tasks_leave_the_index():
+    dedup = TaskDeduplicator()
+    queue = PriorityTaskQueue(max_size=1, dedup=dedup)
+    queue.push({"id": 1, "text": "first task"})
+    queue.push({"id": 2, "text": "second task"})  # equal scores: drops the oldest
+    assert dedup.filter(["first task"]) == ["first task"]
+    assert dedup.filter(["second task"]) == []
+
+    queue.clear()
+    assert dedup.filter(["second task"]) == ["second task"]
+
+
+def test_rejects_tasks_that_already_succeeded():
+    memory = WorldModel()
+    memory.record(1, "deploy the service", "", "ok", True, "", TaskState.SUCCEEDED)
+    memory.record(2, "fix flaky test", "", "", False, "bad", TaskState.FAILED)
+
+    dedup = TaskDeduplicator()
+    dedup.seed(memory)
+    assert dedup.filter(["Deploy the service", "fix flaky test"]) == ["fix flaky test"]
+    assert dedup.stats()["rejected_succeeded"] == 1
+
+
+def test_agent_skips_duplicate_subtasks(monkeypatch):
+    import eck.agent as agent_mod
+
+    config = ECKConfig(enable_task_dedup=True, guard_interval=1000)
+    agent = ECKAgent(objective="objective", llm_call=lambda prompt: "NO", config=config)
+    monkeypatch.setattr(agent.drift, "get_policy_mode", lambda: PolicyMode.NORMAL)
+    monkeypatch.setattr(agent_mod, "should_execute", lambda *a: True)
+    monkeypatch.setattr(
+        agent_mod, "generate_subtasks", lambda *a, **k: ["collect the logs", "Collect the logs."],
+    )
+
+    agent.seed("first task")
+    agent.step()
+    agent._enqueue_tasks(["COLLECT the logs", "first task"])  # queued duplicate; first task failed
+
+    assert [t["text"] for t in agent.queue.as_list()] == ["collect the logs", "first task"]
+    assert len(agent.memory) == 3  # no CREATED records for rejected duplicates
+    assert agent.dedup.stats()["rejected"] == 2
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import pytest
+
+from eck.critic import ConsensusStrategy
+from eck.evaluation import fused_evaluate, fused_evaluate_async, parse_fused_response
+
+
+def test_parse_fused_response_valid_object():
+    success, feedback, goal, subtasks = parse_fused_response(
+        '{"success": true, "feedback": "ok", "goal_achieved": false, "subtasks": ["  a  b ", "", "c"]}'
+    )
+    assert success is True
+    assert feedback == "ok"
+    assert goal is False
+    assert subtasks == ("a b", "c")
+
+
+def test_parse_fused_response_malformed_is_pessimistic():
+    assert parse_fused_response("not json") == (
+        False,
+        "Parse failed - treated as non-success",
+        False,
+        (),
+    )
+    assert parse_fused_response('["a list"]')[0] is False
+
+
+def test_parse_fused_response_goal_requires_literal_true():
+    _, _, goal, _ = parse_fused_response('{"success": true, "goal_achieved": "yes"}')
+    assert goal is False
+
+
+def test_parse_fused_response_bad_subtasks_keep_verdict():
+    success, _, _, subtasks = parse_fused_response('{"success": true, "subtasks": "oops"}')
+    assert success is True
+    assert subtasks == ()
+
+
+def test_parse_fused_response_caps_subtasks():
+    _, _, _, subtasks = parse_fused_response('{"subtasks": ["a", "b", "c"]}', max_subtasks=2)
+    assert subtasks == ("a", "b")
+
+
+def test_fused_evaluate_uses_critic_prompt_for_second_vote():
+    prompts = []
+
+    def llm(prompt: str) -> str:
+        prompts.append(prompt)
+        if '"goal_achieved"' in prompt:
+            return '{"success": true, "feedback": "ok", "goal_achieved": true, "subtasks": ["next"]}'
+        return '{"success": true, "feedback": "agree"}'
+
+    result = fused_evaluate("task", "pred", "outcome", "obj", llm)
+    assert len(prompts) == 2
+    assert result.success is True
+    assert result.feedback == "ok | Consensus: True"
+    assert result.goal_achieved is True
+    assert result.subtasks == ("next",)
+
+
+def test_fused_evaluate_rejection_costs_one_call():
+    prompts = []
+
+    def llm(prompt: str) -> str:
+        prompts.append(prompt)
+        return '{"success": false, "feedback": "no", "goal_achieved": false, "subtasks": []}'
+
+    result = fused_evaluate("task", "pred", "outcome", "obj", llm)
+    assert len(prompts) == 1
+    assert result.success is False
+    assert result.error == 1.0
+
+
+def test_fused_evaluate_runs_remaining_votes_concurrently():
+    barrier = threading.Barrier(2, timeout=5)  # breaks unless both critic votes run at once
+
+    def llm(prompt: str) -> str:
+        return '{"success": true, "feedback": "ok", "goal_achieved": false, "subtasks": []}'
+
+    def critic(prompt: str) -> str:
+        barrier.wait()
+        return '{"success": true, "feedback": "agree"}'
+
+    result = fused_evaluate(
+        "task", "pred", "outcome", "obj", llm,
+        critic_llm_call=critic,
+        consensus=ConsensusStrategy(votes=3, required=3, concurrent=True),
+    )
+    assert result.success is True
+
+
+def test_fused_evaluate_async_runs_remaining_votes_concurrently():
+    started = []
+
+    async def llm(prompt: str) -> str:
+        return '{"success": true, "feedback": "ok", "goal_achieved": false, "subtasks": []}'
+
+    async def critic(prompt: str) -> str:
+        started.append(prompt)
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        return '{"success": true, "feedback": "agree"}'
+
+    result = asyncio.run(
+        asyncio.wait_for(
+            fused_evaluate_async(
+                "task", "pred", "outcome", "obj", llm,
+                critic_llm_call=critic,
+                consensus=ConsensusStrategy(votes=3, required=3, concurrent=True),
+            ),
+            timeout=5,
+        )
+    )
+    assert result.success is True
+    assert len(started) == 2
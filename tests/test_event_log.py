@@ -0,0 +1,97 @@
+import pytest
+
+from eck.agent import ECKAgent
+from eck.config import ECKConfig
+from eck.event_log import EventLog, LifecycleEvent, decode_event, encode_event
+from eck.memory import WorldModel
+from eck.task import TaskState
+
+
+def make_event(task_id, state=TaskState.CREATED, **overrides):
+    fields = dict(
+        task_id=task_id, task="task text", state=state, prediction=None,
+        outcome="", success=None, feedback="", timestamp_ns=123, metadata=None,
+    )
+    fields.update(overrides)
+    return LifecycleEvent(**fields)
+
+
+def test_encode_decode_round_trip():
+    for event in (
+        make_event(7),
+        make_event("t1", TaskState.SUCCEEDED, success=True, metadata={"k": [1, 2]}),
+        make_event("ünïcode", prediction="p", success=False),
+    ):
+        frame = encode_event(event)
+        assert decode_event(frame, 8) == event
+
+
+def test_log_rotates_segments_and_replays_in_order(tmp_path):
+    log = EventLog(str(tmp_path), segment_max_bytes=200, fsync_batch=3)
+    events = [make_event(i, timestamp_ns=i) for i in range(20)]
+    for event in events:
+        log.append(event)
+
+    assert len(log.segments()) > 1
+    assert log.fsyncs >= 20 // 3
+    assert list(log.replay()) == events
+    log.close()
+
+    assert list(EventLog(str(tmp_path)).replay()) == events
+
+
+def test_torn_tail_is_ignored_and_truncated_on_reopen(tmp_path):
+    log = EventLog(str(tmp_path))
+    log.append(make_event(1))
+    log.close()
+
+    segment = EventLog(str(tmp_path)).segments()[-1]
+    with open(segment, "ab") as f:
+        f.write(encode_event(make_event(2))[:-3])  # crash mid-write
+
+    reopened = EventLog(str(tmp_path))
+    reopened.append(make_event(3))
+    assert [e.task_id for e in reopened.replay()] == [1, 3]
+
+
+def test_world_model_is_latest_state_view_over_log(tmp_path):
+    config = ECKConfig(event_log_dir=str(tmp_path / "log"))
+    world_model = WorldModel(config=config)
+    world_model.record(1, "task", "", "", False, "", TaskState.CREATED)
+    world_model.record(1, "task", "pred", "", False, "", TaskState.PREDICTED)
+    world_model.record(1, "task", "pred", "out", True, "ok", TaskState.SUCCEEDED)
+    world_model.record(2, "other", "", "", False, "", TaskState.CREATED, metadata={"src": "x"})
+
+    assert [e.state for e in world_model.history(1)] == [
+        TaskState.CREATED, TaskState.PREDICTED, TaskState.SUCCEEDED,
+    ]
+    world_model.close()
+
+    restored = WorldModel(config=config)
+    assert restored.all_tasks() == world_model.all_tasks()
+    assert [e["task"] for e in restored.get_similar("task", threshold=0.5)] == ["task"]
+
+
+def test_history_requires_event_log():
+    with pytest.raises(ValueError):
+        WorldModel().history(1)
+
+
+def test_metadata_must_be_json_serializable_with_log(tmp_path):
+    world_model = WorldModel(config=ECKConfig(event_log_dir=str(tmp_path)))
+    with pytest.raises(TypeError):
+        world_model.record(1, "t", "", "", False, "", metadata={"bad": object()})
+
+
+def test_restarted_agent_continues_task_ids_after_replay(tmp_path):
+    config = ECKConfig(event_log_dir=str(tmp_path / "log"))
+    first = ECKAgent(objective="obj", llm_call=lambda prompt: "NO", config=config)
+    first._enqueue_tasks(["first run a", "first run b"])
+    first.memory.close()
+
+    second = ECKAgent(objective="obj", llm_call=lambda prompt: "NO", config=config)
+    second._enqueue_tasks(["second run"])
+    assert [task["id"] for task in second.queue.as_list()] == [3]
+    assert [e.task for e in second.memory.history(1)] == ["first run a"]
+    assert [e.task for e in second.memory.history(3)] == ["second run"]
+    second.memory.close()
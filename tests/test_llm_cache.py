@@ -0,0 +1,94 @@
+import pytest
+
+from eck.agent import ECKAgent
+from eck.config import ECKConfig
+from eck.llm_cache import LLMCache
+from eck.phase import Phase
+
+
+def counting_llm(calls):
+    def llm(prompt: str) -> str:
+        calls.append(prompt)
+        return f"response {len(calls)}"
+    return llm
+
+
+def test_cache_replays_same_phase_and_prompt():
+    calls = []
+    cache = LLMCache()
+    llm = cache.wrap(counting_llm(calls), Phase.SUBTASKS)
+
+    assert llm("p") == "response 1"
+    assert llm("p") == "response 1"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_keys_include_phase():
+    calls = []
+    cache = LLMCache()
+    base = counting_llm(calls)
+
+    cache.wrap(base, Phase.SUBTASKS)("p")
+    cache.wrap(base, Phase.GOAL_CHECK)("p")
+    assert len(calls) == 2
+
+
+def test_critic_phase_is_never_cached_by_default():
+    calls = []
+    cache = LLMCache()
+    llm = cache.wrap(counting_llm(calls), Phase.CRITIC)
+
+    llm("p")
+    llm("p")
+    assert len(calls) == 2
+    assert cache.stats()["bypassed"] == 2
+    assert len(cache) == 0
+
+
+def test_lru_eviction_is_bounded():
+    cache = LLMCache(max_entries=2)
+    cache.put(Phase.SEED, "a", "A")
+    cache.put(Phase.SEED, "b", "B")
+    assert cache.get(Phase.SEED, "a") == "A"  # refresh "a"
+    cache.put(Phase.SEED, "c", "C")
+
+    assert cache.get(Phase.SEED, "b") is None  # least recently used
+    assert cache.get(Phase.SEED, "a") == "A"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries():
+    now = {"t": 100.0}
+    cache = LLMCache(ttl_seconds=10, clock=lambda: now["t"])
+    cache.put(Phase.SEED, "a", "A")
+
+    now["t"] = 105.0
+    assert cache.get(Phase.SEED, "a") == "A"
+    now["t"] = 111.0
+    assert cache.get(Phase.SEED, "a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_sqlite_tier_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = LLMCache(path=path)
+    first.put(Phase.PREDICTION, "p", "stored")
+    first.close()
+
+    second = LLMCache(path=path)
+    assert second.get(Phase.PREDICTION, "p") == "stored"
+    assert second.stats()["disk_hits"] == 1
+    second.close()
+
+
+def test_agent_uses_cache_from_config_for_seed_prompt():
+    calls = []
+    config = ECKConfig(enable_llm_cache=True)
+    agent = ECKAgent(objective="obj", llm_call=counting_llm(calls), config=config)
+
+    agent.seed()
+    agent.seed()
+    assert len(calls) == 1
+    assert agent.llm_cache.stats()["hits"] == 1
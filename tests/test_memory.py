@@ -115,3 +115,190 @@ def test_retrieve_scored_drops_score_zero_and_sorts_desc(world_model):
     assert scored[0]["score"] >= scored[1]["score"]
     assert scored[0]["score"] > 0
     assert scored[1]["score"] > 0
+
+
+def legacy_retrieve_scored(world_model, task_text, policy_mode, config, threshold, limit, prefer_failures):
+    """The original get_similar → retrieve_similar → retrieve_scored cascade."""
+    from eck.utils import score_memory_entry
+
+    matches = [
+        t for t, e in world_model.tasks.items()
+        if (lambda a, b: len(a | b) and len(a & b) / len(a | b) >= threshold)(
+            set(task_text.split()), set(e["task"].split())
+        )
+    ]
+    ordered = sorted(
+        (world_model.tasks[t] for t in matches), key=lambda e: e["timestamp"], reverse=True
+    )[: limit * 4]
+    if prefer_failures:
+        ordered = [e for e in ordered if not e["success"]] + [e for e in ordered if e["success"]]
+    scored = []
+    for entry in ordered[: limit * 2]:
+        score = score_memory_entry(entry, task_text, policy_mode, config)
+        if score > 0:
+            scored.append((score, entry["task"]))
+    scored.sort(key=lambda s: s[0], reverse=True)
+    return scored[:limit]
+
+
+@pytest.mark.parametrize("prefer_failures", [False, True])
+def test_retrieve_scored_matches_legacy_cascade(world_model, prefer_failures):
+    import random
+
+    rng = random.Random(2)
+    vocab = ["Alpha", "alpha", "beta", "gamma", "delta", "eps"]
+    base = datetime(2020, 1, 1)
+    for i in range(120):
+        text = " ".join(rng.sample(vocab, rng.randint(1, 4)))
+        world_model.record(f"t{i}", text, "", "", rng.random() < 0.5, "", TaskState.CREATED)
+        world_model.tasks[f"t{i}"]["timestamp"] = base + timedelta(seconds=rng.randint(0, 50))
+
+    for query in ("alpha beta", "Alpha gamma delta", "eps"):
+        got = world_model.retrieve_scored(
+            task_text=query,
+            policy_mode=PolicyMode.NORMAL,
+            config=ECKConfig(),
+            threshold=0.2,
+            limit=4,
+            prefer_failures=prefer_failures,
+        )
+        expected = legacy_retrieve_scored(
+            world_model, query, PolicyMode.NORMAL, ECKConfig(), 0.2, 4, prefer_failures
+        )
+        assert [(e["score"], e["task"]) for e in got] == expected
+
+
+def test_retrieve_scored_rank_all_matches_ignores_recency_cut(world_model):
+    world_model.record("old", "apple fruit", "", "", False, "", TaskState.CREATED)
+    for i in range(4):
+        world_model.record(f"new{i}", "apple fruit pie tart", "", "", True, "", TaskState.CREATED)
+    base = datetime(2020, 1, 1)
+    world_model.tasks["old"]["timestamp"] = base
+    for i in range(4):
+        world_model.tasks[f"new{i}"]["timestamp"] = base + timedelta(seconds=i + 1)
+
+    kwargs = dict(task_text="apple fruit", policy_mode=PolicyMode.NORMAL, config=ECKConfig(),
+                  threshold=0.5, limit=1)
+    assert world_model.retrieve_scored(**kwargs)[0]["task"] == "apple fruit pie tart"
+    assert world_model.retrieve_scored(**kwargs, rank_all_matches=True)[0]["task"] == "apple fruit"
+
+
+def test_retrieve_scored_unified_similarity_uses_backend_casing(world_model):
+    world_model.record("t1", "Apple fruit", "", "", True, "", TaskState.CREATED)
+    kwargs = dict(task_text="apple fruit", policy_mode=PolicyMode.NORMAL, config=ECKConfig(),
+                  threshold=0.3, limit=1)
+
+    assert world_model.retrieve_scored(**kwargs)[0]["score"] == pytest.approx(1.0)
+    assert world_model.retrieve_scored(**kwargs, unified_similarity=True)[0]["score"] == pytest.approx(1/3)
+
+
+def test_retrieve_scored_halt_returns_nothing(world_model):
+    world_model.record("t1", "apple fruit", "", "", False, "", TaskState.CREATED)
+    assert world_model.retrieve_scored("apple fruit", PolicyMode.HALT, ECKConfig(), threshold=0.5) == []
+
+
+def test_get_recent_follows_last_recorded_order(world_model):
+    for task_id in ("t1", "t2", "t3"):
+        world_model.record(task_id, task_id, "", "", False, "", TaskState.CREATED)
+    world_model.record("t1", "t1", "", "", True, "", TaskState.SUCCEEDED)  # update moves t1 to newest
+
+    assert [e["task"] for e in world_model.get_recent(2)] == ["t1", "t3"]
+
+
+def test_views_are_read_only_and_live(world_model):
+    world_model.record("t1", "task", "", "", False, "", TaskState.CREATED, metadata={"k": 1})
+    view = world_model.view("t1")
+    assert isinstance(view["timestamp"], str)
+    assert dict(view) == world_model.get("t1")
+
+    with pytest.raises(TypeError):
+        view["task"] = "changed"
+    with pytest.raises(TypeError):
+        view["metadata"]["k"] = 2
+
+    world_model.record("t1", "task", "", "", True, "", TaskState.SUCCEEDED)
+    assert view["state"] == "succeeded"
+    assert world_model.view("missing") is None
+
+    tasks = world_model.tasks_view()
+    assert list(tasks) == ["t1"] and tasks["t1"]["success"] is True
+
+
+def test_iter_tasks_filters_by_since_and_state(world_model):
+    base = datetime(2020, 1, 1)
+    for i, state in enumerate([TaskState.FAILED, TaskState.SUCCEEDED, TaskState.FAILED, TaskState.CREATED]):
+        world_model.record(f"t{i}", f"task {i}", "", "", False, "", state)
+        world_model.tasks[f"t{i}"]["timestamp"] = base + timedelta(seconds=i)
+
+    assert [t for t, _ in world_model.iter_tasks()] == ["t0", "t1", "t2", "t3"]
+    assert [t for t, _ in world_model.iter_tasks(state="failed")] == ["t0", "t2"]
+    assert [t for t, _ in world_model.iter_tasks(since=base + timedelta(seconds=1))] == ["t1", "t2", "t3"]
+    assert [
+        t for t, _ in world_model.iter_tasks(
+            since=base + timedelta(seconds=1), state=TaskState.FAILED, newest_first=True
+        )
+    ] == ["t2"]
+
+
+def record_n(world_model, n, success=lambda i: False):
+    for i in range(n):
+        world_model.record(i, f"task {i}", "", "", success(i), "", TaskState.CREATED)
+
+
+def test_max_entries_evicts_oldest_to_cold_storage():
+    cold = []
+    world_model = WorldModel(
+        config=ECKConfig(memory_max_entries=3),
+        cold_storage=lambda task_id, entry: cold.append((task_id, entry["task"])),
+    )
+    record_n(world_model, 5)
+
+    assert list(world_model.tasks) == [2, 3, 4]
+    assert cold == [(0, "task 0"), (1, "task 1")]
+    assert world_model.eviction_stats()["evicted"] == 2
+    assert world_model.get_similar("task 0", threshold=0.9) == []  # index pruned too
+
+
+def test_lru_policy_keeps_retrieved_entries():
+    world_model = WorldModel(config=ECKConfig(memory_max_entries=3, memory_eviction_policy="lru"))
+    record_n(world_model, 3)
+    world_model.get_similar("task 0", threshold=0.9)  # hit on 0
+    world_model.record(3, "task 3", "", "", False, "", TaskState.CREATED)
+
+    assert sorted(world_model.tasks) == [0, 2, 3]
+
+
+def test_keep_failures_policy_evicts_successes_first():
+    world_model = WorldModel(config=ECKConfig(memory_max_entries=3, memory_eviction_policy="keep_failures"))
+    for i in range(5):  # odd ids succeed
+        state = TaskState.SUCCEEDED if i % 2 else TaskState.FAILED
+        world_model.record(i, f"task {i}", "", "", i % 2 == 1, "", state)
+
+    assert sorted(world_model.tasks) == [0, 2, 4]
+    assert world_model.eviction_stats()["evicted_failures"] == 0
+
+
+def test_keep_failures_policy_evicts_in_progress_before_failures():
+    world_model = WorldModel(config=ECKConfig(memory_max_entries=2, memory_eviction_policy="keep_failures"))
+    world_model.record(0, "task 0", "", "", False, "", TaskState.FAILED)
+    world_model.record(1, "task 1", "", "", False, "", TaskState.CREATED)
+    world_model.record(2, "task 2", "", "", False, "", TaskState.PREDICTED)
+
+    assert sorted(world_model.tasks) == [0, 2]
+    assert world_model.eviction_stats()["evicted_failures"] == 0
+
+
+def test_max_bytes_bound_tracks_in_place_updates():
+    world_model = WorldModel(config=ECKConfig(memory_max_bytes=2000))
+    record_n(world_model, 50)
+    stats = world_model.eviction_stats()
+    assert 0 < stats["bytes"] <= 2000
+    assert stats["evicted"] == 50 - stats["entries"]
+
+    world_model.record(49, "task 49", "x" * 5000, "", False, "", TaskState.PREDICTED)
+    assert list(world_model.tasks) == [49]  # the record just written is kept
+
+
+def test_unknown_eviction_policy_rejected():
+    with pytest.raises(ValueError):
+        WorldModel(config=ECKConfig(memory_max_entries=1, memory_eviction_policy="random"))
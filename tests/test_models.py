@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+
+from eck.models import Task, TaskIdAllocator, TaskRecord, datetime_to_ns, ns_to_datetime
+from eck.memory import WorldModel
+from eck.task import TaskState
+
+
+def test_allocator_ids_are_monotonic_with_optional_uuid_mapping():
+    plain = TaskIdAllocator()
+    assert [plain.next() for _ in range(3)] == [1, 2, 3]
+    assert plain.uuid_for(1) is None
+
+    mapped = TaskIdAllocator(with_uuids=True)
+    task_id = mapped.next()
+    uid = mapped.uuid_for(task_id)
+    assert len(uid) == 36
+    assert mapped.id_for(uid) == task_id
+
+
+def test_task_supports_dict_style_access_and_interns_text():
+    text = "".join(["explore ", "objective"])  # not a compile-time constant
+    task = Task(1, text)
+    assert task["id"] == 1 and task["text"] == "explore objective"
+    assert task.text is Task(2, "".join(["explore ", "objective"])).text
+    assert task == {"id": 1, "text": "explore objective"}
+    with pytest.raises(KeyError):
+        task["missing"]
+
+
+def test_timestamp_round_trip():
+    moment = datetime(2021, 5, 4, 3, 2, 1, 123456)
+    assert ns_to_datetime(datetime_to_ns(moment)) == moment
+
+
+def test_record_behaves_like_legacy_dict():
+    record = TaskRecord("t", TaskState.CREATED, "p", "o", False, "f", 0)
+    assert record["state"] == "created"
+    assert record["timestamp"] == datetime(1970, 1, 1)
+    assert "metadata" not in record
+    assert record.get("metadata") is None
+    assert set(dict(record)) == set(TaskRecord.KEYS)
+
+    record["timestamp"] = datetime(2020, 1, 1)
+    assert record.timestamp_ns == datetime_to_ns(datetime(2020, 1, 1))
+    record["state"] = "succeeded"
+    assert record.state is TaskState.SUCCEEDED
+
+
+def test_world_model_updates_records_in_place():
+    world_model = WorldModel()
+    world_model.record(7, "task", "", "", False, "", TaskState.CREATED, metadata={"k": 1})
+    record = world_model.tasks[7]
+
+    world_model.record(7, "task", "pred", "out", True, "ok", TaskState.SUCCEEDED)
+    assert world_model.tasks[7] is record
+    assert record.success is True
+    assert "metadata" not in record  # a lifecycle update replaces every field
+    assert world_model.get(7)["state"] == "succeeded"
+
+
+def test_allocator_draws_ids_from_reserved_blocks():
+    counter = [1]
+
+    def reserve(count, at_least):
+        start = max(counter[0], at_least)
+        counter[0] = start + count
+        return start
+
+    a = TaskIdAllocator(reserve=reserve, block=2)
+    b = TaskIdAllocator(reserve=reserve, block=2)
+    assert [a.next(), b.next(), a.next(), a.next(), b.next()] == [1, 3, 2, 5, 4]
+
+    a.advance_past(10)
+    assert a.next() == 11
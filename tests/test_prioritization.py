@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from eck.agent import ECKAgent
+from eck.async_agent import AsyncECKAgent
+from eck.config import ECKConfig, PolicyMode
+from eck.memory import WorldModel
+from eck.prioritization import HeuristicScorer, LLMScorer, MemoryScorer, make_scorer, rank_scores
+from eck.queue import PriorityTaskQueue
+from eck.task import TaskState
+
+
+def test_heuristic_scorer_prefers_objective_overlap():
+    scorer = HeuristicScorer("build a fast parser")
+    high, low = scorer(["build the parser", "water the plants"])
+    assert high > low == 0.0
+
+
+def test_memory_scorer_ranks_finished_work_below_novel_tasks():
+    memory = WorldModel()
+    memory.record(1, "write parser tests", "", "done", True, "", TaskState.SUCCEEDED)
+    memory.record(2, "write parser docs", "", "", False, "", TaskState.CREATED)
+    scorer = MemoryScorer("parser", memory, threshold=0.6)
+    repeat, queued_only, novel = scorer(["write parser tests", "write parser docs", "benchmark parser"])
+    assert repeat < queued_only
+    assert repeat < novel
+
+
+def test_memory_scorer_lookups_are_not_retrieval_hits():
+    memory = WorldModel(
+        config=ECKConfig(memory_max_entries=2, memory_eviction_policy="lru", retrieval_recall_sample_interval=1)
+    )
+    memory.record(1, "write parser tests", "", "done", True, "", TaskState.SUCCEEDED)
+    memory.record(2, "water the plants", "", "", False, "", TaskState.CREATED)
+    MemoryScorer("parser", memory, threshold=0.6)(["write parser tests"])
+
+    memory.record(3, "new task", "", "", False, "", TaskState.CREATED)
+    assert sorted(memory.tasks) == [2, 3]  # 1 was not refreshed by scoring
+    assert memory.recall_stats()["samples"] == 0
+
+
+def test_rank_scores_places_new_tasks_between_anchors():
+    anchors = [(10.0, "a"), (0.0, "b")]
+    scores = rank_scores(["x", "a", "y", "z", "b", "w"], anchors, ["w", "x", "y", "z", "missing"])
+    w, x, y, z, missing = scores
+    assert x > 10.0
+    assert 10.0 > y > z > 0.0
+    assert 0.0 > w > missing
+
+    # No anchors and no parseable ranking: arrival order
+    assert rank_scores([], [], ["p", "q"]) == [2.0, 1.0]
+
+
+def test_llm_scorer_ranks_a_batch_with_anchors_in_one_call():
+    prompts = []
+
+    def llm(prompt):
+        prompts.append(prompt)
+        listed = json.loads(prompt.split("Tasks:\n", 1)[1].split("\n\nReturn", 1)[0])
+        return json.dumps(sorted(listed))  # alphabetical "priority"
+
+    queue = PriorityTaskQueue(max_size=10, scorer=LLMScorer("objective", llm, max_anchors=2))
+    queue.push_many([{"id": 1, "text": "m"}, {"id": 2, "text": "c"}, {"id": 3, "text": "x"}])
+    queue.push_many([{"id": 4, "text": "a"}, {"id": 5, "text": "n"}])
+
+    assert len(prompts) == 2
+    assert '["c", "x", "a", "n"]' in prompts[1]  # top and bottom anchors, then new tasks
+    assert [t["text"] for t in queue.as_list()] == ["a", "c", "m", "n", "x"]
+
+
+def test_make_scorer_validates_names():
+    with pytest.raises(ValueError):
+        make_scorer(ECKConfig(queue_scorer="oracle"), "objective")
+    with pytest.raises(ValueError):
+        make_scorer(ECKConfig(queue_scorer="llm"), "objective")
+
+
+def test_agent_priority_queue_scores_subtasks_in_one_llm_call(monkeypatch):
+    import eck.agent as agent_mod
+
+    calls = []
+
+    def llm(prompt):
+        if "Prioritize" in prompt:
+            calls.append(prompt)
+            return json.dumps(["urgent fix", "nice to have"])
+        return "NO"
+
+    config = ECKConfig(queue_mode="priority", queue_scorer="llm", guard_interval=1000)
+    agent = ECKAgent(objective="ship it", llm_call=llm, config=config)
+    monkeypatch.setattr(agent.drift, "get_policy_mode", lambda: PolicyMode.NORMAL)
+    monkeypatch.setattr(agent_mod, "should_execute", lambda *a: True)
+    monkeypatch.setattr(
+        agent_mod, "generate_subtasks", lambda *a, **k: ["nice to have", "urgent fix"],
+    )
+
+    agent.seed("first")
+    assert agent.step() is True
+    assert len(calls) == 2  # seed, then one call for both subtasks
+    assert [t["text"] for t in agent.queue.as_list()] == ["urgent fix", "nice to have"]
+    assert agent.memory.get(agent.queue.peek()[0]["id"])["state"] == "created"
+
+
+def test_async_agent_rejects_llm_scorer():
+    async def llm(prompt):
+        return "NO"
+
+    with pytest.raises(ValueError):
+        AsyncECKAgent("objective", llm, config=ECKConfig(queue_mode="priority", queue_scorer="llm"))
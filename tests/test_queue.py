@@ -1,6 +1,8 @@
+import threading
+
 import pytest
 
-from eck.queue import TaskQueue
+from eck.queue import ConcurrentTaskQueue, DurableTaskQueue, PriorityTaskQueue, TaskQueue
 
 
 @pytest.fixture
@@ -47,3 +49,164 @@ def test_as_list_returns_copy(queue):
 def test_repr_shows_count_and_max(queue):
     queue.push({"id": "t1", "text": "first"})
     assert str(queue) == "TaskQueue(1/3 tasks)"
+
+
+def test_peek_does_not_remove(queue):
+    queue.push({"id": "t1", "text": "first"})
+    queue.push({"id": "t2", "text": "second"})
+
+    assert [t["id"] for t in queue.peek(5)] == ["t1", "t2"]
+    assert len(queue) == 2
+
+
+def test_priority_queue_pops_highest_score_first():
+    scores = {"low": 0.1, "high": 0.9, "mid": 0.5}
+    queue = PriorityTaskQueue(max_size=5, scorer=lambda texts, q: [scores[t] for t in texts])
+    queue.push_many([{"id": i, "text": t} for i, t in enumerate(["low", "high", "mid"])])
+
+    assert [t["text"] for t in queue.peek(2)] == ["high", "mid"]
+    assert [t["text"] for t in queue.as_list()] == ["high", "mid", "low"]
+    assert [queue.pop()["text"] for _ in range(3)] == ["high", "mid", "low"]
+    assert queue.pop() is None
+
+
+def test_priority_queue_drops_lowest_priority_when_full():
+    queue = PriorityTaskQueue(max_size=2, scorer=lambda texts, q: [float(t[-1]) for t in texts])
+    queue.push({"id": 1, "text": "task9"})
+    queue.push({"id": 2, "text": "task1"})
+    queue.push({"id": 3, "text": "task5"})  # drops task1, not the oldest
+
+    assert [t["text"] for t in queue.as_list()] == ["task9", "task5"]
+    assert queue.dropped == 1
+
+
+def test_priority_queue_scores_only_new_arrivals_in_one_call():
+    calls = []
+
+    def scorer(texts, q):
+        calls.append(list(texts))
+        return [0.0] * len(texts)
+
+    queue = PriorityTaskQueue(max_size=10, scorer=scorer)
+    queue.push_many([{"id": 1, "text": "a"}, {"id": 2, "text": "b"}])
+    queue.push({"id": 3, "text": "c"})
+    queue.push({"id": 4, "text": "d"}, score=1.0)  # pre-scored (e.g. restored)
+    assert calls == [["a", "b"], ["c"]]
+    assert queue.scored_tasks()[0] == (1.0, {"id": 4, "text": "d"})
+
+
+def test_priority_queue_with_equal_scores_matches_fifo():
+    fifo, priority = TaskQueue(max_size=3), PriorityTaskQueue(max_size=3)
+    for i in range(6):
+        task = {"id": i, "text": f"t{i}"}
+        fifo.push(task)
+        priority.push(task)
+        if i % 2:
+            assert fifo.pop() == priority.pop()
+        assert fifo.as_list() == priority.as_list()
+    assert str(priority) == f"PriorityTaskQueue({len(fifo)}/3 tasks)"
+
+
+def test_durable_queue_spills_instead_of_dropping(tmp_path):
+    queue = DurableTaskQueue(str(tmp_path / "queue.db"), max_size=2)
+    queue.push_many([{"id": i, "text": f"t{i}"} for i in range(5)])
+
+    assert len(queue) == 5
+    assert queue.spilled == 3
+    assert queue.peek(3) == [{"id": 0, "text": "t0"}, {"id": 1, "text": "t1"}, {"id": 2, "text": "t2"}]
+
+    view = queue.as_list()
+    assert queue.spilled == 3  # building and sizing the view reads nothing
+    assert len(view) == 5
+    assert view == [{"id": i, "text": f"t{i}"} for i in range(5)]
+    assert view[3] == {"id": 3, "text": "t3"} and view[-1]["id"] == 4
+
+    assert [queue.pop()["id"] for _ in range(5)] == [0, 1, 2, 3, 4]
+    assert queue.pop() is None
+    assert queue.spilled_reads == 2
+    queue.close()
+
+
+def test_durable_queue_push_front_goes_before_head_and_spilled_tasks(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = DurableTaskQueue(path, max_size=2)
+    queue.push_many([{"id": i, "text": f"t{i}"} for i in range(3)])
+    queue.push_front([{"id": "a", "text": "ta"}, {"id": "b", "text": "tb"}])
+
+    assert len(queue) == 5 and queue.spilled == 3
+    assert queue.has_task("a") and not queue.has_task("z")
+    assert [task["id"] for task in queue.as_list()] == ["a", "b", 0, 1, 2]
+    assert queue.pop()["id"] == "a"
+    queue.close()
+
+    reopened = DurableTaskQueue(path, max_size=2)
+    assert [reopened.pop()["id"] for _ in range(4)] == ["b", 0, 1, 2]
+    reopened.push_front([{"id": "c", "text": "tc"}])  # empty queue
+    assert reopened.pop()["id"] == "c"
+    reopened.close()
+
+
+def test_durable_queue_resumes_after_reopen(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = DurableTaskQueue(path, max_size=2)
+    queue.push_many([{"id": i, "text": f"t{i}"} for i in range(4)])
+    assert queue.pop()["id"] == 0
+    queue.push({"id": "x", "text": "string id"})
+    del queue  # no close(): every push and pop is already committed
+
+    resumed = DurableTaskQueue(path, max_size=2)
+    assert len(resumed) == 4
+    assert resumed.max_int_id() == 3
+    assert [t["id"] for t in resumed.as_list()] == [1, 2, 3, "x"]
+    resumed.clear()
+    assert len(DurableTaskQueue(path)) == 0
+
+
+def test_concurrent_queue_blocking_pop_and_close():
+    queue = ConcurrentTaskQueue(TaskQueue(max_size=10))
+    assert queue.pop() is None  # default does not wait
+    assert queue.pop(timeout=0.01) is None
+
+    received = []
+    consumer = threading.Thread(target=lambda: received.append(queue.pop(timeout=None)))
+    consumer.start()
+    queue.push({"id": 1, "text": "a"})
+    consumer.join(timeout=5)
+    assert received == [{"id": 1, "text": "a"}]
+
+    queue.push_many([{"id": 2, "text": "b"}, {"id": 3, "text": "c"}])
+    queue.close()
+    with pytest.raises(ValueError):
+        queue.push({"id": 4, "text": "d"})
+    assert queue.pop(timeout=None)["id"] == 2  # queued tasks are still delivered
+    assert queue.drain() == [{"id": 3, "text": "c"}]
+    assert queue.pop(timeout=None) is None  # closed and empty: no wait
+
+
+def test_concurrent_queue_delivers_each_task_once():
+    queue = ConcurrentTaskQueue(TaskQueue(max_size=10_000))
+    received = []
+
+    def consume():
+        while True:
+            task = queue.pop(timeout=None)
+            if task is None:
+                return
+            received.append(task["id"])
+
+    def produce(start):
+        for i in range(start, start + 500):
+            queue.push({"id": i, "text": str(i)})
+
+    consumers = [threading.Thread(target=consume) for _ in range(4)]
+    producers = [threading.Thread(target=produce, args=(k * 500,)) for k in range(4)]
+    for thread in consumers + producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    queue.close()
+    for thread in consumers:
+        thread.join(timeout=5)
+
+    assert sorted(received) == list(range(2000))
+    assert queue.max_size == 10_000  # wrapped queue attributes are visible
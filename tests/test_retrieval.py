@@ -0,0 +1,336 @@
+import random
+
+import pytest
+
+from eck.retrieval import TokenIndex
+from eck.memory import WorldModel
+from eck.task import TaskState
+
+
+def brute_force_similar(tasks, task_text, threshold):
+    """Reference implementation: the original full-scan Jaccard."""
+    out = set()
+    for task_id, entry in tasks.items():
+        past_text = entry["task"]
+        union = set(task_text.split()) | set(past_text.split())
+        if not union:
+            continue
+        sim = len(set(task_text.split()) & set(past_text.split())) / len(union)
+        if sim >= threshold:
+            out.add(task_id)
+    return out
+
+
+def test_token_index_search_only_returns_matches_above_threshold():
+    index = TokenIndex()
+    index.add("t1", "apple fruit")
+    index.add("t2", "banana fruit")
+    index.add("t3", "carrot vegetable")
+
+    matches = dict(index.search("fruit salad", threshold=1/3))
+    assert set(matches) == {"t1", "t2"}
+    assert matches["t1"] == pytest.approx(1/3)
+
+
+def test_token_index_reindex_and_remove_update_postings():
+    index = TokenIndex()
+    index.add("t1", "apple fruit")
+    index.add("t1", "carrot vegetable")
+
+    assert index.search("apple", threshold=0.1) == []
+    assert [t for t, _ in index.search("carrot", threshold=0.1)] == ["t1"]
+
+    index.remove("t1")
+    assert len(index) == 0
+    assert index.search("carrot", threshold=0.1) == []
+
+
+def test_token_index_zero_threshold_includes_non_overlapping_entries():
+    index = TokenIndex()
+    index.add("t1", "apple")
+    index.add("t2", "")
+    assert {t for t, _ in index.search("banana", threshold=0.0)} == {"t1", "t2"}
+
+
+def test_world_model_get_similar_matches_full_scan():
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(30)]
+    world_model = WorldModel()
+    for i in range(300):
+        text = " ".join(rng.sample(vocab, rng.randint(1, 6)))
+        world_model.record(f"t{i}", text, "", "", False, "", TaskState.CREATED)
+
+    for _ in range(20):
+        query = " ".join(rng.sample(vocab, rng.randint(1, 5)))
+        for threshold in (0.0, 0.2, 0.5):
+            expected = brute_force_similar(world_model.tasks, query, threshold)
+            got = world_model.get_similar(query, threshold=threshold, limit=len(world_model))
+            assert {e["task"] for e in got} == {world_model.tasks[t]["task"] for t in expected}
+            assert len(got) == len(expected)
+
+
+def test_minhash_estimate_tracks_jaccard():
+    from eck.retrieval import MinHashLSHIndex
+
+    index = MinHashLSHIndex(num_perm=256, bands=64)
+    index.add("t1", "a b c d e f g h")  # Jaccard with query = 6/10
+    matches = dict(index.search("a b c d e f x y", threshold=0.3))
+    assert matches["t1"] == pytest.approx(0.6, abs=0.15)
+
+
+def test_minhash_index_requires_bands_to_divide_num_perm():
+    from eck.retrieval import MinHashLSHIndex
+
+    with pytest.raises(ValueError):
+        MinHashLSHIndex(num_perm=10, bands=3)
+
+
+def test_minhash_backend_reports_measured_recall():
+    from eck.config import ECKConfig
+
+    rng = random.Random(3)
+    vocab = [f"w{i}" for i in range(40)]
+    config = ECKConfig(
+        retrieval_backend="minhash",
+        minhash_num_perm=128,
+        minhash_bands=32,
+        retrieval_recall_sample_interval=1,
+    )
+    world_model = WorldModel(config=config)
+    base = rng.sample(vocab, 8)
+    for i in range(200):
+        words = base[: rng.randint(4, 8)] + rng.sample(vocab, 2)
+        world_model.record(f"t{i}", " ".join(words), "", "", False, "", TaskState.CREATED)
+
+    query = " ".join(base)
+    world_model.get_similar(query, threshold=0.5, limit=5)
+
+    stats = world_model.recall_stats()
+    assert stats["samples"] == 1
+    assert stats["mean_recall"] >= 0.75  # estimate noise near the threshold costs some recall
+    assert world_model.measure_recall(query, threshold=0.5) == stats["mean_recall"]
+
+
+def test_token_backend_recall_is_exact():
+    world_model = WorldModel()
+    world_model.record("t1", "apple fruit", "", "", False, "", TaskState.CREATED)
+    assert world_model.measure_recall("fruit salad", threshold=1/3) == 1.0
+
+
+def bag_of_words_embed(texts):
+    """Deterministic test embedding: word counts over a fixed vocabulary."""
+    vocab = ["apple", "banana", "fruit", "carrot", "vegetable", "soup"]
+    return [[text.split().count(word) for word in vocab] for text in texts]
+
+
+def test_embedding_index_cosine_search_and_top_k():
+    pytest.importorskip("numpy")
+    from eck.retrieval import EmbeddingIndex
+
+    index = EmbeddingIndex(bag_of_words_embed, initial_capacity=1)  # forces growth
+    index.add_many([
+        ("t1", "apple fruit"),
+        ("t2", "banana fruit"),
+        ("t3", "carrot vegetable"),
+        ("t4", "carrot soup"),
+    ])
+    assert len(index) == 4
+
+    matches = dict(index.search("apple fruit", threshold=0.4))
+    assert set(matches) == {"t1", "t2"}
+    assert matches["t1"] == pytest.approx(1.0)
+    assert matches["t2"] == pytest.approx(0.5)
+
+    top = index.search("carrot vegetable", threshold=0.0, limit=2)
+    assert [task_id for task_id, _ in top] == ["t3", "t4"]
+
+
+def test_embedding_index_reindex_remove_and_row_reuse():
+    pytest.importorskip("numpy")
+    from eck.retrieval import EmbeddingIndex
+
+    index = EmbeddingIndex(bag_of_words_embed)
+    index.add("t1", "apple fruit")
+    index.add("t1", "carrot soup")
+    assert index.search("apple", threshold=0.1) == []
+
+    index.remove("t1")
+    assert "t1" not in index
+    assert index.search("carrot", threshold=0.0) == []
+
+    index.add("t2", "banana")
+    assert [task_id for task_id, _ in index.search("banana", threshold=0.5)] == ["t2"]
+
+
+def test_embedding_index_top_k_skips_removed_rows_at_zero_threshold():
+    pytest.importorskip("numpy")
+    from eck.retrieval import EmbeddingIndex
+
+    index = EmbeddingIndex(bag_of_words_embed)
+    index.add_many([("t1", "apple"), ("t2", "banana"), ("t3", "carrot soup"), ("t4", "fruit")])
+    index.remove("t1")
+    index.remove("t2")  # zeroed rows score 0.0, like t4
+
+    top = index.search("carrot", threshold=0.0, limit=2)
+    assert [task_id for task_id, _ in top] == ["t3", "t4"]
+    assert index.search("carrot", threshold=0.0, limit=0) == []
+
+
+def test_embedding_index_rejects_mismatched_batches():
+    pytest.importorskip("numpy")
+    from eck.retrieval import EmbeddingIndex
+
+    index = EmbeddingIndex(lambda texts: [[1.0, 0.0]])
+    with pytest.raises(ValueError):
+        index.add_many([("t1", "a"), ("t2", "b")])
+
+
+def test_world_model_embedding_backend_uses_embed_fn():
+    pytest.importorskip("numpy")
+    from eck.config import ECKConfig
+
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return bag_of_words_embed(texts)
+
+    world_model = WorldModel(config=ECKConfig(retrieval_backend="embedding"), embed_fn=embed)
+    world_model.record("t1", "apple fruit", "", "", False, "", TaskState.CREATED)
+    world_model.record("t1", "apple fruit", "", "", True, "", TaskState.SUCCEEDED)
+    world_model.record("t2", "carrot soup", "", "", False, "", TaskState.CREATED)
+
+    assert [e["task"] for e in world_model.get_similar("fruit apple", threshold=0.9)] == ["apple fruit"]
+    world_model.get_similar("fruit apple", threshold=0.9)
+    assert calls == [["apple fruit"], ["carrot soup"], ["fruit apple"]]  # unchanged text and repeated queries reuse vectors
+
+
+def test_world_model_batch_embeds_new_texts_together():
+    pytest.importorskip("numpy")
+    from eck.config import ECKConfig
+
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return bag_of_words_embed(texts)
+
+    world_model = WorldModel(config=ECKConfig(retrieval_backend="embedding"), embed_fn=embed)
+    with world_model.batch():
+        world_model.record("t1", "apple fruit", "", "", False, "", TaskState.CREATED)
+        world_model.record("t2", "carrot soup", "", "", False, "", TaskState.CREATED)
+        world_model.record("t3", "banana", "", "", False, "", TaskState.CREATED)
+        world_model.discard("t3")
+    assert calls == [["apple fruit", "carrot soup"]]
+
+    with world_model.batch():
+        world_model.record("t4", "banana fruit", "", "", False, "", TaskState.CREATED)
+        # A search inside the batch sees the pending text
+        assert len(world_model.get_similar("banana fruit", threshold=0.9)) == 1
+    assert calls[1:] == [["banana fruit"], ["banana fruit"]]
+
+
+def test_world_model_passes_limit_to_ranked_index(monkeypatch):
+    pytest.importorskip("numpy")
+    from eck.config import ECKConfig, PolicyMode
+
+    world_model = WorldModel(config=ECKConfig(retrieval_backend="embedding"), embed_fn=bag_of_words_embed)
+    for i in range(6):
+        world_model.record(f"t{i}", "apple fruit " + "banana " * i, "", "", False, "", TaskState.CREATED)
+
+    limits = []
+    search = world_model.index.search
+    monkeypatch.setattr(world_model.index, "search", lambda text, threshold, limit=None: (
+        limits.append(limit) or search(text, threshold, limit)
+    ))
+    similar = world_model.get_similar("apple fruit", threshold=0.1, limit=2)
+    assert [e["task"] for e in similar] == ["apple fruit banana ", "apple fruit "]  # 2 most similar, newest first
+    world_model.retrieve_similar("apple fruit", threshold=0.1, limit=2)
+    world_model.retrieve_scored("apple fruit", PolicyMode.NORMAL, world_model.config, threshold=0.1, limit=2)
+    world_model.retrieve_scored(
+        "apple fruit", PolicyMode.NORMAL, world_model.config, threshold=0.1, limit=2, rank_all_matches=True,
+    )
+    assert limits == [2, 4, 8, None]
+
+
+def test_embedding_backend_requires_embed_fn():
+    from eck.config import ECKConfig
+
+    with pytest.raises(ValueError):
+        WorldModel(config=ECKConfig(retrieval_backend="embedding"))
+
+
+def brute_force_tfidf(docs, text):
+    """Reference lnc.ltc cosine over the live docs."""
+    import math
+    from collections import Counter
+
+    def unit(weights):
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {t: w / norm for t, w in weights.items()} if norm else {}
+
+    n = len(docs)
+    df = Counter(t for doc in docs.values() for t in set(doc.split()))
+    query = unit({
+        t: (1 + math.log(tf)) * (math.log((1 + n) / (1 + df[t])) + 1)
+        for t, tf in Counter(text.split()).items()
+    })
+    scores = {}
+    for task_id, doc in docs.items():
+        vec = unit({t: 1 + math.log(tf) for t, tf in Counter(doc.split()).items()})
+        scores[task_id] = sum(w * vec.get(t, 0.0) for t, w in query.items())
+    return scores
+
+
+def test_tfidf_index_rare_terms_dominate_ranking():
+    from eck.retrieval import TfidfIndex
+
+    index = TfidfIndex()
+    index.add("t1", "deploy the service")
+    index.add("t2", "test the service")
+    index.add("t3", "deploy the database")
+    index.add("t4", "the the the")
+
+    top = index.search("deploy service", threshold=0.0, limit=2)
+    assert top[0][0] == "t1"
+    assert len(index.search("the", threshold=0.0)) == 4
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_tfidf_index_matches_reference_after_updates(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    from eck.retrieval import TfidfIndex
+
+    rng = random.Random(11)
+    vocab = [f"w{i}" for i in range(25)]
+    index = TfidfIndex(use_numpy=use_numpy)
+    docs = {}
+    for i in range(3000):  # enough removals to trigger compaction
+        task_id = f"t{rng.randrange(400)}"
+        if rng.random() < 0.2:
+            index.remove(task_id)
+            docs.pop(task_id, None)
+        else:
+            text = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 6)))
+            index.add(task_id, text)
+            docs[task_id] = text
+
+    for _ in range(10):
+        query = " ".join(rng.sample(vocab, 3))
+        expected = brute_force_tfidf(docs, query)
+        got = dict(index.search(query, threshold=0.3))
+        assert set(got) == {t for t, s in expected.items() if s >= 0.3}
+        for task_id, score in got.items():
+            assert score == pytest.approx(expected[task_id])
+
+
+def test_world_model_tfidf_backend():
+    from eck.config import ECKConfig
+
+    world_model = WorldModel(config=ECKConfig(retrieval_backend="tfidf"))
+    world_model.record("t1", "apple pie recipe", "", "", False, "", TaskState.CREATED)
+    world_model.record("t2", "carrot soup recipe", "", "", False, "", TaskState.CREATED)
+
+    similar = world_model.retrieve_similar("apple pie", threshold=0.5)
+    assert [e["task"] for e in similar] == ["apple pie recipe"]
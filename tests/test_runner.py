@@ -0,0 +1,177 @@
+import threading
+
+import pytest
+
+from eck.agent import ECKAgent
+from eck.config import ECKConfig, PolicyMode
+from eck.queue import ConcurrentTaskQueue
+from eck.runner import ThreadedRunner
+from eck.task import TaskState
+
+
+def dummy_llm(prompt: str) -> str:
+    return "NO"
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    import eck.agent as agent_mod
+
+    def make(**overrides):
+        fields = dict(guard_interval=1000)
+        fields.update(overrides)
+        agent = ECKAgent(objective="obj", llm_call=dummy_llm, config=ECKConfig(**fields))
+        monkeypatch.setattr(agent.drift, "get_policy_mode", lambda: PolicyMode.NORMAL)
+        monkeypatch.setattr(agent_mod, "should_execute", lambda *a: True)
+        monkeypatch.setattr(agent_mod, "execute_task", lambda text, llm: f"did {text}")
+        monkeypatch.setattr(agent_mod, "critic_evaluate", lambda **k: (True, "", 0.0))
+        monkeypatch.setattr(agent_mod, "generate_subtasks", lambda **k: [])
+        return agent
+
+    return make
+
+
+def track_records(agent):
+    records = []
+    original = agent._record
+
+    def record(task_id, task_text, prediction, outcome, success, feedback, state):
+        records.append((task_id, state))
+        original(task_id, task_text, prediction, outcome, success, feedback, state)
+
+    agent._record = record
+    return records
+
+
+def test_llm_phases_of_several_tasks_overlap(make_agent, monkeypatch):
+    import eck.agent as agent_mod
+
+    agent = make_agent()
+    barrier = threading.Barrier(3, timeout=5)  # breaks unless 3 executions run at once
+
+    def execute(text, llm):
+        barrier.wait()
+        return f"did {text}"
+
+    monkeypatch.setattr(agent_mod, "execute_task", execute)
+    for text in ("a", "b", "c"):
+        agent.seed(text)
+    records = track_records(agent)
+
+    ThreadedRunner(agent, workers=3).run()
+
+    assert agent.cycles == 3
+    for task_id in (1, 2, 3):
+        states = [state for tid, state in records if tid == task_id]
+        assert states == [TaskState.PREDICTED, TaskState.EXECUTED, TaskState.SUCCEEDED]
+        assert agent.memory.get(task_id)["outcome"].startswith("did ")
+    assert len(agent.drift.error_history) == 3
+
+
+def test_subtasks_are_processed_until_max_iterations(make_agent, monkeypatch):
+    import eck.agent as agent_mod
+
+    agent = make_agent(max_iterations=6)
+    monkeypatch.setattr(
+        agent_mod, "generate_subtasks", lambda current_task, **k: [current_task + " x", current_task + " y"],
+    )
+    agent.seed("root")
+
+    agent.run_threaded(workers=2)
+
+    assert agent.cycles == 6
+    assert len(agent.queue) > 0
+    assert isinstance(agent.queue, ConcurrentTaskQueue)
+
+
+def test_drift_halt_stops_dispatching(make_agent, monkeypatch):
+    agent = make_agent()
+    for text in ("a", "b", "c"):
+        agent.seed(text)
+    monkeypatch.setattr(agent, "_track_drift", lambda *a: False)
+
+    ThreadedRunner(agent, workers=1).run()
+
+    assert agent.cycles == 0
+    assert [task["text"] for task in agent.queue.as_list()] == ["b", "c"]
+
+
+def test_worker_exception_is_reraised(make_agent, monkeypatch):
+    import eck.agent as agent_mod
+
+    agent = make_agent()
+    agent.seed("a")
+
+    def fail(text, llm):
+        raise RuntimeError("execution backend down")
+
+    monkeypatch.setattr(agent_mod, "execute_task", fail)
+    with pytest.raises(RuntimeError):
+        ThreadedRunner(agent, workers=2).run()
+
+
+def test_submitted_tasks_are_processed_until_close(make_agent):
+    agent = make_agent()
+    runner = ThreadedRunner(agent, workers=2, poll_interval=0.01)
+    thread = threading.Thread(target=runner.run, kwargs={"wait_for_tasks": True})
+    thread.start()
+
+    runner.submit(["a", "b"])
+    runner.submit(["c"])
+    runner.queue.close()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert agent.cycles == 3
+    assert [agent.memory.get(i)["state"] for i in (1, 2, 3)] == ["succeeded"] * 3
+
+
+def test_checkpoint_sees_through_concurrent_queue(make_agent, tmp_path):
+    agent = make_agent()
+    runner = ThreadedRunner(agent)
+    runner.submit(["a", "b"])
+    path = agent.checkpoint(str(tmp_path / "agent.ckpt"))
+
+    restored = ECKAgent(objective="obj", llm_call=dummy_llm)
+    restored.restore(path)
+    assert [task["text"] for task in restored.queue.as_list()] == ["a", "b"]
+
+
+def test_workers_must_be_positive(make_agent):
+    with pytest.raises(ValueError):
+        ThreadedRunner(make_agent(), workers=0)
+
+
+def test_auto_checkpoint_keeps_in_flight_tasks(make_agent, monkeypatch, tmp_path):
+    import eck.agent as agent_mod
+
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent(checkpoint_path=path, checkpoint_interval=1)
+    b_started, a_checkpointed = threading.Event(), threading.Event()
+
+    def execute(text, llm):
+        if text == "a":
+            assert b_started.wait(5)
+        else:
+            b_started.set()
+            assert a_checkpointed.wait(5)
+        return f"did {text}"
+
+    snapshots = []
+    original = agent._auto_checkpoint
+
+    def auto_checkpoint():
+        original()
+        restored = ECKAgent(objective="obj", llm_call=dummy_llm)
+        restored.restore(path)
+        snapshots.append([task["text"] for task in restored.queue.as_list()])
+        a_checkpointed.set()
+
+    monkeypatch.setattr(agent_mod, "execute_task", execute)
+    agent._auto_checkpoint = auto_checkpoint
+    agent.seed("a")
+    agent.seed("b")
+
+    ThreadedRunner(agent, workers=2).run()
+
+    assert snapshots == [["b"], []]  # b was in flight at the first checkpoint
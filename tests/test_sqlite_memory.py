@@ -0,0 +1,137 @@
+import random
+import sqlite3
+
+import pytest
+
+import eck.memory
+import eck.sqlite_memory
+from eck.agent import ECKAgent
+from eck.config import ECKConfig, PolicyMode
+from eck.memory import WorldModel, make_world_model
+from eck.sqlite_memory import SQLiteWorldModel
+from eck.task import TaskState
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """A settable clock shared by both backends (distinct, increasing ticks)."""
+    now = [1_600_000_000_000_000_000]
+    monkeypatch.setattr(eck.memory, "now_ns", lambda: now[0])
+    monkeypatch.setattr(eck.sqlite_memory, "now_ns", lambda: now[0])
+    return now
+
+
+def test_sqlite_model_matches_in_memory_model(tmp_path, fake_clock):
+    rng = random.Random(4)
+    vocab = ["alpha", "beta", "gamma", "delta", "eps", "zeta"]
+    memory = WorldModel()
+    sqlite = SQLiteWorldModel(str(tmp_path / "memory.db"))
+
+    for i in range(150):
+        task_id = rng.randrange(60)
+        text = " ".join(rng.sample(vocab, rng.randint(1, 4)))
+        args = (task_id, text, "p", "o", rng.random() < 0.5, "f", rng.choice(list(TaskState)))
+        fake_clock[0] += 1000
+        memory.record(*args)
+        sqlite.record(*args)
+
+    assert sqlite.all_tasks() == memory.all_tasks()
+    assert sqlite.get_recent(5) == memory.get_recent(5)
+
+    for query in ("alpha beta", "gamma", "zeta eps delta"):
+        for threshold in (0.0, 0.3):
+            assert sqlite.get_similar(query, threshold, 7) == memory.get_similar(query, threshold, 7)
+        for prefer in (False, True):
+            kwargs = dict(threshold=0.25, limit=4, prefer_failures=prefer)
+            assert sqlite.retrieve_similar(query, **kwargs) == memory.retrieve_similar(query, **kwargs)
+            for rank_all in (False, True):
+                args = (query, PolicyMode.NORMAL, ECKConfig())
+                assert sqlite.retrieve_scored(*args, rank_all_matches=rank_all, **kwargs) == \
+                    memory.retrieve_scored(*args, rank_all_matches=rank_all, **kwargs)
+
+
+def test_sqlite_model_persists_and_reindexes_text(tmp_path):
+    path = str(tmp_path / "memory.db")
+    model = SQLiteWorldModel(path)
+    model.record("t1", "apple pie", "", "", False, "", TaskState.CREATED, metadata={"k": 1})
+    model.record("t1", "carrot soup", "", "", True, "", TaskState.SUCCEEDED, metadata={"k": 1})
+    model.close()
+
+    reopened = SQLiteWorldModel(path)
+    assert len(reopened) == 1
+    assert reopened.get("t1")["metadata"] == {"k": 1}
+    assert reopened.get_similar("apple", threshold=0.1) == []
+    assert [e["task"] for e in reopened.get_similar("Soup carrot", threshold=0.1)] == ["carrot soup"]
+
+
+def test_batch_commits_once_and_reads_see_pending_writes(tmp_path):
+    model = SQLiteWorldModel(str(tmp_path / "memory.db"))
+    with model.batch():
+        model.record(1, "a", "", "", False, "", TaskState.CREATED)
+        model.record(2, "b", "", "", False, "", TaskState.CREATED)
+        assert model.transactions == 0
+        assert model.get(1)["task"] == "a"  # read-your-writes flushes
+        model.record(1, "a", "", "", True, "", TaskState.SUCCEEDED)
+    assert model.transactions == 2
+    assert [t for t, _ in model.iter_tasks(state="succeeded")] == [1]
+
+
+def test_writes_stay_pending_when_the_database_is_locked(tmp_path):
+    path = str(tmp_path / "memory.db")
+    model = SQLiteWorldModel(path, timeout=0.01)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # another writer holds the lock
+    with pytest.raises(sqlite3.OperationalError):
+        with model.batch():
+            model.record(1, "a", "", "", False, "", TaskState.CREATED)
+    assert not model._db.in_transaction
+
+    other.execute("COMMIT")
+    other.close()
+    assert model.get(1)["task"] == "a"  # flushed on the next read
+    assert model.transactions == 1
+
+
+def test_agent_runs_on_sqlite_backend(tmp_path):
+    config = ECKConfig(memory_backend="sqlite", memory_path=str(tmp_path / "agent.db"), max_iterations=2)
+    agent = ECKAgent("objective", lambda prompt: "{}", config=config)
+    agent.seed("first task")
+    agent.run()
+
+    assert isinstance(agent.memory, SQLiteWorldModel)
+    assert agent.memory.get(1)["task"] == "first task"
+
+
+def test_sqlite_backend_requires_path():
+    with pytest.raises(ValueError):
+        make_world_model(ECKConfig(memory_backend="sqlite"))
+
+
+def test_restarted_agent_does_not_overwrite_earlier_tasks(tmp_path):
+    config = ECKConfig(memory_backend="sqlite", memory_path=str(tmp_path / "agent.db"))
+    first = ECKAgent("objective", lambda prompt: "{}", config=config)
+    first._enqueue_tasks(["first a", "first b"])
+    first.memory.close()
+
+    second = ECKAgent("objective", lambda prompt: "{}", config=config)
+    second._enqueue_tasks(["second"])
+    [task] = second.queue.as_list()
+    assert task["id"] > 2
+    assert [second.memory.get(i)["task"] for i in (1, 2, task["id"])] == ["first a", "first b", "second"]
+    second.memory.close()
+
+
+def test_agents_sharing_a_database_get_distinct_task_ids(tmp_path):
+    config = ECKConfig(memory_backend="sqlite", memory_path=str(tmp_path / "agent.db"))
+    agents = [ECKAgent("objective", lambda prompt: "{}", config=config) for _ in range(2)]
+    for i in range(3):
+        for n, agent in enumerate(agents):
+            agent._enqueue_tasks([f"agent {n} task {i}"])
+
+    ids = {task["id"]: task["text"] for agent in agents for task in agent.queue.as_list()}
+    assert len(ids) == 6
+    reader = SQLiteWorldModel(str(tmp_path / "agent.db"))
+    assert {task_id: reader.get(task_id)["task"] for task_id in ids} == ids
+    for agent in agents:
+        agent.memory.close()
+    reader.close()
@@ -0,0 +1,232 @@
+import random
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from eck.agent import ECKAgent
+from eck.config import ECKConfig
+from eck.memory import WorldModel
+from eck.task import TaskState
+from eck.vector_index import MmapIVFIndex
+
+
+VOCAB = [f"w{i}" for i in range(32)]
+
+
+def hashed_embed(texts):
+    """Deterministic bag-of-words embedding over VOCAB."""
+    return [[text.split().count(word) for word in VOCAB] for text in texts]
+
+
+def test_mmap_index_persists_and_supersedes_records(tmp_path):
+    path = str(tmp_path / "vectors.eckv")
+    index = MmapIVFIndex(path, hashed_embed, partitions=4, probe=4)
+    index.add("t1", "w1 w2")
+    index.add("t2", "w3 w4")
+    index.add("t1", "w5 w6")  # re-index appends a newer record
+    index.remove("t2")
+    index.close()
+
+    reopened = MmapIVFIndex(path, hashed_embed, partitions=4, probe=4)
+    assert len(reopened) == 1
+    assert reopened.search("w1 w2", threshold=0.5) == []
+    assert [t for t, _ in reopened.search("w5 w6", threshold=0.9)] == ["t1"]
+
+
+def test_read_only_reader_sees_writer_appends(tmp_path):
+    path = str(tmp_path / "vectors.eckv")
+    writer = MmapIVFIndex(path, hashed_embed, partitions=2, probe=2)
+    writer.add("t1", "w1 w2")
+    reader = MmapIVFIndex(path, hashed_embed, partitions=2, probe=2, read_only=True)
+
+    writer.add("t2", "w1 w3")
+    assert {t for t, _ in reader.search("w1", threshold=0.5)} == {"t1", "t2"}
+
+    reader.add("t3", "w1")  # readers never write
+    assert "t3" not in writer
+
+
+def test_ivf_training_keeps_full_probe_exact(tmp_path):
+    rng = random.Random(5)
+    path = str(tmp_path / "vectors.eckv")
+    index = MmapIVFIndex(path, hashed_embed, partitions=4, probe=4, train_factor=8)
+    texts = {}
+    for i in range(100):
+        texts[f"t{i}"] = " ".join(rng.sample(VOCAB, 4))
+        index.add(f"t{i}", texts[f"t{i}"])
+
+    assert (tmp_path / "vectors.eckv.centroids").exists()
+
+    query = " ".join(rng.sample(VOCAB, 4))
+    q = np.array(hashed_embed([query])[0], dtype=float)
+    q /= np.linalg.norm(q)
+    expected = set()
+    for task_id, text in texts.items():
+        v = np.array(hashed_embed([text])[0], dtype=float)
+        if v @ q / np.linalg.norm(v) >= 0.25:
+            expected.add(task_id)
+
+    # Probing every partition is exact; probing fewer returns a subset
+    assert {t for t, _ in index.search(query, threshold=0.25)} == expected
+    narrow = MmapIVFIndex(path, hashed_embed, partitions=4, probe=1, read_only=True)
+    assert {t for t, _ in narrow.search(query, threshold=0.25)} <= expected
+
+
+def test_world_model_ivf_backend(tmp_path):
+    config = ECKConfig(
+        retrieval_backend="ivf",
+        vector_index_path=str(tmp_path / "vectors.eckv"),
+        ivf_partitions=2,
+        ivf_probe=2,
+    )
+    world_model = WorldModel(config=config, embed_fn=hashed_embed)
+    world_model.record("t1", "w1 w2", "", "", False, "", TaskState.CREATED)
+    world_model.record("t2", "w7 w8", "", "", False, "", TaskState.CREATED)
+
+    assert [e["task"] for e in world_model.get_similar("w2 w1", threshold=0.9)] == ["w1 w2"]
+
+    # A fresh model sharing the file only returns tasks it holds itself
+    other = WorldModel(config=config, embed_fn=hashed_embed)
+    assert other.get_similar("w2 w1", threshold=0.9) == []
+
+
+def test_ivf_backend_requires_path_and_embed_fn():
+    with pytest.raises(ValueError):
+        WorldModel(config=ECKConfig(retrieval_backend="ivf"), embed_fn=hashed_embed)
+
+
+def test_mmap_index_keys_are_strings(tmp_path):
+    index = MmapIVFIndex(str(tmp_path / "vectors.eckv"), hashed_embed, partitions=2, probe=2)
+    with pytest.raises(TypeError):
+        index.add(7, "w1 w2")
+
+
+def test_integer_task_ids_are_indexed_under_global_keys(tmp_path):
+    config = ECKConfig(
+        retrieval_backend="ivf",
+        vector_index_path=str(tmp_path / "vectors.eckv"),
+        ivf_partitions=2,
+        ivf_probe=2,
+    )
+    writer = WorldModel(config=config, embed_fn=hashed_embed)
+    writer.record(1, "w1 w2", "", "", False, "", TaskState.CREATED)
+    other = WorldModel(config=config, embed_fn=hashed_embed)
+    other.record(1, "w7 w8", "", "", False, "", TaskState.CREATED)
+
+    reader = MmapIVFIndex(config.vector_index_path, hashed_embed, partitions=2, probe=2, read_only=True)
+    assert f"{writer.index_owner}:1" in reader
+    assert len(reader) == 2
+
+    # Both models used id 1; neither resolves the other's entry as its own
+    assert [e["task"] for e in writer.get_similar("w1 w2", threshold=0.9)] == ["w1 w2"]
+    assert other.get_similar("w1 w2", threshold=0.9) == []
+    assert writer.get_similar("w7 w8", threshold=0.9) == []
+
+
+def _ivf_fields(tmp_path, **extra):
+    return dict(
+        retrieval_backend="ivf",
+        vector_index_path=str(tmp_path / "vectors.eckv"),
+        ivf_partitions=2,
+        ivf_probe=2,
+        **extra,
+    )
+
+
+def test_reader_of_the_writers_event_log_resolves_its_records(tmp_path):
+    fields = _ivf_fields(tmp_path, event_log_dir=str(tmp_path / "log"))
+    writer = WorldModel(config=ECKConfig(**fields), embed_fn=hashed_embed)
+    for i in range(5):
+        writer.record(i + 1, f"w{2 * i} w{2 * i + 1}", "", "", False, "", TaskState.CREATED)
+    writer.close()
+
+    worker = WorldModel(config=ECKConfig(vector_index_read_only=True, **fields), embed_fn=hashed_embed)
+    assert worker.index_owner == writer.index_owner
+    found = [worker.get_similar(f"w{2 * i} w{2 * i + 1}", threshold=0.9) for i in range(5)]
+    assert all(len(matches) == 1 for matches in found)
+
+
+def test_restarted_writer_does_not_append_replayed_records(tmp_path):
+    fields = _ivf_fields(tmp_path, event_log_dir=str(tmp_path / "log"))
+    writer = WorldModel(config=ECKConfig(**fields), embed_fn=hashed_embed)
+    for i in range(5):
+        writer.record(i + 1, f"w{2 * i} w{2 * i + 1}", "", "", False, "", TaskState.CREATED)
+    writer.close()
+    size = (tmp_path / "vectors.eckv").stat().st_size
+
+    restarted = WorldModel(config=ECKConfig(**fields), embed_fn=hashed_embed)
+    assert len(restarted) == 5
+    assert (tmp_path / "vectors.eckv").stat().st_size == size
+    assert [e["task"] for e in restarted.get_similar("w2 w3", threshold=0.9)] == ["w2 w3"]
+
+
+def test_checkpoint_restore_keeps_shared_index_keys(tmp_path):
+    config = ECKConfig(**_ivf_fields(tmp_path))
+    agent = ECKAgent("objective", lambda prompt: "", config=config, embed_fn=hashed_embed)
+    for i in range(3):
+        agent.memory.record(i + 1, f"w{2 * i} w{2 * i + 1}", "", "", False, "", TaskState.CREATED)
+    agent.checkpoint(str(tmp_path / "agent.ckpt"))
+    agent.memory.close()
+    size = (tmp_path / "vectors.eckv").stat().st_size
+
+    restored = ECKAgent("objective", lambda prompt: "", config=config, embed_fn=hashed_embed)
+    restored.restore(str(tmp_path / "agent.ckpt"))
+    assert restored.memory.index_owner == agent.memory.index_owner
+    assert (tmp_path / "vectors.eckv").stat().st_size == size
+    assert [e["task"] for e in restored.memory.get_similar("w4 w5", threshold=0.9)] == ["w4 w5"]
+
+
+def test_version_1_files_are_rejected(tmp_path):
+    path = tmp_path / "vectors.eckv"
+    path.write_bytes(struct.pack("<4sII4x", b"ECKV", 1, 4))
+    with pytest.raises(ValueError):
+        MmapIVFIndex(str(path), hashed_embed, partitions=2, probe=2)
+
+
+def test_read_only_worker_recalls_its_own_tasks(tmp_path):
+    fields = dict(
+        retrieval_backend="ivf",
+        vector_index_path=str(tmp_path / "vectors.eckv"),
+        ivf_partitions=2,
+        ivf_probe=2,
+    )
+    writer = WorldModel(config=ECKConfig(**fields), embed_fn=hashed_embed)
+    writer.record("shared", "w1 w2", "", "", False, "", TaskState.CREATED)
+    worker = WorldModel(config=ECKConfig(vector_index_read_only=True, **fields), embed_fn=hashed_embed)
+    worker.record(1, "w1 w3", "", "", False, "", TaskState.CREATED)
+    worker.record("shared", "w7 w8", "", "", False, "", TaskState.CREATED)
+
+    assert [e["task"] for e in worker.get_similar("w1 w3", threshold=0.9)] == ["w1 w3"]
+    assert [e["task"] for e in worker.get_similar("w8 w7", threshold=0.9)] == ["w7 w8"]
+    # Same key, different text in the shared file: not the worker's task
+    assert worker.get_similar("w1 w2", threshold=0.9) == []
+    assert writer.get_similar("w1 w3", threshold=0.5) == []
+
+
+def test_holds_checks_the_indexed_text(tmp_path):
+    path = str(tmp_path / "vectors.eckv")
+    writer = MmapIVFIndex(path, hashed_embed, partitions=2, probe=2)
+    writer.add("t1", "w1 w2")
+    reader = MmapIVFIndex(path, hashed_embed, partitions=2, probe=2, read_only=True)
+
+    assert reader.holds("t1", "w1 w2")
+    assert not reader.holds("t1", "w1 w3")
+    assert not reader.holds("t2", "w1 w2")
+
+
+def test_key_reindexed_elsewhere_is_not_a_match(tmp_path):
+    config = ECKConfig(
+        retrieval_backend="ivf",
+        vector_index_path=str(tmp_path / "vectors.eckv"),
+        ivf_partitions=2,
+        ivf_probe=2,
+    )
+    first = WorldModel(config=config, embed_fn=hashed_embed)
+    first.record("t1", "w1 w2", "", "", False, "", TaskState.CREATED)
+    second = WorldModel(config=config, embed_fn=hashed_embed)
+    second.record("t1", "w7 w8", "", "", False, "", TaskState.CREATED)
+
+    assert first.get_similar("w7 w8", threshold=0.9) == []
+    assert [e["task"] for e in second.get_similar("w7 w8", threshold=0.9)] == ["w7 w8"]